@@ -46,4 +46,8 @@ def create_app():
     app.register_blueprint(admin_bp, url_prefix="/admin")
     app.register_blueprint(upload_bp)
 
+    # Maintenance commands (flask reconcile-ratings, ...)
+    from .commands import register_commands
+    register_commands(app)
+
     return app
\ No newline at end of file
@@ -0,0 +1,50 @@
+import click
+from flask.cli import with_appcontext
+
+
+@click.command("reconcile-ratings")
+@with_appcontext
+def reconcile_ratings_command():
+    """Rebuild the denormalised hostel rating aggregates from the reviews table."""
+    from .services.review_service import ReviewService
+
+    count = ReviewService.reconcile_hostel_ratings()
+    click.echo(f"Reconciled ratings for {count} hostels")
+
+
+@click.command("rebuild-occupancy")
+@with_appcontext
+def rebuild_occupancy_command():
+    """Rebuild the per-night hostel occupancy ledger from the bookings table."""
+    from .services.occupancy_service import OccupancyService
+
+    nights = OccupancyService.rebuild_ledger()
+    click.echo(f"Rebuilt occupancy ledger ({nights} hostel-nights)")
+
+
+@click.command("backfill-amenity-masks")
+@with_appcontext
+def backfill_amenity_masks_command():
+    """Recompute every hostel's amenity bitmask from its amenities list."""
+    from .services.hostel_service import HostelService
+
+    count = HostelService.backfill_amenity_masks()
+    click.echo(f"Updated amenity masks for {count} hostels")
+
+
+@click.command("rebuild-booking-rollup")
+@with_appcontext
+def rebuild_booking_rollup_command():
+    """Backfill or rebuild the daily booking/revenue rollup from the bookings table."""
+    from .services.rollup_service import BookingRollupService
+
+    days = BookingRollupService.rebuild_rollup()
+    click.echo(f"Rebuilt booking rollup ({days} hostel-days)")
+
+
+def register_commands(app):
+    """Attach the maintenance commands to the `flask` CLI"""
+    app.cli.add_command(reconcile_ratings_command)
+    app.cli.add_command(rebuild_occupancy_command)
+    app.cli.add_command(backfill_amenity_masks_command)
+    app.cli.add_command(rebuild_booking_rollup_command)
@@ -1,4 +1,8 @@
 from ..extensions import db
+from sqlalchemy import func
+
+# Amenity id N owns bit N - 1 of Hostel.amenity_mask, a signed 64-bit integer
+MAX_AMENITY_ID = 63
 
 class Amenity(db.Model):
     __tablename__ = "amenities"
@@ -17,3 +21,47 @@ class Amenity(db.Model):
             "icon": self.icon,
             "category": self.category
         }
+
+
+def amenity_mask(amenities, strict=False, name_ids=None):
+    """Bitmask for amenities given as Amenity ids, names, or a {id or name: bool} dict (the stored JSON).
+
+    Unknown names are skipped, or make the result None when strict. Pass name_ids ({lower-cased name: id})
+    to resolve names without a query.
+    """
+    if isinstance(amenities, dict):
+        amenities = [key for key, value in amenities.items() if value]
+
+    ids, names = set(), set()
+    for value in amenities or []:
+        if isinstance(value, int) or str(value).strip().isdigit():
+            ids.add(int(value))
+        else:
+            names.add(str(value).strip().lower())
+
+    if names:
+        if name_ids is None:
+            name_ids = dict(db.session.query(func.lower(Amenity.name), Amenity.id).filter(
+                func.lower(Amenity.name).in_(names)
+            ).all())
+        found = {name_ids[name] for name in names if name in name_ids}
+        if strict and len(found) < len(names):
+            return None
+        ids.update(found)
+
+    mask = 0
+    for amenity_id in ids:
+        if not 1 <= amenity_id <= MAX_AMENITY_ID:
+            raise ValueError(f"Amenity id {amenity_id} does not fit the amenity bitmask (1-{MAX_AMENITY_ID})")
+        mask |= 1 << (amenity_id - 1)
+    return mask
+
+
+def amenity_ids_in(mask):
+    """Amenity ids whose bits are set in mask"""
+    ids = []
+    while mask:
+        lowest = mask & -mask
+        ids.append(lowest.bit_length())
+        mask ^= lowest
+    return ids
@@ -1,8 +1,17 @@
 from ..extensions import db
 from datetime import datetime
 
+# Booking statuses whose total price counts as revenue
+REVENUE_STATUSES = ('confirmed', 'completed')
+
 class Booking(db.Model):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Seek index for cursor pagination of a user's bookings
+        db.Index('ix_bookings_user_created_at_id', 'user_id', 'created_at', 'id'),
+        # Current stays per hostel, for active-booking counts
+        db.Index('ix_bookings_hostel_status_check_out', 'hostel_id', 'status', 'check_out'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
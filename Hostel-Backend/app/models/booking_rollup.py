@@ -0,0 +1,30 @@
+from ..extensions import db
+
+class BookingDailyRollup(db.Model):
+    """Bookings and revenue per hostel per day the bookings were made, maintained by BookingRollupService"""
+    __tablename__ = "booking_daily_rollup"
+    __table_args__ = (
+        db.Index('ix_booking_daily_rollup_landlord_day', 'landlord_id', 'day'),
+    )
+
+    hostel_id = db.Column(db.Integer, db.ForeignKey('hostels.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    landlord_id = db.Column(db.Integer, db.ForeignKey('landlords.id'), nullable=False)
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    # Total price of the day's bookings that are currently confirmed or completed
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    cancellations = db.Column(db.Integer, nullable=False, default=0)
+    confirmed = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "hostel_id": self.hostel_id,
+            "landlord_id": self.landlord_id,
+            "day": self.day.isoformat(),
+            "bookings": self.bookings,
+            "revenue": self.revenue,
+            "cancellations": self.cancellations,
+            "confirmed": self.confirmed,
+            "completed": self.completed
+        }
@@ -1,8 +1,17 @@
 from ..extensions import db
-from datetime import datetime
+from datetime import datetime, date
+from sqlalchemy import DDL, event, func, text
+
+# Booking statuses that hold beds
+ACTIVE_BOOKING_STATUSES = ('confirmed', 'upcoming')
 
 class Hostel(db.Model):
     __tablename__ = "hostels"
+    __table_args__ = (
+        # Seek indexes for cursor pagination
+        db.Index('ix_hostels_created_at_id', 'created_at', 'id'),
+        db.Index('ix_hostels_price_id', 'price', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
@@ -17,10 +26,16 @@ class Hostel(db.Model):
     landlord_id = db.Column(db.Integer, db.ForeignKey('landlords.id'), nullable=False)
     images = db.Column(db.JSON)
     amenities = db.Column(db.JSON)
+    # Bit (id - 1) set for each Amenity in `amenities`, kept in step by HostelService (backfill with `flask backfill-amenity-masks`)
+    amenity_mask = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
     features = db.Column(db.JSON)
     availability = db.Column(db.JSON)
     is_verified = db.Column(db.Boolean, default=False)
     is_featured = db.Column(db.Boolean, default=False)
+    # Denormalised review aggregates, kept in step by ReviewService (rebuild with `flask reconcile-ratings`)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_avg = db.Column(db.Float, index=True)  # NULL until the first review
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -30,19 +45,42 @@ class Hostel(db.Model):
     reviews = db.relationship('Review', back_populates='hostel', cascade='all, delete-orphan')
 
     @property
-    def available_rooms(self):
-        """Calculate available rooms based on capacity minus current confirmed bookings"""
+    def average_rating(self):
+        return float(self.rating_avg or 0.0)
+
+    @staticmethod
+    def occupied_guests_by_hostel(hostel_ids):
+        """Guests in current bookings for many hostels, from one grouped SUM query"""
         from ..models.booking import Booking
-        from datetime import date
 
-        current_bookings = Booking.query.filter(
-            Booking.hostel_id == self.id,
-            Booking.status.in_(['confirmed', 'upcoming']),
+        if not hostel_ids:
+            return {}
+
+        rows = db.session.query(Booking.hostel_id, func.sum(Booking.guests)).filter(
+            Booking.hostel_id.in_(hostel_ids),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
             Booking.check_out >= date.today()
-        ).all()
+        ).group_by(Booking.hostel_id).all()
+
+        return {hostel_id: int(guests or 0) for hostel_id, guests in rows}
 
-        occupied_guests = sum(booking.guests for booking in current_bookings)
-        return max(0, self.capacity - occupied_guests)
+    @classmethod
+    def load_occupancy(cls, hostels):
+        """Memoise occupancy for a whole page of hostels before serialising them"""
+        pending = [hostel for hostel in hostels if '_occupied_guests' not in hostel.__dict__]
+        if pending:
+            occupied = cls.occupied_guests_by_hostel(list({hostel.id for hostel in pending}))
+            for hostel in pending:
+                hostel._occupied_guests = occupied.get(hostel.id, 0)
+        return hostels
+
+    @property
+    def available_rooms(self):
+        """Calculate available rooms based on capacity minus current confirmed bookings"""
+        # Memoised on the instance, i.e. for the rest of the request or until the next commit
+        if '_occupied_guests' not in self.__dict__:
+            self._occupied_guests = Hostel.occupied_guests_by_hostel([self.id]).get(self.id, 0)
+        return max(0, self.capacity - self._occupied_guests)
 
     def to_dict(self):
         # Retrieve stored availability settings
@@ -79,4 +117,44 @@ class Hostel(db.Model):
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "landlord": self.landlord.to_dict() if self.landlord else None
-        }
\ No newline at end of file
+        }
+
+
+@event.listens_for(Hostel, 'expire')
+def _forget_occupancy(target, attrs):
+    """Bookings may have changed once the instance is expired (e.g. after a commit)"""
+    if target is not None:  # None when the instance was already garbage-collected
+        target.__dict__.pop('_occupied_guests', None)
+
+
+def hostel_search_document():
+    """Weighted tsvector over the searchable text (Postgres): name A, location and university B, description C"""
+    def weighted(expression, weight):
+        vector = func.to_tsvector(text("'simple'::regconfig"), func.coalesce(expression, text("''")))
+        return func.setweight(vector, text(f"'{weight}'"))
+
+    return weighted(Hostel.name, 'A').op('||')(
+        weighted(Hostel.location, 'B')
+    ).op('||')(
+        weighted(Hostel.features.op('->>')(text("'university'")), 'B')
+    ).op('||')(
+        weighted(Hostel.description, 'C')
+    )
+
+
+# GIN index serving full-text search; queries must use the identical hostel_search_document() expression
+db.Index('ix_hostels_search_document', hostel_search_document(), postgresql_using='gin').ddl_if(dialect='postgresql')
+
+
+def hostel_trigram_fields():
+    """Columns searched by typo-tolerant matching (Postgres), each covered by a pg_trgm GIN index"""
+    return (Hostel.name, Hostel.location, Hostel.features.op('->>')(text("'university'")))
+
+
+event.listen(Hostel.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+db.Index('ix_hostels_name_trgm', Hostel.name, postgresql_using='gin',
+         postgresql_ops={'name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql')
+db.Index('ix_hostels_location_trgm', Hostel.location, postgresql_using='gin',
+         postgresql_ops={'location': 'gin_trgm_ops'}).ddl_if(dialect='postgresql')
+db.Index('ix_hostels_university_trgm', hostel_trigram_fields()[2].label('university'), postgresql_using='gin',
+         postgresql_ops={'university': 'gin_trgm_ops'}).ddl_if(dialect='postgresql')
@@ -0,0 +1,16 @@
+from ..extensions import db
+
+class HostelOccupancy(db.Model):
+    """Guests booked per hostel per night, maintained by BookingService"""
+    __tablename__ = "hostel_occupancy"
+
+    hostel_id = db.Column(db.Integer, db.ForeignKey('hostels.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    guests_booked = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "hostel_id": self.hostel_id,
+            "day": self.day.isoformat(),
+            "guests_booked": self.guests_booked
+        }
@@ -3,6 +3,10 @@ from datetime import datetime
 
 class Review(db.Model):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Seek index for cursor pagination of a hostel's reviews
+        db.Index('ix_reviews_hostel_created_at_id', 'hostel_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
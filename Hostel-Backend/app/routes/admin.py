@@ -4,6 +4,11 @@ from ..services.user_service import UserService
 from ..services.hostel_service import HostelService
 from ..services.booking_service import BookingService
 from ..services.review_service import ReviewService
+from ..services.admin_stats_service import AdminStatsService, admin_stats_cache
+from ..services.result_cache import result_cache
+from ..services.hostel_catalog import hostel_catalog
+from ..services.analytics_cache import analytics_cache
+from ..utils.cache import single_flight
 from ..middleware.auth_middleware import admin_required
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
@@ -101,43 +106,26 @@ def feature_hostel(hostel_id):
 def get_admin_stats():
     """Get admin statistics"""
     try:
-        # User stats
-        total_users = UserService.get_users_list(page=1, per_page=1)['total']
-        active_users = UserService.get_users_list(page=1, per_page=1, filters={'is_active': True})['total']
-        verified_users = UserService.get_users_list(page=1, per_page=1, filters={'email_verified': True})['total']
-
-        # Hostel stats
-        all_hostels = HostelService.get_all_hostels(page=1, per_page=1)
-        total_hostels = all_hostels['total']
-        verified_hostels = HostelService.get_all_hostels(page=1, per_page=1, filters={'verified_only': True})['total']
-        featured_hostels = HostelService.get_all_hostels(page=1, per_page=1, filters={'featured_only': True})['total']
-
-        # Booking stats
-        booking_stats = BookingService.get_booking_stats()
-
-        # Review stats
-        review_stats = ReviewService.get_reviews_stats()
-
-        stats = {
-            'users': {
-                'total': total_users,
-                'active': active_users,
-                'verified': verified_users
-            },
-            'hostels': {
-                'total': total_hostels,
-                'verified': verified_hostels,
-                'featured': featured_hostels
-            },
-            'bookings': booking_stats,
-            'reviews': review_stats
-        }
-
+        # One aggregate query per table, shared briefly between requests unless ?fresh=true
+        stats = AdminStatsService.get_stats(fresh=request.args.get('fresh', '').lower() in ('1', 'true'))
         return jsonify(stats), 200
 
     except Exception as e:
         return jsonify({"message": "Failed to get admin stats", "error": str(e)}), 500
 
+@admin_bp.get("/cache-stats")
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    """This worker's listing and dashboard caches, coalescing counters and hostel catalog memory (admin only)"""
+    return jsonify({
+        "result_cache": result_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "admin_stats_cache": admin_stats_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "catalog": hostel_catalog.memory_report()
+    }), 200
+
 @admin_bp.delete("/reviews/<int:review_id>")
 @jwt_required()
 @admin_required
@@ -5,6 +5,7 @@ from ..services.notification_service import NotificationService
 from ..services.payment_service import PaymentService
 from ..middleware.auth_middleware import landlord_required, student_required
 from ..utils.validator import is_valid_phone
+from ..utils.pagination import wants_total
 from datetime import datetime
 
 bookings_bp = Blueprint("bookings", __name__, url_prefix="/bookings")
@@ -51,6 +52,25 @@ def create_booking():
     except Exception as e:
         return jsonify({"message": "Failed to create booking", "error": str(e)}), 500
 
+@bookings_bp.post("/availability")
+def check_availability_bulk():
+    """Check availability for many hostels and date ranges at once"""
+    data = request.get_json(silent=True) or {}
+    items = data.get('items') if isinstance(data, dict) else data
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "items must be a non-empty list"}), 400
+    if len(items) > 100:
+        return jsonify({"message": "At most 100 items per request"}), 400
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({"message": "Each item must be an object"}), 400
+
+    try:
+        results = BookingService.check_availability_bulk(items)
+        return jsonify({"results": results}), 200
+    except Exception as e:
+        return jsonify({"message": "Failed to check availability", "error": str(e)}), 500
+
 @bookings_bp.get("/")
 @jwt_required()
 def get_user_bookings():
@@ -66,10 +86,14 @@ def get_user_bookings():
             user_id=user_id,
             page=page,
             per_page=per_page,
-            status=status
+            status=status,
+            cursor=request.args.get('cursor'),
+            include_total=wants_total(request.args.get('include_total'))
         )
         return jsonify(result), 200
 
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Failed to fetch bookings", "error": str(e)}), 500
 
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..services.hostel_service import HostelService
 from ..middleware.auth_middleware import landlord_required
+from ..utils.pagination import wants_total
 
 hostels_bp = Blueprint("hostels", __name__)
 
@@ -26,9 +27,17 @@ def get_hostels():
         }
 
         filters = {k: v for k, v in filters.items() if v is not None}
-        result = HostelService.get_all_hostels(page=page, per_page=per_page, filters=filters)
+        result = HostelService.get_all_hostels(
+            page=page,
+            per_page=per_page,
+            filters=filters,
+            cursor=request.args.get('cursor'),
+            include_total=wants_total(request.args.get('include_total'))
+        )
         return jsonify(result), 200
 
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Failed to fetch hostels", "error": str(e)}), 500
 
@@ -78,6 +87,8 @@ def update_hostel(hostel_id):
     try:
         hostel = HostelService.update_hostel(hostel_id, data, user_id)
         return jsonify({"message": "Hostel updated successfully", "hostel": hostel}), 200
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Failed to update hostel", "error": str(e)}), 500
 
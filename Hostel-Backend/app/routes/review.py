@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..services.review_service import ReviewService
+from ..utils.pagination import wants_total
 
 reviews_bp = Blueprint("reviews", __name__, url_prefix="/reviews")
 
@@ -84,10 +85,14 @@ def get_hostel_reviews(hostel_id):
         result = ReviewService.get_hostel_reviews(
             hostel_id=hostel_id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=request.args.get('cursor'),
+            include_total=wants_total(request.args.get('include_total'))
         )
         return jsonify(result), 200
 
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Failed to fetch reviews", "error": str(e)}), 500
 
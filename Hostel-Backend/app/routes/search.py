@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from ..services.search_service import SearchService
+from ..utils.pagination import wants_total
 
 search_bp = Blueprint("search", __name__, url_prefix="/search")
 
@@ -19,13 +20,46 @@ def search_hostels():
 
         page = int(processed_params.pop('page', '1'))
         per_page = int(processed_params.pop('per_page', '20'))
+        cursor = processed_params.pop('cursor', None)
+        include_total = wants_total(processed_params.pop('include_total', None))
 
-        result = SearchService.search_hostels(processed_params, page=page, per_page=per_page)
+        result = SearchService.search_hostels(
+            processed_params, page=page, per_page=per_page, cursor=cursor, include_total=include_total
+        )
         return jsonify(result), 200
 
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": "Search failed", "error": str(e)}), 500
 
+@search_bp.get("/nearest")
+def get_nearest_hostels():
+    """Get the k hostels closest to a point"""
+    try:
+        lat = request.args.get('lat')
+        lng = request.args.get('lng')
+        if not lat or not lng:
+            return jsonify({"message": "lat and lng are required"}), 400
+
+        k = min(max(int(request.args.get('k', 20)), 1), 100)
+
+        filters = {
+            'min_price': request.args.get('min_price'),
+            'max_price': request.args.get('max_price'),
+            'room_type': request.args.getlist('room_type'),
+            'amenities': request.args.getlist('amenities')
+        }
+        filters = {key: value for key, value in filters.items() if value}
+
+        result = SearchService.nearest_hostels(float(lat), float(lng), k=k, filters=filters)
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Nearest search failed", "error": str(e)}), 500
+
 @search_bp.get("/suggestions")
 def get_search_suggestions():
     """Get search suggestions"""
@@ -61,6 +95,28 @@ def get_price_ranges():
     except Exception as e:
         return jsonify({"message": "Failed to get price ranges", "error": str(e)}), 500
 
+@search_bp.get("/price-stats")
+def get_price_statistics():
+    """Get price percentiles and a price histogram, optionally per room type or location"""
+    try:
+        percentiles = [float(p) for p in request.args.get('percentiles', '25,50,75').split(',') if p.strip()]
+        if not percentiles or any(p < 0 or p > 100 for p in percentiles):
+            raise ValueError("percentiles must be numbers between 0 and 100")
+        bins = min(max(int(request.args.get('bins', 20)), 1), 100)
+
+        stats = SearchService.get_price_statistics(
+            room_type=request.args.getlist('room_type'),
+            location=request.args.get('location'),
+            percentiles=percentiles,
+            bins=bins
+        )
+        return jsonify(stats), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": "Failed to get price statistics", "error": str(e)}), 500
+
 @search_bp.get("/filters")
 def get_filter_options():
     """Get available filter options"""
@@ -102,7 +102,7 @@ class HostelSearchSchema(Schema):
     check_out = fields.Date(required=False)
     sort_by = fields.Str(
         required=False,
-        validate=validate.OneOf(['price_asc', 'price_desc', 'rating', 'newest', 'relevance'])
+        validate=validate.OneOf(['price_asc', 'price_desc', 'rating', 'newest', 'relevance', 'distance'])
     )
     page = fields.Int(required=False, default=1, validate=validate.Range(min=1))
     per_page = fields.Int(required=False, default=20, validate=validate.Range(min=1, max=100))
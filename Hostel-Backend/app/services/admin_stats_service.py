@@ -0,0 +1,56 @@
+from ..extensions import db
+from ..models.user import User
+from ..models.hostel import Hostel
+from .booking_service import BookingService
+from .review_service import ReviewService
+from ..utils.cache import LRUCache
+from sqlalchemy import case, func
+
+# Platform-wide figures may lag writes by this much; 0 recomputes them on every request
+ADMIN_STATS_TTL_SECONDS = 15
+
+admin_stats_cache = LRUCache(max_entries=1, ttl=ADMIN_STATS_TTL_SECONDS)
+
+
+def count_where(condition):
+    """COUNT of the rows matching condition, as a conditional aggregate (portable form of COUNT(*) FILTER (WHERE ...))"""
+    return func.count(case((condition, 1)))
+
+
+class AdminStatsService:
+    @staticmethod
+    def user_counts():
+        """Total, active and verified users in one pass over users"""
+        total, active, verified = db.session.query(
+            func.count(User.id),
+            count_where(User.is_active == True),
+            count_where(User.email_verified == True)
+        ).one()
+        return {'total': total, 'active': active, 'verified': verified}
+
+    @staticmethod
+    def hostel_counts():
+        """Total, verified and featured hostels in one pass over hostels"""
+        total, verified, featured = db.session.query(
+            func.count(Hostel.id),
+            count_where(Hostel.is_verified == True),
+            count_where(Hostel.is_featured == True)
+        ).one()
+        return {'total': total, 'verified': verified, 'featured': featured}
+
+    @staticmethod
+    def compute_stats():
+        """Every /admin/stats figure, from one aggregate query per table"""
+        return {
+            'users': AdminStatsService.user_counts(),
+            'hostels': AdminStatsService.hostel_counts(),
+            'bookings': BookingService.get_booking_stats(),
+            'reviews': ReviewService.get_reviews_stats()
+        }
+
+    @staticmethod
+    def get_stats(fresh=False):
+        """compute_stats(), shared for ADMIN_STATS_TTL_SECONDS unless fresh figures are asked for"""
+        if fresh:
+            admin_stats_cache.clear()
+        return admin_stats_cache.get('admin_stats', None, AdminStatsService.compute_stats)
@@ -0,0 +1,57 @@
+import hashlib
+import json
+from datetime import date
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..extensions import db
+from ..utils.cache import LRUCache, single_flight
+
+ANALYTICS_CACHE_ENTRIES = 1024
+# Also bounds how long a change made on another worker (or by a CLI command) can go unnoticed
+ANALYTICS_CACHE_TTL_SECONDS = 300
+
+# landlord id -> counter of committed changes to that landlord's bookings, reviews or hostels made by this worker
+_versions = {}
+
+# Dashboard payloads and their ETags, keyed by (landlord id, trend months)
+analytics_cache = LRUCache(ANALYTICS_CACHE_ENTRIES, ANALYTICS_CACHE_TTL_SECONDS)
+
+
+def landlord_version(landlord_id):
+    return _versions.get(landlord_id, 0)
+
+
+def landlord_changed(landlord_id):
+    """Mark a landlord's dashboard stale once the current transaction commits"""
+    if landlord_id is not None:
+        db.session.info.setdefault('changed_landlords', set()).add(landlord_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _landlords_committed(session):
+    # After the commit, so a dashboard computed meanwhile is never stored under the new version
+    for landlord_id in session.info.pop('changed_landlords', ()):
+        _versions[landlord_id] = _versions.get(landlord_id, 0) + 1
+
+
+@event.listens_for(Session, 'after_rollback')
+def _landlords_rolled_back(session):
+    session.info.pop('changed_landlords', None)
+
+
+def etag_of(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def cached_dashboard(landlord_id, months, compute):
+    """(payload, etag) of compute()'s dashboard, recomputed when the landlord's data or the date changes.
+
+    The date is part of the version because active bookings, occupancy and the trend all move with it.
+    """
+    def compute_with_etag():
+        # Refreshes requested at the same moment are computed once and shared
+        payload = single_flight.do(('landlord_analytics', landlord_id, months), compute)
+        return payload, etag_of(payload)
+
+    version = (landlord_version(landlord_id), date.today())
+    return analytics_cache.get((landlord_id, months), version, compute_with_etag)
@@ -0,0 +1,223 @@
+from ..extensions import db
+from ..models.hostel import Hostel
+from ..models.booking import Booking
+from ..models.booking_rollup import BookingDailyRollup
+from .occupancy_matrix import OccupancyMatrix
+from datetime import date, datetime, timedelta
+from sqlalchemy import extract, func
+
+DEFAULT_TREND_MONTHS = 4
+MAX_TREND_MONTHS = 24
+# Trailing window behind the dashboard's occupancy rate, and the default occupancy report window
+OCCUPANCY_WINDOW_DAYS = 30
+DEFAULT_PEAK_DAYS = 5
+
+
+def _shift_month(year, month, offset):
+    """(year, month) offset months away"""
+    index = year * 12 + month - 1 + offset
+    return index // 12, index % 12 + 1
+
+
+class DashboardHostel:
+    """One hostel's running totals while the dashboard folds its month rows together"""
+    __slots__ = ('id', 'name', 'capacity', 'active', 'bookings', 'paid_bookings', 'revenue')
+
+    def __init__(self, hostel_id, name, capacity, active):
+        self.id = hostel_id
+        self.name = name
+        self.capacity = capacity
+        self.active = active
+        self.bookings = 0
+        self.paid_bookings = 0
+        self.revenue = 0
+
+
+class AnalyticsService:
+    @staticmethod
+    def _month_bucket(column):
+        """Expressions grouping a date column by calendar month for the current dialect"""
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            return [func.date_trunc('month', column)]
+        if dialect == 'sqlite':
+            return [func.strftime('%Y-%m', column)]
+        # Portable fallback: EXTRACT is standard SQL
+        return [extract('year', column), extract('month', column)]
+
+    @staticmethod
+    def _month_key(bucket):
+        """(year, month) from the values of _month_bucket() in one result row"""
+        if len(bucket) == 2:
+            return int(bucket[0]), int(bucket[1])
+        value = bucket[0]
+        if isinstance(value, str):
+            year, month = value.split('-')[:2]
+            return int(year), int(month)
+        return value.year, value.month
+
+    @staticmethod
+    def landlord_dashboard(landlord, months=DEFAULT_TREND_MONTHS):
+        """Dashboard figures for one landlord's hostels, with a trend over the last `months` calendar months.
+
+        Two queries: the landlord's hostels joined to their rollup totals per calendar month (so the cost
+        follows days rather than bookings), which give both the per-hostel totals and the trend, and the
+        bookings behind the trailing occupancy rate.
+        """
+        if not 1 <= months <= MAX_TREND_MONTHS:
+            raise ValueError(f"months must be between 1 and {MAX_TREND_MONTHS}")
+
+        now = datetime.utcnow()
+
+        # 1. Per-hostel, per-month totals (hostels without bookings still appear through the outer joins)
+        bucket = AnalyticsService._month_bucket(BookingDailyRollup.day)
+        monthly = db.session.query(
+            BookingDailyRollup.hostel_id,
+            *[expression.label(f'month_{position}') for position, expression in enumerate(bucket)],
+            func.sum(BookingDailyRollup.bookings).label('bookings'),
+            func.sum(BookingDailyRollup.confirmed + BookingDailyRollup.completed).label('paid_bookings'),
+            func.sum(BookingDailyRollup.revenue).label('revenue')
+        ).filter(BookingDailyRollup.landlord_id == landlord.id)\
+         .group_by(BookingDailyRollup.hostel_id, *bucket)\
+         .subquery()
+        # Active bookings depend on today's date, so they come from the (small) set of current stays
+        active = db.session.query(
+            Booking.hostel_id,
+            func.count(Booking.id).label('active')
+        ).join(Hostel, Hostel.id == Booking.hostel_id)\
+         .filter(Hostel.landlord_id == landlord.id, Booking.status == 'confirmed', Booking.check_out >= now.date())\
+         .group_by(Booking.hostel_id)\
+         .subquery()
+        rows = db.session.query(
+            Hostel.id,
+            Hostel.name,
+            Hostel.capacity,
+            func.coalesce(active.c.active, 0),
+            *[monthly.c[f'month_{position}'] for position in range(len(bucket))],
+            func.coalesce(monthly.c.bookings, 0),
+            func.coalesce(monthly.c.paid_bookings, 0),
+            func.coalesce(monthly.c.revenue, 0)
+        ).outerjoin(monthly, monthly.c.hostel_id == Hostel.id)\
+         .outerjoin(active, active.c.hostel_id == Hostel.id)\
+         .filter(Hostel.landlord_id == landlord.id)\
+         .order_by(Hostel.id)\
+         .all()
+
+        if not rows:
+            return {
+                'totalRevenue': 0, 'monthlyRevenue': 0, 'totalBookings': 0,
+                'activeBookings': 0, 'occupancyRate': 0, 'averageRating': 0,
+                'topHostel': None, 'monthlyTrend': [], 'totalHostels': 0
+            }
+
+        # Fold the month rows into per-hostel totals (in hostel id order) and per-month totals
+        by_hostel = {}
+        by_month = {}
+        for hostel_id, name, capacity, active_count, *month, bookings, paid_bookings, revenue in rows:
+            hostel = by_hostel.setdefault(hostel_id, DashboardHostel(hostel_id, name, capacity, active_count))
+            hostel.bookings += bookings
+            hostel.paid_bookings += paid_bookings
+            hostel.revenue += revenue
+            if month[0] is not None:
+                key = AnalyticsService._month_key(month)
+                month_bookings, month_revenue = by_month.get(key, (0, 0))
+                by_month[key] = (month_bookings + bookings, month_revenue + revenue)
+        hostels = list(by_hostel.values())
+
+        # Trend over the window, oldest month first
+        window = [_shift_month(now.year, now.month, offset) for offset in range(1 - months, 1)]
+        monthly_trend = [
+            {
+                'month': datetime(year, month, 1).strftime('%b'),
+                'year': year,
+                'revenue': float(by_month.get((year, month), (0, 0))[1]),
+                'bookings': by_month.get((year, month), (0, 0))[0]
+            } for year, month in window
+        ]
+
+        active_bookings = sum(hostel.active for hostel in hostels)
+        # 2. Share of bed-nights booked over the trailing window, from the occupancy matrix
+        end = now.date() + timedelta(days=1)
+        occupancy_rate = OccupancyMatrix.load(
+            landlord.id, [hostel.id for hostel in hostels], [hostel.capacity for hostel in hostels],
+            end - timedelta(days=OCCUPANCY_WINDOW_DAYS), end
+        ).occupancy_rate()
+
+        # Top hostel by revenue, hostels sharing a name counted together; the first hostel if nothing was paid for
+        by_name = {}
+        for hostel in hostels:
+            if hostel.paid_bookings:
+                revenue, bookings = by_name.get(hostel.name, (0, 0))
+                by_name[hostel.name] = (revenue + hostel.revenue, bookings + hostel.paid_bookings)
+        if by_name:
+            name = max(by_name, key=lambda key: by_name[key][0])
+            top_hostel = {'name': name, 'revenue': float(by_name[name][0]), 'bookings': by_name[name][1]}
+        else:
+            top_hostel = {'name': hostels[0].name, 'revenue': 0, 'bookings': 0}
+
+        return {
+            'totalRevenue': float(sum(hostel.revenue for hostel in hostels)),
+            'monthlyRevenue': monthly_trend[-1]['revenue'],
+            'totalBookings': sum(hostel.bookings for hostel in hostels),
+            'activeBookings': active_bookings,
+            'occupancyRate': occupancy_rate,
+            'averageRating': round(landlord.rating, 1) if landlord.rating else 0,
+            'topHostel': top_hostel,
+            'monthlyTrend': monthly_trend,
+            'totalHostels': len(hostels)
+        }
+
+    @staticmethod
+    def landlord_occupancy(landlord, start=None, end=None, peaks=DEFAULT_PEAK_DAYS, min_gap_nights=1):
+        """Nightly occupancy of a landlord's hostels over [start, end): overall and per-hostel rates,
+        the fullest nights and the runs of completely empty nights per hostel.
+
+        Defaults to the last OCCUPANCY_WINDOW_DAYS nights up to and including today.
+        """
+        if end is None:
+            end = (start + timedelta(days=OCCUPANCY_WINDOW_DAYS)) if start else date.today() + timedelta(days=1)
+        if start is None:
+            start = end - timedelta(days=OCCUPANCY_WINDOW_DAYS)
+        if peaks < 0 or min_gap_nights < 1:
+            raise ValueError("peaks must be 0 or more and min_gap_nights at least 1")
+
+        hostels = db.session.query(Hostel.id, Hostel.name, Hostel.capacity)\
+            .filter(Hostel.landlord_id == landlord.id)\
+            .order_by(Hostel.id)\
+            .all()
+        matrix = OccupancyMatrix.load(
+            landlord.id, [hostel.id for hostel in hostels], [hostel.capacity or 0 for hostel in hostels], start, end
+        )
+
+        bed_nights, rates = matrix.hostel_rates()
+        gaps = [[] for _ in hostels]
+        for row, first, resume in zip(*matrix.vacancy_gaps(min_gap_nights)):
+            gaps[row].append({
+                'start': matrix.day(first).isoformat(),
+                'end': matrix.day(resume).isoformat(),
+                'nights': int(resume - first)
+            })
+        guests, daily_rates = matrix.daily_rates()
+
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'nights': matrix.days,
+            'totalCapacity': int(matrix.capacities.sum()),
+            'occupancyRate': matrix.occupancy_rate(),
+            'peakDays': [
+                {'date': matrix.day(column).isoformat(), 'guests': int(guests[column]),
+                 'occupancyRate': float(daily_rates[column])}
+                for column in matrix.peak_days(peaks)
+            ],
+            'daily': [
+                {'date': matrix.day(column).isoformat(), 'guests': int(guests[column]),
+                 'occupancyRate': float(daily_rates[column])}
+                for column in range(matrix.days)
+            ],
+            'hostels': [
+                {'id': hostel.id, 'name': hostel.name, 'capacity': hostel.capacity,
+                 'bedNights': int(bed_nights[row]), 'occupancyRate': float(rates[row]), 'vacancyGaps': gaps[row]}
+                for row, hostel in enumerate(hostels)
+            ]
+        }
@@ -1,8 +1,14 @@
 from ..extensions import db
 from ..models.booking import Booking
 from ..models.hostel import Hostel
+from .occupancy_service import OccupancyService
+from .rollup_service import BookingRollupService
+from .analytics_cache import landlord_changed
+from ..models.booking_rollup import BookingDailyRollup
+from ..utils.pagination import keyset_paginate
 from datetime import datetime, date
-from sqlalchemy import and_, or_
+from flask import abort
+from sqlalchemy import func, update
 
 class BookingService:
     @staticmethod
@@ -18,19 +24,19 @@ class BookingService:
         if check_in_date < date.today():
             raise ValueError("Check-in date cannot be in the past")
 
-        # Check availability
-        if not BookingService.check_availability(hostel_id, check_in_date, check_out_date, guests):
-            raise ValueError("Hostel is not available for the selected dates")
+        try:
+            # Lock the hostel first so the availability check and the insert see no concurrent booking
+            hostel = BookingService._lock_hostel(hostel_id)
 
-        # Get hostel for pricing
-        hostel = Hostel.query.get_or_404(hostel_id)
+            # Check availability
+            if not BookingService.check_availability(hostel_id, check_in_date, check_out_date, guests):
+                raise ValueError("Hostel is not available for the selected dates")
 
-        # Calculate total price (per month per person)
-        days = (check_out_date - check_in_date).days
-        months = max(1, round(days / 30))  # At least 1 month, round to nearest month
-        total_price = hostel.price * months * guests
+            # Calculate total price (per month per person)
+            days = (check_out_date - check_in_date).days
+            months = max(1, round(days / 30))  # At least 1 month, round to nearest month
+            total_price = hostel.price * months * guests
 
-        try:
             booking = Booking(
                 user_id=user_id,
                 hostel_id=hostel_id,
@@ -42,12 +48,36 @@ class BookingService:
             )
 
             db.session.add(booking)
+            OccupancyService.apply_booking(booking)
+            BookingRollupService.apply_booking(booking)
+            landlord_changed(hostel.landlord_id)
             db.session.commit()
             return booking.to_dict()
         except Exception as e:
             db.session.rollback()
             raise e
 
+    @staticmethod
+    def _lock_hostel(hostel_id):
+        """Take a per-hostel write lock that is held until the current transaction ends"""
+        if db.session.get_bind().dialect.name == 'sqlite':
+            # SQLite has no row locks: a no-op write takes the database write lock, serialising writers
+            db.session.execute(
+                update(Hostel)
+                .where(Hostel.id == hostel_id)
+                .values(updated_at=Hostel.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            return Hostel.query.get_or_404(hostel_id)
+
+        hostel = Hostel.query.filter_by(id=hostel_id)\
+            .with_for_update()\
+            .populate_existing()\
+            .first()
+        if hostel is None:
+            abort(404)
+        return hostel
+
     @staticmethod
     def check_availability(hostel_id, check_in, check_out, guests=1):
         """Check if a hostel is available for the given dates and number of guests"""
@@ -55,28 +85,67 @@ class BookingService:
         hostel = Hostel.query.get_or_404(hostel_id)
         max_capacity = hostel.capacity
 
-        # Check for overlapping bookings and sum their guests
-        overlapping_bookings = Booking.query.filter(
-            and_(
-                Booking.hostel_id == hostel_id,
-                Booking.status.in_(['confirmed', 'upcoming']),
-                or_(
-                    and_(Booking.check_in <= check_in, Booking.check_out > check_in),
-                    and_(Booking.check_in < check_out, Booking.check_out >= check_out),
-                    and_(Booking.check_in >= check_in, Booking.check_out <= check_out)
-                )
-            )
-        ).all()
-
-        # Sum guests from overlapping bookings
-        total_guests_booked = sum(booking.guests for booking in overlapping_bookings)
+        # Busiest night of the stay, from the per-night occupancy ledger
+        peak_guests_booked = OccupancyService.peak_guests(hostel_id, check_in, check_out)
 
         # Check if adding new guests would exceed capacity
-        return (total_guests_booked + guests) <= max_capacity
+        return (peak_guests_booked + guests) <= max_capacity
+
+    @staticmethod
+    def check_availability_bulk(items):
+        """check_availability for many {hostel_id, check_in, check_out, guests} items in two queries"""
+        results = []
+        stays = []
+        for item in items:
+            result = {
+                'hostel_id': item.get('hostel_id'),
+                'check_in': item.get('check_in'),
+                'check_out': item.get('check_out'),
+                'guests': item.get('guests', 1)
+            }
+            try:
+                hostel_id = int(result['hostel_id'])
+                check_in = date.fromisoformat(result['check_in'])
+                check_out = date.fromisoformat(result['check_out'])
+                guests = int(result['guests'])
+            except (TypeError, ValueError):
+                result.update({'available': False, 'error': 'Invalid hostel_id, dates or guests'})
+                stays.append(None)
+            else:
+                # Same rules create_booking enforces, so an item reported available can be booked
+                if check_out <= check_in:
+                    result.update({'available': False, 'error': 'Check-out date must be after check-in date'})
+                    stays.append(None)
+                elif guests < 1:
+                    result.update({'available': False, 'error': 'Guests must be at least 1'})
+                    stays.append(None)
+                else:
+                    stays.append((hostel_id, check_in, check_out, guests))
+            results.append(result)
+
+        valid = [stay for stay in stays if stay is not None]
+        capacities = dict(
+            db.session.query(Hostel.id, Hostel.capacity)
+            .filter(Hostel.id.in_({stay[0] for stay in valid}))
+            .all()
+        ) if valid else {}
+        peaks = iter(OccupancyService.peak_guests_many([stay[:3] for stay in valid]))
+
+        for result, stay in zip(results, stays):
+            if stay is None:
+                continue
+            hostel_id, _, _, guests = stay
+            peak_guests_booked = next(peaks)
+            if hostel_id not in capacities:
+                result.update({'available': False, 'error': 'Hostel not found'})
+            else:
+                result['available'] = (peak_guests_booked + guests) <= capacities[hostel_id]
+
+        return results
 
     @staticmethod
-    def get_user_bookings(user_id, page=1, per_page=20, status=None):
-        """Get all bookings for a user"""
+    def get_user_bookings(user_id, page=1, per_page=20, status=None, cursor=None, include_total=False):
+        """Get all bookings for a user (pass cursor, '' for the first page, to seek instead of offset)"""
         query = Booking.query.filter_by(user_id=user_id)
 
         if status:
@@ -84,8 +153,17 @@ class BookingService:
 
         query = query.order_by(Booking.created_at.desc())
 
+        if cursor is not None:
+            bookings = keyset_paginate(
+                query, [(Booking.created_at, True), (Booking.id, True)], cursor, per_page, include_total
+            )
+            BookingService._load_hostel_occupancy(bookings.items)
+            return bookings.to_dict('bookings', [booking.to_dict() for booking in bookings.items])
+
         bookings = query.paginate(page=page, per_page=per_page, error_out=False)
 
+        BookingService._load_hostel_occupancy(bookings.items)
+
         return {
             'bookings': [booking.to_dict() for booking in bookings.items],
             'total': bookings.total,
@@ -119,6 +197,9 @@ class BookingService:
             raise ValueError("Cannot cancel booking on or after check-in date")
 
         try:
+            OccupancyService.apply_status_change(booking, booking.status, 'cancelled')
+            BookingRollupService.apply_status_change(booking, booking.status, 'cancelled')
+            landlord_changed(booking.hostel.landlord_id)
             booking.status = 'cancelled'
             booking.updated_at = datetime.utcnow()
             db.session.commit()
@@ -143,6 +224,8 @@ class BookingService:
             .order_by(Booking.created_at.desc())\
             .paginate(page=page, per_page=per_page, error_out=False)
 
+        BookingService._load_hostel_occupancy(bookings.items)
+
         return {
             'bookings': [booking.to_dict() for booking in bookings.items],
             'total': bookings.total,
@@ -167,6 +250,9 @@ class BookingService:
             raise ValueError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
 
         try:
+            OccupancyService.apply_status_change(booking, booking.status, status)
+            BookingRollupService.apply_status_change(booking, booking.status, status)
+            landlord_changed(booking.hostel.landlord_id)
             booking.status = status
             booking.updated_at = datetime.utcnow()
             db.session.commit()
@@ -207,6 +293,8 @@ class BookingService:
 
         bookings = query.paginate(page=page, per_page=per_page, error_out=False)
 
+        BookingService._load_hostel_occupancy(bookings.items)
+
         # Enhance booking data with hostel and user info
         enhanced_bookings = []
         for booking in bookings.items:
@@ -224,28 +312,29 @@ class BookingService:
             'current_page': bookings.page
         }
 
+    @staticmethod
+    def _load_hostel_occupancy(bookings):
+        """Prime available_rooms for every hostel embedded in a page of bookings"""
+        Hostel.load_occupancy({booking.hostel for booking in bookings if booking.hostel})
+
     @staticmethod
     def get_booking_stats(hostel_id=None, landlord_id=None):
         """Get booking statistics"""
-        query = Booking.query
+        # Summed from the daily rollup, so the cost follows days rather than bookings
+        query = db.session.query(
+            func.coalesce(func.sum(BookingDailyRollup.bookings), 0),
+            func.coalesce(func.sum(BookingDailyRollup.confirmed), 0),
+            func.coalesce(func.sum(BookingDailyRollup.cancellations), 0),
+            func.coalesce(func.sum(BookingDailyRollup.completed), 0),
+            func.coalesce(func.sum(BookingDailyRollup.revenue), 0)
+        )
 
         if hostel_id:
-            query = query.filter_by(hostel_id=hostel_id)
+            query = query.filter(BookingDailyRollup.hostel_id == hostel_id)
         elif landlord_id:
-            # Get all bookings for landlord's hostels
-            hostels = Hostel.query.filter_by(landlord_id=landlord_id).all()
-            hostel_ids = [h.id for h in hostels]
-            query = query.filter(Booking.hostel_id.in_(hostel_ids))
-
-        total_bookings = query.count()
-        confirmed_bookings = query.filter_by(status='confirmed').count()
-        cancelled_bookings = query.filter_by(status='cancelled').count()
-        completed_bookings = query.filter_by(status='completed').count()
-
-        # Calculate total revenue
-        total_revenue = db.session.query(db.func.sum(Booking.total_price))\
-            .filter(Booking.status.in_(['confirmed', 'completed']))\
-            .scalar() or 0
+            query = query.filter(BookingDailyRollup.landlord_id == landlord_id)
+
+        total_bookings, confirmed_bookings, cancelled_bookings, completed_bookings, total_revenue = query.one()
 
         return {
             'total_bookings': total_bookings,
@@ -0,0 +1,271 @@
+import math
+import sys
+import numpy as np
+from ..extensions import db
+from .local_index import HostelLocalIndex, ratings_version
+from ..models.amenity import amenity_mask
+from ..models.hostel import Hostel
+from ..utils.geo_utils import bounding_box, haversine_km
+
+# Sort orders precomputed on every build; 'distance' is ordered per query
+SORT_ORDERS = ('newest', 'price_asc', 'price_desc', 'rating')
+# Position of rating_avg in the catalog rows
+RATING = 9
+
+
+def _flag(value):
+    """Tri-state flag column: 1 true, 0 false, -1 missing (SQL NULL never equals either)"""
+    return -1 if value is None else int(bool(value))
+
+
+def page_of(ids, page, per_page):
+    """One page of an ordered id array, with the totals Flask-SQLAlchemy's paginate would report"""
+    page = page if page >= 1 else 1
+    per_page = per_page if per_page >= 1 else 20
+    total = len(ids)
+    return {
+        'ids': ids[(page - 1) * per_page:page * per_page].tolist(),
+        'total': total,
+        'pages': math.ceil(total / per_page) if total else 0,
+        'page': page,
+        'per_page': per_page
+    }
+
+
+class HostelCatalog(HostelLocalIndex):
+    """Per-process columnar copy of the fields hostel listings filter and sort on.
+
+    Listing filters are evaluated as NumPy masks over these columns, so the database only
+    hydrates the ids of the page being served.
+    """
+    columns = ('name', 'location', 'features', 'price', 'capacity', 'room_type', 'latitude', 'longitude',
+               'is_verified', 'is_featured', 'amenity_mask', 'rating_avg', 'created_at')
+
+    def __init__(self):
+        super().__init__()
+        self._ids = np.empty(0, dtype=np.int64)
+        self._prices = np.empty(0)
+        self._capacities = np.empty(0, dtype=np.int32)
+        self._room_types = np.empty(0, dtype=np.int16)
+        self._room_type_codes = {}
+        self._lats = np.empty(0)
+        self._lngs = np.empty(0)
+        self._verified = np.empty(0, dtype=np.int8)
+        self._featured = np.empty(0, dtype=np.int8)
+        self._furnished = np.empty(0, dtype=np.int8)
+        self._amenity_masks = np.empty(0, dtype=np.int64)
+        self._ratings = np.empty(0)
+        self._ratings_seen = None  # ratings_version() the rating column reflects
+        self._texts = []  # distinct lower-cased location / name / university strings
+        self._text_codes = np.empty((0, 3), dtype=np.int32)  # per hostel: index into _texts, -1 if empty
+        self._orders = {sort: np.empty(0, dtype=np.int64) for sort in SORT_ORDERS}
+
+    def make_row(self, values):
+        features = values['features'] if isinstance(values['features'], dict) else {}
+        university = features.get('university')
+        created_at = values['created_at']
+        return (
+            values['price'],
+            values['capacity'],
+            values['room_type'],
+            values['latitude'],
+            values['longitude'],
+            _flag(values['is_verified']),
+            _flag(values['is_featured']),
+            _flag(features['furnished']) if isinstance(features.get('furnished'), (bool, int)) else -1,
+            values['amenity_mask'] or 0,
+            values['rating_avg'],
+            created_at.timestamp() if created_at is not None else None,
+            (values['location'] or '').lower(),
+            (values['name'] or '').lower(),
+            str(university).lower() if university else ''
+        )
+
+    def build(self, rows):
+        """Rebuild the columns and sort orders from the in-memory rows"""
+        ids = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+        rows = list(rows.values())
+
+        def column(position, dtype, missing=np.nan):
+            return np.array([missing if row[position] is None else row[position] for row in rows], dtype=dtype)
+
+        room_type_codes = {}
+        text_positions = {}
+        text_codes = np.full((len(rows), 3), -1, dtype=np.int32)
+        for row_number, row in enumerate(rows):
+            for field, value in enumerate(row[11:14]):
+                if value:
+                    text_codes[row_number, field] = text_positions.setdefault(value, len(text_positions))
+
+        self._ids = ids
+        self._prices = column(0, np.float64)
+        self._capacities = column(1, np.int32, 0)
+        self._room_types = np.array([room_type_codes.setdefault(row[2], len(room_type_codes)) for row in rows],
+                                    dtype=np.int16)
+        self._room_type_codes = room_type_codes
+        self._lats = column(3, np.float64)
+        self._lngs = column(4, np.float64)
+        self._verified = column(5, np.int8)
+        self._featured = column(6, np.int8)
+        self._furnished = column(7, np.int8)
+        self._amenity_masks = column(8, np.int64)
+        self._ratings = column(RATING, np.float64)
+        self._texts = list(text_positions)
+        self._text_codes = text_codes
+
+        # argsort puts NaN last, so hostels without a rating or date trail the desc orders like NULLS LAST
+        created = column(10, np.float64)
+        self._orders = {
+            'newest': np.argsort(-created, kind='stable'),
+            'price_asc': np.argsort(self._prices, kind='stable'),
+            'price_desc': np.argsort(-self._prices, kind='stable'),
+            'rating': np.argsort(-self._ratings, kind='stable')
+        }
+
+    def load(self):
+        # Taken first, so rating changes committed during the load are picked up on the next check
+        seen = ratings_version()
+        super().load()
+        with self._lock:
+            self._ratings_seen = seen
+
+    def ensure_fresh(self):
+        """Reload or rebuild like every local index, then pick up rating changes from other workers.
+
+        Review writes leave the table signature alone, so ratings are tracked by ratings_version() and
+        refreshed in place: one two-column query and one re-sort, never a rebuild of the other columns.
+        """
+        super().ensure_fresh()
+        version = ratings_version()
+        if version != self._ratings_seen:
+            ratings = dict(db.session.query(Hostel.id, Hostel.rating_avg).all())
+            with self._lock:
+                for hostel_id, row in self._rows.items():
+                    if row[RATING] != ratings.get(hostel_id):
+                        self._rows[hostel_id] = row[:RATING] + (ratings.get(hostel_id),) + row[RATING + 1:]
+                if not self._dirty:
+                    self._ratings = np.array([ratings.get(hostel_id, np.nan) for hostel_id in self._ids.tolist()],
+                                             dtype=np.float64)
+                    self._orders = dict(self._orders, rating=np.argsort(-self._ratings, kind='stable'))
+                self._ratings_seen = version
+
+    def rating_changed(self, hostel_id, rating_avg, version):
+        """Move one hostel within the rating order after this worker committed a review (version from
+        ratings_changed()); the other columns and orders are left alone"""
+        with self._lock:
+            if not self._loaded:
+                return
+            row = self._rows.get(hostel_id)
+            if row is not None:
+                self._rows[hostel_id] = row[:RATING] + (rating_avg,) + row[RATING + 1:]
+                if not self._dirty:
+                    self._move_in_rating_order(hostel_id, rating_avg)
+            # Only claim the new version when nothing else changed since the one already reflected
+            if self._ratings_seen == version - 1:
+                self._ratings_seen = version
+
+    def _move_in_rating_order(self, hostel_id, rating_avg):
+        positions = np.flatnonzero(self._ids == hostel_id)
+        if not len(positions):
+            return
+        position = positions[0]
+        ratings = self._ratings.copy()
+        ratings[position] = np.nan if rating_avg is None else rating_avg
+
+        # Same order as the stable argsort of -ratings: higher first, NaN last, ties by position
+        rest = self._orders['rating'][self._orders['rating'] != position]
+        others = ratings[rest]
+        if np.isnan(ratings[position]):
+            before = ~np.isnan(others) | (rest < position)
+        else:
+            before = (others > ratings[position]) | ((others == ratings[position]) & (rest < position))
+        # The orders are swapped, never written to, so selections already running keep a consistent view
+        self._ratings = ratings
+        self._orders = dict(self._orders, rating=np.insert(rest, np.count_nonzero(before), position))
+
+    def _text_mask(self, term):
+        """Hostels whose location, name or university contains term, ignoring case"""
+        term = term.lower()
+        matches = np.fromiter((term in text for text in self._texts), dtype=bool, count=len(self._texts))
+        # The appended False is picked by the -1 codes of empty fields
+        return np.append(matches, False)[self._text_codes].any(axis=1)
+
+    def select(self, sort_by='newest', location=None, min_price=None, max_price=None, room_types=None,
+               min_capacity=None, amenities=None, verified=None, featured=None, furnished=None, near=None):
+        """Ids of the hostels passing every given filter, in sort_by order, plus their distances for near searches.
+
+        near is (lat, lng, radius_km). Returns None when location holds LIKE wildcards, which
+        only the database evaluates faithfully.
+        """
+        if location and ('%' in location or '_' in location):
+            return None
+        required_amenities = amenity_mask(amenities, strict=True) if amenities else 0
+
+        self.ensure_fresh()
+        with self._lock:
+            ids, lats, lngs, orders = self._ids, self._lats, self._lngs, self._orders
+            mask = np.ones(len(ids), dtype=bool)
+            if location:
+                mask &= self._text_mask(location)
+            if min_price is not None:
+                mask &= self._prices >= min_price
+            if max_price is not None:
+                mask &= self._prices <= max_price
+            if room_types:
+                codes = [self._room_type_codes[value] for value in room_types if value in self._room_type_codes]
+                mask &= np.isin(self._room_types, codes)
+            if min_capacity is not None:
+                mask &= self._capacities >= min_capacity
+            if required_amenities is None:
+                mask[:] = False
+            elif required_amenities:
+                mask &= (self._amenity_masks & required_amenities) == required_amenities
+            for flags, wanted in ((self._verified, verified), (self._featured, featured), (self._furnished, furnished)):
+                if wanted is not None:
+                    mask &= flags == int(wanted)
+
+        distances = None
+        if near is not None:
+            lat, lng, radius = near
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+            mask &= (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+            distances = np.full(len(ids), np.inf)
+            candidates = np.flatnonzero(mask)
+            distances[candidates] = haversine_km(lat, lng, lats[candidates], lngs[candidates])
+            mask &= distances <= radius
+
+        if sort_by == 'distance' and distances is not None:
+            positions = np.flatnonzero(mask)
+            positions = positions[np.argsort(distances[positions], kind='stable')]
+        else:
+            order = orders.get(sort_by, orders['newest'])
+            positions = order[mask[order]]
+        return ids[positions], distances[positions] if distances is not None else None
+
+    def memory_report(self):
+        """Bytes held per column, for sizing workers"""
+        self.ensure_fresh()
+        with self._lock:
+            columns = {
+                'ids': self._ids.nbytes,
+                'prices': self._prices.nbytes,
+                'capacities': self._capacities.nbytes,
+                'room_types': self._room_types.nbytes,
+                'coordinates': self._lats.nbytes + self._lngs.nbytes,
+                'flags': self._verified.nbytes + self._featured.nbytes + self._furnished.nbytes,
+                'amenity_masks': self._amenity_masks.nbytes,
+                'texts': self._text_codes.nbytes + sum(sys.getsizeof(text) for text in self._texts),
+                'sort_orders': sum(order.nbytes for order in self._orders.values())
+            }
+            # The per-hostel rows are kept too, so single writes can be applied without a reload
+            rows = sys.getsizeof(self._rows) + sum(sys.getsizeof(row) for row in self._rows.values())
+            return {
+                'hostels': len(self._ids),
+                'columns': columns,
+                'column_bytes': sum(columns.values()),
+                'row_bytes': rows,
+                'total_bytes': sum(columns.values()) + rows
+            }
+
+
+hostel_catalog = HostelCatalog()
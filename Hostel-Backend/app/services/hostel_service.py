@@ -1,14 +1,75 @@
 from ..extensions import db
 from ..models.hostel import Hostel
-from ..models.amenity import Amenity
-from ..models.review import Review
-from sqlalchemy import and_, or_, func
+from ..models.amenity import Amenity, amenity_mask
+from ..models.booking_rollup import BookingDailyRollup
+from ..models.occupancy import HostelOccupancy
+from .local_index import hostel_saved, hostel_deleted
+from .text_index import text_search
+from .result_cache import cached_page, hydrate
+from .hostel_catalog import hostel_catalog, page_of
+from .analytics_cache import landlord_changed
+from ..utils.pagination import keyset_paginate
+from sqlalchemy import and_, or_, func, bindparam
 from datetime import datetime
 
 class HostelService:
     @staticmethod
-    def get_all_hostels(page=1, per_page=20, filters=None):
-        """Get all hostels with pagination and filters"""
+    def get_all_hostels(page=1, per_page=20, filters=None, cursor=None, include_total=False):
+        """Get all hostels with pagination and filters (pass cursor, '' for the first page, to seek instead of offset)"""
+        if cursor is not None:
+            query = HostelService._listing_query(filters)
+            sort_by = filters.get('sort_by', 'created_at') if filters else 'created_at'
+            hostels = keyset_paginate(query, HostelService.keyset_order(sort_by), cursor, per_page, include_total)
+            return hostels.to_dict('hostels', [hostel.to_dict() for hostel in Hostel.load_occupancy(hostels.items)])
+
+        # Only the page's ids are cached: hydrating them afresh keeps occupancy current
+        result = cached_page('hostels', filters or {}, page, per_page,
+                             lambda: HostelService._listing_page(filters, page, per_page))
+        return {
+            'hostels': [hostel.to_dict() for hostel in hydrate(result['ids'])],
+            'total': result['total'],
+            'pages': result['pages'],
+            'current_page': result['page'],
+            'per_page': result['per_page']
+        }
+
+    @staticmethod
+    def _listing_page(filters, page, per_page):
+        """Ids and totals of one offset page of the hostel listing"""
+        filters = filters or {}
+        selection = hostel_catalog.select(
+            sort_by=filters.get('sort_by') if filters.get('sort_by') in ('price_asc', 'price_desc') else 'newest',
+            location=filters.get('location') or None,
+            min_price=float(filters['min_price']) if filters.get('min_price') else None,
+            max_price=float(filters['max_price']) if filters.get('max_price') else None,
+            room_types=HostelService._as_list(filters.get('room_type')),
+            min_capacity=float(filters['min_capacity']) if filters.get('min_capacity') else None,
+            amenities=HostelService._as_list(filters.get('amenities')),
+            verified=True if filters.get('verified_only') else None
+        )
+        if selection is not None:
+            return page_of(selection[0], page, per_page)
+
+        hostels = HostelService._listing_query(filters).with_entities(Hostel.id).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        return {
+            'ids': [row.id for row in hostels.items],
+            'total': hostels.total,
+            'pages': hostels.pages,
+            'page': hostels.page,
+            'per_page': hostels.per_page
+        }
+
+    @staticmethod
+    def _as_list(value):
+        if not value:
+            return None
+        return value if isinstance(value, list) else [value]
+
+    @staticmethod
+    def _listing_query(filters):
+        """Sorted hostel query for the listing filters"""
         query = Hostel.query
 
         if filters:
@@ -36,6 +97,9 @@ class HostelService:
             if filters.get('min_capacity'):
                 query = query.filter(Hostel.capacity >= filters['min_capacity'])
 
+            if filters.get('amenities'):
+                query = query.filter(HostelService.amenities_clause(filters['amenities']))
+
             if filters.get('verified_only'):
                 query = query.filter(Hostel.is_verified == True)
 
@@ -48,26 +112,61 @@ class HostelService:
         else:
             query = query.order_by(Hostel.created_at.desc())
 
-        hostels = query.paginate(page=page, per_page=per_page, error_out=False)
+        return query
 
-        return {
-            'hostels': [hostel.to_dict() for hostel in hostels.items],
-            'total': hostels.total,
-            'pages': hostels.pages,
-            'current_page': hostels.page,
-            'per_page': hostels.per_page
-        }
+    @staticmethod
+    def amenities_clause(amenities):
+        """SQL predicate: the hostel has every amenity listed (Amenity ids or names)"""
+        required = amenity_mask(amenities if isinstance(amenities, list) else [amenities], strict=True)
+        if required is None:
+            # An amenity nobody can have
+            return Hostel.id == -1
+        return Hostel.amenity_mask.op('&')(required) == required
+
+    @staticmethod
+    def backfill_amenity_masks():
+        """Recompute amenity_mask from the amenities JSON for every hostel, returning how many changed"""
+        name_ids = dict(db.session.query(func.lower(Amenity.name), Amenity.id).all())
+        changed = [
+            {'hostel_id': hostel_id, 'mask': mask}
+            for hostel_id, amenities, current in db.session.query(Hostel.id, Hostel.amenities, Hostel.amenity_mask)
+            for mask in [amenity_mask(amenities, name_ids=name_ids)]
+            if mask != current
+        ]
+
+        try:
+            if changed:
+                db.session.execute(
+                    Hostel.__table__.update()
+                    .where(Hostel.__table__.c.id == bindparam('hostel_id'))
+                    .values(amenity_mask=bindparam('mask')),
+                    changed
+                )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+        return len(changed)
+
+    @staticmethod
+    def keyset_order(sort_by):
+        """Seek columns for cursor pagination of hostel listings, matching the sort order"""
+        if sort_by == 'price_asc':
+            return [(Hostel.price, False), (Hostel.id, False)]
+        if sort_by == 'price_desc':
+            return [(Hostel.price, True), (Hostel.id, True)]
+        if sort_by in ('rating', 'distance'):
+            raise ValueError(f"Cursor pagination does not support sort_by={sort_by}")
+        return [(Hostel.created_at, True), (Hostel.id, True)]
 
     @staticmethod
     def get_hostel_by_id(hostel_id):
         """Get a single hostel by ID with related data"""
         hostel = Hostel.query.get_or_404(hostel_id)
 
-        avg_rating = db.session.query(func.avg(Review.rating)).filter(
-            Review.hostel_id == hostel_id
-        ).scalar() or 0.0
-
-        review_count = Review.query.filter_by(hostel_id=hostel_id).count()
+        avg_rating = hostel.average_rating
+        review_count = hostel.review_count
         features = hostel.features or {}
         availability = hostel.availability or {}
 
@@ -141,8 +240,11 @@ class HostelService:
             landlord_id=landlord.id,
             **hostel_data
         )
+        hostel.amenity_mask = amenity_mask(hostel.amenities)
         db.session.add(hostel)
+        landlord_changed(landlord.id)
         db.session.commit()
+        hostel_saved(hostel)
         return hostel.to_dict()
 
     @staticmethod
@@ -160,9 +262,13 @@ class HostelService:
         for key, value in update_data.items():
             if hasattr(hostel, key):
                 setattr(hostel, key, value)
+        if 'amenities' in update_data:
+            hostel.amenity_mask = amenity_mask(hostel.amenities)
 
         hostel.updated_at = datetime.utcnow()
+        landlord_changed(landlord.id)
         db.session.commit()
+        hostel_saved(hostel)
         return hostel.to_dict()
 
     @staticmethod
@@ -178,7 +284,13 @@ class HostelService:
         ).first_or_404()
 
         db.session.delete(hostel)
+        # Its bookings go with it (ORM cascade), so do their ledger and rollup rows; the foreign keys'
+        # ON DELETE CASCADE is not enforced by SQLite, and a reused id must not inherit them
+        HostelOccupancy.query.filter_by(hostel_id=hostel_id).delete(synchronize_session=False)
+        BookingDailyRollup.query.filter_by(hostel_id=hostel_id).delete(synchronize_session=False)
+        landlord_changed(landlord.id)
         db.session.commit()
+        hostel_deleted(hostel_id)
         return True
 
     @staticmethod
@@ -192,7 +304,7 @@ class HostelService:
             .paginate(page=page, per_page=per_page, error_out=False)
 
         return {
-            'hostels': [hostel.to_dict() for hostel in hostels.items],
+            'hostels': [hostel.to_dict() for hostel in Hostel.load_occupancy(hostels.items)],
             'total': hostels.total,
             'pages': hostels.pages,
             'current_page': hostels.page
@@ -200,19 +312,17 @@ class HostelService:
 
     @staticmethod
     def search_hostels(query, page=1, per_page=20):
-        search_term = f"%{query}%"
-        # Also updated basic search to include university features
-        hostels = Hostel.query.filter(
-            or_(
-                Hostel.name.ilike(search_term),
-                Hostel.location.ilike(search_term),
-                Hostel.description.ilike(search_term),
-                func.cast(Hostel.features['university'], db.String).ilike(search_term)
-            )
-        ).paginate(page=page, per_page=per_page, error_out=False)
+        # Matches name, location, description and university features, best match first
+        hostels = Hostel.query
+        text_filter, relevance = text_search(query)
+        if text_filter is not None:
+            hostels = hostels.filter(text_filter)
+        if relevance is not None:
+            hostels = hostels.order_by(relevance)
+        hostels = hostels.order_by(Hostel.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
 
         return {
-            'hostels': [hostel.to_dict() for hostel in hostels.items],
+            'hostels': [hostel.to_dict() for hostel in Hostel.load_occupancy(hostels.items)],
             'total': hostels.total,
             'pages': hostels.pages,
             'current_page': hostels.page
@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from sqlalchemy import Integer, JSON, String, bindparam, cast, func, select
+from ..extensions import db
+from ..models.hostel import Hostel
+
+# How often a worker checks whether other workers changed the hostels table
+REFRESH_INTERVAL_SECONDS = 5
+
+_indexes = []
+_version = {'number': 0, 'signature': None, 'checked_at': 0.0}
+_rating_version = {'number': 0, 'signature': None, 'checked_at': 0.0}
+_version_lock = threading.Lock()
+
+
+def table_signature():
+    """Cheap fingerprint of the hostels table, used to detect writes made by other workers"""
+    count, last_update = db.session.query(func.count(Hostel.id), func.max(Hostel.updated_at)).one()
+    return (count, last_update)
+
+
+def rating_signature():
+    """Fingerprint of the rating aggregates, which review writes change without touching updated_at"""
+    review_count, rating_sum = db.session.query(func.sum(Hostel.review_count), func.sum(Hostel.rating_sum)).one()
+    return (review_count, rating_sum)
+
+
+class HostelLocalIndex:
+    """Base for per-process read models over the hostels table.
+
+    Subclasses list the Hostel columns they need and turn them into rows; the base class loads
+    them, patches them on local writes and reloads when another worker changed the table.
+    """
+    columns = ()
+
+    def __init__(self):
+        self._rows = {}  # hostel_id -> subclass row
+        self._loaded = False
+        self._dirty = True
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        _indexes.append(self)
+
+    def make_row(self, values):
+        """Turn a {column: value} dict into the stored row, or None to leave the hostel out"""
+        raise NotImplementedError
+
+    def build(self, rows):
+        """Rebuild the derived structures from {hostel_id: row} - no database access"""
+        raise NotImplementedError
+
+    def patch(self, hostel_id, old_row, new_row):
+        """Apply one changed row to built structures in place; return False to have them rebuilt instead"""
+        return False
+
+    def _apply(self, hostel_id, row, signature):
+        old_row = self._rows.pop(hostel_id, None)
+        if row is not None:
+            self._rows[hostel_id] = row
+        if not self._dirty and not self.patch(hostel_id, old_row, row):
+            self._dirty = True
+        self._signature = signature
+
+    def load(self):
+        """Reload every hostel from the database"""
+        results = db.session.query(Hostel.id, *[getattr(Hostel, column) for column in self.columns]).all()
+        signature = table_signature()
+
+        with self._lock:
+            self._rows = {}
+            for result in results:
+                row = self.make_row(dict(zip(self.columns, result[1:])))
+                if row is not None:
+                    self._rows[result[0]] = row
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self._loaded = True
+            self._dirty = True
+
+    def ensure_fresh(self):
+        """Reload if another worker changed the table, and rebuild after local writes"""
+        now = time.monotonic()
+        if not self._loaded or now - self._checked_at >= REFRESH_INTERVAL_SECONDS:
+            if not self._loaded or table_signature() != self._signature:
+                self.load()
+            self._checked_at = now
+
+        with self._lock:
+            if self._dirty:
+                self.build(self._rows)
+                self._dirty = False
+
+    def upsert(self, hostel, signature):
+        """Patch one hostel in place; an index that was never loaded reads everything on first use"""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._apply(hostel.id, self.make_row({column: getattr(hostel, column) for column in self.columns}), signature)
+
+    def remove(self, hostel_id, signature):
+        with self._lock:
+            if not self._loaded:
+                return
+            self._apply(hostel_id, None, signature)
+
+
+def _current(version, signature_of):
+    now = time.monotonic()
+    if now - version['checked_at'] >= REFRESH_INTERVAL_SECONDS:
+        signature = signature_of()
+        with _version_lock:
+            if signature != version['signature']:
+                version['number'] += 1
+                version['signature'] = signature
+            version['checked_at'] = now
+    return version['number']
+
+
+def hostels_version():
+    """Number that moves whenever the hostels table changes: at once for this worker's writes,
+    within REFRESH_INTERVAL_SECONDS for other workers'. Use it to tag derived results."""
+    return _current(_version, table_signature)
+
+
+def ratings_version():
+    """Like hostels_version, for the rating aggregates alone; only results ordered by rating need it"""
+    return _current(_rating_version, rating_signature)
+
+
+def _bump_version(signature, version=_version):
+    with _version_lock:
+        version['number'] += 1
+        version['signature'] = signature
+        return version['number']
+
+
+def ratings_changed():
+    """Move ratings_version after this worker committed a rating change; returns the new number"""
+    return _bump_version(rating_signature(), _rating_version)
+
+
+def hostel_saved(hostel):
+    """Patch every per-process index after a hostel was created or updated (call after commit)"""
+    signature = table_signature()
+    _bump_version(signature)
+    for index in _indexes:
+        index.upsert(hostel, signature)
+
+
+def hostel_deleted(hostel_id):
+    """Drop a hostel from every per-process index (call after commit)"""
+    signature = table_signature()
+    _bump_version(signature)
+    for index in _indexes:
+        index.remove(hostel_id, signature)
+
+
+def reset_local_indexes():
+    """Forget every per-process index so each reloads on next use (tests, or after restoring the database)"""
+    for index in _indexes:
+        with index._lock:
+            index._rows = {}
+            index._loaded = False
+            index._dirty = True
+    with _version_lock:
+        for version in (_version, _rating_version):
+            version['number'] += 1
+            version['signature'] = None
+            version['checked_at'] = 0.0
+
+
+def ranked_hostel_ids(ids):
+    """(filter, ordering) restricting a Hostel query to ids and ordering it by their position in ids.
+
+    The ids travel as one JSON parameter expanded by the database (json_each / json_array_elements_text),
+    so an index hit of any size costs one bind variable rather than one per id in an IN list and a CASE.
+    """
+    ids = bindparam(None, json.dumps([int(hostel_id) for hostel_id in ids]), type_=String)
+    if db.session.get_bind().dialect.name == 'postgresql':
+        elements = func.json_array_elements_text(cast(ids, JSON)).table_valued('value', with_ordinality='position')
+        ranked = select(cast(elements.c.value, Integer).label('id'), elements.c.position).subquery()
+    else:
+        elements = func.json_each(ids).table_valued('key', 'value')
+        ranked = select(elements.c.value.label('id'), elements.c.key.label('position')).subquery()
+    return Hostel.id == ranked.c.id, ranked.c.position.asc()
@@ -0,0 +1,132 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from .local_index import HostelLocalIndex
+from ..models.amenity import amenity_mask
+from ..utils.geo_utils import EARTH_RADIUS_KM
+
+# Below this many filter matches it is cheaper to measure every match than to walk the tree
+BRUTE_FORCE_LIMIT = 2048
+
+
+def _unit_vectors(lats, lngs):
+    """Project lat/lng onto the unit sphere, where chord length grows with great-circle distance"""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lng = np.radians(np.asarray(lngs, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+
+class NearestHostelIndex(HostelLocalIndex):
+    """Per-process KD-tree over hostel coordinates with filter columns for nearest-K queries"""
+    columns = ('latitude', 'longitude', 'price', 'room_type', 'amenity_mask')
+
+    def __init__(self):
+        super().__init__()
+        self._tree = None
+        self._ids = np.empty(0, dtype=np.int64)
+        self._points = np.empty((0, 3))
+        self._prices = np.empty(0)
+        self._room_types = np.empty(0, dtype=np.int32)
+        self._room_type_codes = {}
+        self._amenity_masks = np.empty(0, dtype=np.int64)
+
+    def make_row(self, values):
+        """(lat, lng, price, room_type, amenity mask), leaving out hostels without coordinates"""
+        if values['latitude'] is None or values['longitude'] is None:
+            return None
+        return (values['latitude'], values['longitude'], values['price'] or 0.0, values['room_type'],
+                values['amenity_mask'] or 0)
+
+    def build(self, rows):
+        """Rebuild the tree and filter columns from the in-memory rows"""
+        ids = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+        rows = list(rows.values())
+
+        points = _unit_vectors([row[0] for row in rows], [row[1] for row in rows]) if rows else np.empty((0, 3))
+        self._ids = ids
+        self._points = points
+        self._prices = np.array([row[2] for row in rows], dtype=np.float64)
+        room_type_codes = {}
+        self._room_types = np.array(
+            [room_type_codes.setdefault(row[3], len(room_type_codes)) for row in rows], dtype=np.int32
+        )
+        self._room_type_codes = room_type_codes
+        self._amenity_masks = np.array([row[4] for row in rows], dtype=np.int64)
+        self._tree = cKDTree(points) if rows else None
+
+    def _filter_mask(self, filters, required_amenities=None):
+        """Boolean mask of hostels passing the price/room_type/amenity filters, or None if unfiltered.
+
+        required_amenities is the resolved amenity bitmask, None when an unknown amenity was requested.
+        """
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        if filters.get('min_price'):
+            mask = combine(mask, self._prices >= float(filters['min_price']))
+        if filters.get('max_price'):
+            mask = combine(mask, self._prices <= float(filters['max_price']))
+        if filters.get('room_type'):
+            room_types = filters['room_type'] if isinstance(filters['room_type'], list) else [filters['room_type']]
+            codes = [self._room_type_codes[room_type] for room_type in room_types if room_type in self._room_type_codes]
+            mask = combine(mask, np.isin(self._room_types, codes))
+        if filters.get('amenities'):
+            if required_amenities is None:
+                mask = combine(mask, np.zeros(len(self._ids), dtype=bool))
+            else:
+                mask = combine(mask, (self._amenity_masks & required_amenities) == required_amenities)
+        return mask
+
+    def nearest(self, lat, lng, k, filters=None):
+        """The k nearest hostels passing filters, as [(hostel_id, distance_km)] nearest first"""
+        filters = filters or {}
+        required_amenities = None
+        if filters.get('amenities'):
+            amenities = filters['amenities'] if isinstance(filters['amenities'], list) else [filters['amenities']]
+            required_amenities = amenity_mask(amenities, strict=True)
+
+        self.ensure_fresh()
+        with self._lock:
+            tree, ids, points = self._tree, self._ids, self._points
+            mask = self._filter_mask(filters, required_amenities)
+
+        total = len(ids)
+        if tree is None or k <= 0:
+            return []
+        point = _unit_vectors([lat], [lng])[0]
+
+        if mask is None:
+            chords, positions = tree.query(point, k=min(k, total))
+            chords, positions = np.atleast_1d(chords), np.atleast_1d(positions)
+        else:
+            matches = int(mask.sum())
+            if matches == 0:
+                return []
+            if matches <= BRUTE_FORCE_LIMIT:
+                # Few matches: measure them all directly
+                positions = np.flatnonzero(mask)
+                chords = np.linalg.norm(points[positions] - point, axis=1)
+                order = np.argsort(chords)[:k]
+                chords, positions = chords[order], positions[order]
+            else:
+                # Over-fetch from the tree in proportion to the filter selectivity, widening until k pass
+                fetch = min(total, k * -(-total // matches) * 2)
+                while True:
+                    chords, positions = tree.query(point, k=fetch)
+                    chords, positions = np.atleast_1d(chords), np.atleast_1d(positions)
+                    keep = mask[positions]
+                    if keep.sum() >= k or fetch >= total:
+                        break
+                    fetch = min(total, fetch * 4)
+                chords, positions = chords[keep][:k], positions[keep][:k]
+
+        return list(zip(ids[positions].tolist(), _chord_to_km(chords).tolist()))
+
+
+nearest_hostel_index = NearestHostelIndex()
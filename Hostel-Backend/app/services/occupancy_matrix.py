@@ -0,0 +1,114 @@
+import numpy as np
+from datetime import timedelta
+from ..extensions import db
+from ..models.booking import Booking
+from ..models.hostel import Hostel, ACTIVE_BOOKING_STATUSES
+
+# Statuses whose nights held (or will hold) beds: current and upcoming stays plus finished ones
+OCCUPYING_STATUSES = ACTIVE_BOOKING_STATUSES + ('completed',)
+# Longest window one matrix may span; hostels x days int32 cells, ~3.6 MB for 500 hostels
+MAX_WINDOW_DAYS = 5 * 366
+
+
+def _percent(booked, available):
+    return round(float(booked) / float(available) * 100, 1) if available else 0
+
+
+class OccupancyMatrix:
+    """Guests staying each night of [start, end), one row per hostel and one column per night.
+
+    Built from plain booking arrays with difference arrays and a cumulative sum, so the cost is
+    one pass over the bookings plus one over the hostels x days cells.
+    """
+
+    def __init__(self, hostel_ids, capacities, start, end, hostel_idx, check_in_day, check_out_day, guests):
+        """hostel_idx indexes hostel_ids; check-in/check-out days count from start and may fall outside the window"""
+        days = (end - start).days
+        if days < 1:
+            raise ValueError("end must be after start")
+        if days > MAX_WINDOW_DAYS:
+            raise ValueError(f"The window may span at most {MAX_WINDOW_DAYS} days")
+
+        self.hostel_ids = np.asarray(hostel_ids, dtype=np.int64)
+        self.capacities = np.asarray(capacities, dtype=np.int64)
+        self.start = start
+        self.days = days
+
+        check_in_day = np.clip(check_in_day, 0, days)
+        check_out_day = np.clip(check_out_day, 0, days)
+        inside = check_in_day < check_out_day
+        hostel_idx, guests = hostel_idx[inside], guests[inside]
+
+        # +guests on the first night and -guests on the check-out day, one spare column for check-outs at `end`;
+        # the running sum along each row is then the number of guests staying that night
+        width = days + 1
+        cells = np.concatenate((hostel_idx * width + check_in_day[inside], hostel_idx * width + check_out_day[inside]))
+        deltas = np.concatenate((guests, -guests))
+        diff = np.bincount(cells, weights=deltas, minlength=len(self.hostel_ids) * width)
+        self.guests = np.cumsum(diff.reshape(len(self.hostel_ids), width)[:, :-1], axis=1).astype(np.int32)
+
+    @classmethod
+    def load(cls, landlord_id, hostel_ids, capacities, start, end):
+        """Matrix for a landlord's hostels (ids ascending) from their bookings overlapping [start, end)"""
+        rows = db.session.query(Booking.hostel_id, Booking.check_in, Booking.check_out, Booking.guests)\
+            .join(Hostel, Hostel.id == Booking.hostel_id)\
+            .filter(
+                Hostel.landlord_id == landlord_id,
+                Booking.status.in_(OCCUPYING_STATUSES),
+                Booking.check_in < end,
+                Booking.check_out > start
+            ).all()
+
+        origin = start.toordinal()
+        hostel_ids = np.asarray(hostel_ids, dtype=np.int64)
+        booked = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        return cls(
+            hostel_ids, capacities, start, end,
+            np.searchsorted(hostel_ids, booked),
+            np.fromiter((row[1].toordinal() - origin for row in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((row[2].toordinal() - origin for row in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((row[3] or 0 for row in rows), dtype=np.int64, count=len(rows))
+        )
+
+    def day(self, column):
+        return self.start + timedelta(days=int(column))
+
+    def _beds_taken(self):
+        """Guests per hostel-night, capped at capacity so overbooked legacy data cannot exceed 100%"""
+        return np.minimum(self.guests, self.capacities[:, None])
+
+    def occupancy_rate(self):
+        """Share of all bed-nights in the window that were booked, in percent"""
+        return _percent(self._beds_taken().sum(), self.capacities.sum() * self.days)
+
+    def hostel_rates(self):
+        """Booked bed-nights and occupancy percent of each hostel over the window"""
+        bed_nights = self._beds_taken().sum(axis=1)
+        available = self.capacities * self.days
+        rates = np.divide(bed_nights * 100.0, available, out=np.zeros(len(available)), where=available > 0)
+        return bed_nights, np.round(rates, 1)
+
+    def daily_rates(self):
+        """Guests and occupancy percent across all hostels for each night"""
+        guests = self._beds_taken().sum(axis=0)
+        capacity = self.capacities.sum()
+        rates = np.round(guests * 100.0 / capacity, 1) if capacity else np.zeros(self.days)
+        return guests, rates
+
+    def peak_days(self, count=5):
+        """Column numbers of the `count` fullest nights, fullest first and earlier nights first on ties"""
+        guests, _ = self.daily_rates()
+        return np.argsort(-guests, kind='stable')[:count]
+
+    def vacancy_gaps(self, min_nights=1):
+        """(hostel row, first empty night, night occupancy resumes) for every run of completely empty nights"""
+        empty = np.zeros((len(self.hostel_ids), self.days + 2), dtype=np.int8)
+        empty[:, 1:-1] = self.guests == 0
+        # Hostels without beds are never vacant
+        empty[self.capacities <= 0] = 0
+        # Runs start where a row steps 0 -> 1 and end where it steps 1 -> 0; argwhere is row-major, so they pair up
+        steps = np.diff(empty, axis=1)
+        starts = np.argwhere(steps == 1)
+        ends = np.argwhere(steps == -1)[:, 1]
+        keep = ends - starts[:, 1] >= min_nights
+        return starts[keep, 0], starts[keep, 1], ends[keep]
@@ -0,0 +1,179 @@
+from ..extensions import db
+from ..models.booking import Booking
+from ..models.hostel import Hostel, ACTIVE_BOOKING_STATUSES
+from ..models.occupancy import HostelOccupancy
+from datetime import timedelta
+from sqlalchemy import and_, or_, exists, event, func
+from sqlalchemy.orm import Session
+
+# Bumped whenever a transaction that changed the ledger commits, so cached availability can be dropped
+_ledger = {'version': 0}
+
+
+def ledger_version():
+    """Counter of committed ledger changes made by this worker"""
+    return _ledger['version']
+
+
+@event.listens_for(Session, 'after_commit')
+def _ledger_committed(session):
+    # After the commit, not at adjust(): a reader must never pair the new version with old rows
+    if session.info.pop('ledger_changed', False):
+        _ledger['version'] += 1
+
+
+@event.listens_for(Session, 'after_rollback')
+def _ledger_rolled_back(session):
+    session.info.pop('ledger_changed', None)
+
+
+class OccupancyService:
+    @staticmethod
+    def booking_nights(check_in, check_out):
+        """Every night a booking holds a bed - check-out day excluded"""
+        return [check_in + timedelta(days=offset) for offset in range((check_out - check_in).days)]
+
+    @staticmethod
+    def _insert_for_dialect():
+        """Dialect-specific INSERT that supports ON CONFLICT, or None if unavailable"""
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+            return insert
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+            return insert
+        return None
+
+    @staticmethod
+    def adjust(hostel_id, check_in, check_out, guests_delta):
+        """Add guests_delta to every night of [check_in, check_out), in the caller's transaction"""
+        nights = OccupancyService.booking_nights(check_in, check_out)
+        if not nights or not guests_delta:
+            return
+
+        db.session.info['ledger_changed'] = True
+        insert = OccupancyService._insert_for_dialect()
+        if insert is not None:
+            # Atomic per-night increment, safe against concurrent writers
+            stmt = insert(HostelOccupancy).values([
+                {'hostel_id': hostel_id, 'day': night, 'guests_booked': guests_delta} for night in nights
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['hostel_id', 'day'],
+                set_={'guests_booked': HostelOccupancy.guests_booked + stmt.excluded.guests_booked}
+            )
+            db.session.execute(stmt)
+        else:
+            existing = {
+                row.day: row for row in HostelOccupancy.query.filter(
+                    HostelOccupancy.hostel_id == hostel_id,
+                    HostelOccupancy.day >= check_in,
+                    HostelOccupancy.day < check_out
+                ).with_for_update().all()
+            }
+            for night in nights:
+                if night in existing:
+                    existing[night].guests_booked += guests_delta
+                else:
+                    db.session.add(HostelOccupancy(hostel_id=hostel_id, day=night, guests_booked=guests_delta))
+            db.session.flush()
+
+        if guests_delta < 0:
+            # Nights nobody holds any more carry no information
+            HostelOccupancy.query.filter(
+                HostelOccupancy.hostel_id == hostel_id,
+                HostelOccupancy.day >= check_in,
+                HostelOccupancy.day < check_out,
+                HostelOccupancy.guests_booked <= 0
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def apply_booking(booking, sign=1):
+        """Book (sign=1) or release (sign=-1) a booking's beds in the ledger"""
+        OccupancyService.adjust(booking.hostel_id, booking.check_in, booking.check_out, sign * booking.guests)
+
+    @staticmethod
+    def apply_status_change(booking, old_status, new_status):
+        """Keep the ledger in step when a booking moves in or out of a bed-holding status"""
+        was_active = old_status in ACTIVE_BOOKING_STATUSES
+        is_active = new_status in ACTIVE_BOOKING_STATUSES
+        if was_active != is_active:
+            OccupancyService.apply_booking(booking, 1 if is_active else -1)
+
+    @staticmethod
+    def peak_guests(hostel_id, check_in, check_out):
+        """Highest number of guests booked on any night of [check_in, check_out)"""
+        return db.session.query(func.max(HostelOccupancy.guests_booked)).filter(
+            HostelOccupancy.hostel_id == hostel_id,
+            HostelOccupancy.day >= check_in,
+            HostelOccupancy.day < check_out
+        ).scalar() or 0
+
+    @staticmethod
+    def peak_guests_many(stays):
+        """peak_guests for many (hostel_id, check_in, check_out) stays with a single ledger query"""
+        # One date window per hostel covering all of its stays
+        windows = {}
+        for hostel_id, check_in, check_out in stays:
+            if check_in >= check_out:
+                continue
+            start, end = windows.get(hostel_id, (check_in, check_out))
+            windows[hostel_id] = (min(start, check_in), max(end, check_out))
+
+        nightly = {}
+        if windows:
+            rows = db.session.query(
+                HostelOccupancy.hostel_id, HostelOccupancy.day, HostelOccupancy.guests_booked
+            ).filter(or_(*[
+                and_(HostelOccupancy.hostel_id == hostel_id, HostelOccupancy.day >= start, HostelOccupancy.day < end)
+                for hostel_id, (start, end) in windows.items()
+            ])).all()
+            for hostel_id, day, guests_booked in rows:
+                nightly.setdefault(hostel_id, {})[day] = guests_booked
+
+        peaks = []
+        for hostel_id, check_in, check_out in stays:
+            booked = nightly.get(hostel_id, {})
+            peaks.append(max(
+                (guests for day, guests in booked.items() if check_in <= day < check_out),
+                default=0
+            ))
+        return peaks
+
+    @staticmethod
+    def fully_booked_clause(check_in, check_out):
+        """SQL predicate: the hostel has at least one fully booked night in [check_in, check_out)"""
+        return exists().where(and_(
+            HostelOccupancy.hostel_id == Hostel.id,
+            HostelOccupancy.day >= check_in,
+            HostelOccupancy.day < check_out,
+            HostelOccupancy.guests_booked >= Hostel.capacity
+        ))
+
+    @staticmethod
+    def rebuild_ledger():
+        """Recompute the whole ledger from the bookings table"""
+        totals = {}
+        bookings = db.session.query(
+            Booking.hostel_id, Booking.check_in, Booking.check_out, Booking.guests
+        ).filter(Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+
+        for hostel_id, check_in, check_out, guests in bookings.yield_per(1000):
+            for night in OccupancyService.booking_nights(check_in, check_out):
+                totals[(hostel_id, night)] = totals.get((hostel_id, night), 0) + guests
+
+        try:
+            db.session.info['ledger_changed'] = True
+            HostelOccupancy.query.delete(synchronize_session=False)
+            if totals:
+                db.session.execute(HostelOccupancy.__table__.insert(), [
+                    {'hostel_id': hostel_id, 'day': night, 'guests_booked': guests}
+                    for (hostel_id, night), guests in totals.items()
+                ])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+        return len(totals)
@@ -3,6 +3,9 @@ import requests
 from datetime import datetime
 from ..extensions import db
 from ..models.booking import Booking
+from .occupancy_service import OccupancyService
+from .rollup_service import BookingRollupService
+from .analytics_cache import landlord_changed
 
 class PaymentService:
     # M-Pesa Daraja API configuration
@@ -221,9 +224,11 @@ class PaymentService:
 
         # In a real implementation, you'd initiate the refund through M-Pesa
         # For now, we'll just mark the booking as refunded
-        booking.status = 'refunded'
-
         try:
+            OccupancyService.apply_status_change(booking, booking.status, 'refunded')
+            BookingRollupService.apply_status_change(booking, booking.status, 'refunded')
+            landlord_changed(booking.hostel.landlord_id)
+            booking.status = 'refunded'
             db.session.commit()
 
             return {
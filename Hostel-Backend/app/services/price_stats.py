@@ -0,0 +1,165 @@
+import math
+import numpy as np
+from .local_index import HostelLocalIndex
+
+# Log-spaced price buckets: each is 5% wider than the last, so percentiles are within ~5% of exact
+BUCKET_RATIO = 1.05
+LOWEST_PRICE = 100.0
+BUCKET_COUNT = 240  # up to ~12 million
+BUCKET_EDGES = LOWEST_PRICE * BUCKET_RATIO ** np.arange(BUCKET_COUNT + 1)
+
+
+def _bucket_of(prices):
+    """Bucket index of each price, clamping out-of-range prices into the end buckets"""
+    prices = np.maximum(np.asarray(prices, dtype=np.float64), LOWEST_PRICE)
+    return np.clip((np.log(prices / LOWEST_PRICE) / math.log(BUCKET_RATIO)).astype(np.int64), 0, BUCKET_COUNT - 1)
+
+
+class PriceHistogram:
+    """Fixed-size, mergeable price sketch: bucket counts plus exact count, sum, min and max"""
+    __slots__ = ('counts', 'total', 'sum', 'min', 'max')
+
+    def __init__(self, counts=None, total=0, price_sum=0.0, low=None, high=None):
+        self.counts = counts if counts is not None else np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.total = total
+        self.sum = price_sum
+        self.min = low
+        self.max = high
+
+    def add(self, price, sign=1):
+        self.counts[_bucket_of(price)] += sign
+        self.total += sign
+        self.sum += sign * price
+        if sign > 0:
+            self.min = price if self.min is None else min(self.min, price)
+            self.max = price if self.max is None else max(self.max, price)
+
+    def merge(self, other):
+        lows = [value for value in (self.min, other.min) if value is not None]
+        highs = [value for value in (self.max, other.max) if value is not None]
+        return PriceHistogram(self.counts + other.counts, self.total + other.total, self.sum + other.sum,
+                              min(lows, default=None), max(highs, default=None))
+
+    def percentile(self, p):
+        """Approximate p-th percentile (0-100), interpolating linearly inside the bucket"""
+        if not self.total:
+            return 0.0
+        rank = p / 100 * (self.total - 1)
+        cumulative = np.cumsum(self.counts)
+        bucket = int(np.searchsorted(cumulative, rank, side='right'))
+        before = cumulative[bucket - 1] if bucket else 0
+        low = max(BUCKET_EDGES[bucket], self.min)
+        high = min(BUCKET_EDGES[bucket + 1], self.max)
+        if high <= low:
+            return float(low)
+        return float(low + (high - low) * (rank - before + 0.5) / self.counts[bucket])
+
+    def histogram(self, bins):
+        """Counts in `bins` equal-width price bins between min and max, for the price slider"""
+        if not self.total:
+            return []
+        width = (self.max - self.min) / bins or 1.0
+        merged = np.zeros(bins, dtype=np.int64)
+        occupied = np.flatnonzero(self.counts)
+        midpoints = np.clip((BUCKET_EDGES[occupied] + BUCKET_EDGES[occupied + 1]) / 2, self.min, self.max)
+        np.add.at(merged, np.minimum(((midpoints - self.min) / width).astype(np.int64), bins - 1), self.counts[occupied])
+        return [
+            {'min_price': round(self.min + i * width, 2), 'max_price': round(self.min + (i + 1) * width, 2),
+             'count': int(count)}
+            for i, count in enumerate(merged)
+        ]
+
+
+def _scope_key(kind, value):
+    return (kind, value.strip().lower() if isinstance(value, str) else value)
+
+
+class PriceStatistics(HostelLocalIndex):
+    """Per-process price sketches for all hostels, each room type and each location, kept in step on writes"""
+    columns = ('price', 'room_type', 'location')
+
+    def __init__(self):
+        super().__init__()
+        self._histograms = {}  # ('all', None) | ('room_type', value) | ('location', value) -> PriceHistogram
+
+    def make_row(self, values):
+        if values['price'] is None:
+            return None
+        return (float(values['price']), values['room_type'], values['location'])
+
+    @staticmethod
+    def _scopes(row):
+        return (('all', None), _scope_key('room_type', row[1]), _scope_key('location', row[2]))
+
+    def build(self, rows):
+        """Rebuild every sketch from the in-memory rows in a few vectorised passes"""
+        rows = list(rows.values())
+        histograms = {}
+        if rows:
+            prices = np.array([row[0] for row in rows], dtype=np.float64)
+            buckets = _bucket_of(prices)
+            for position in range(3):
+                keys = [self._scopes(row)[position] for row in rows]
+                groups = {}
+                codes = np.array([groups.setdefault(key, len(groups)) for key in keys], dtype=np.int64)
+                counts = np.bincount(codes * BUCKET_COUNT + buckets, minlength=len(groups) * BUCKET_COUNT)
+                sums = np.bincount(codes, weights=prices, minlength=len(groups))
+                lows = np.full(len(groups), np.inf)
+                highs = np.full(len(groups), -np.inf)
+                np.minimum.at(lows, codes, prices)
+                np.maximum.at(highs, codes, prices)
+                counts = counts.reshape(len(groups), BUCKET_COUNT)
+                for key, code in groups.items():
+                    histograms[key] = PriceHistogram(counts[code].copy(), int(counts[code].sum()), float(sums[code]),
+                                                     float(lows[code]), float(highs[code]))
+        self._histograms = histograms
+
+    def patch(self, hostel_id, old_row, new_row):
+        """Move one hostel's price between sketches; removing a group's min or max needs a rebuild"""
+        if old_row is not None:
+            for key in self._scopes(old_row):
+                histogram = self._histograms[key]
+                if old_row[0] in (histogram.min, histogram.max):
+                    return False
+        if old_row is not None:
+            for key in self._scopes(old_row):
+                histogram = self._histograms[key]
+                histogram.add(old_row[0], -1)
+                if not histogram.total:
+                    del self._histograms[key]
+        if new_row is not None:
+            for key in self._scopes(new_row):
+                self._histograms.setdefault(key, PriceHistogram()).add(new_row[0])
+        return True
+
+    def summary(self, room_type=None, location=None, percentiles=(25, 50, 75), bins=20):
+        """Count, min, max, average, the requested percentiles and a price histogram for one scope.
+
+        room_type may be a list, in which case those room types' sketches are merged.
+        """
+        if room_type and location:
+            raise ValueError("Price statistics are kept per room_type or per location, not both")
+        if room_type:
+            keys = [_scope_key('room_type', value) for value in (room_type if isinstance(room_type, list) else [room_type])]
+        elif location:
+            keys = [_scope_key('location', location)]
+        else:
+            keys = [('all', None)]
+
+        self.ensure_fresh()
+        with self._lock:
+            histogram = PriceHistogram()
+            for key in keys:
+                if key in self._histograms:
+                    histogram = histogram.merge(self._histograms[key])
+            return {
+                'count': histogram.total,
+                'min_price': float(histogram.min or 0),
+                'max_price': float(histogram.max or 0),
+                'avg_price': histogram.sum / histogram.total if histogram.total else 0.0,
+                'percentiles': {f'{p:g}': histogram.percentile(p) for p in percentiles},
+                'histogram': histogram.histogram(bins)
+            }
+
+
+price_statistics = PriceStatistics()
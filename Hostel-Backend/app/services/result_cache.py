@@ -0,0 +1,36 @@
+from ..models.hostel import Hostel
+from ..utils.cache import LRUCache, canonical_params
+from .local_index import hostels_version, ratings_version
+from .occupancy_service import ledger_version
+
+RESULT_CACHE_ENTRIES = 2048
+# Also bounds how long a booking made on another worker can go unnoticed by date-filtered searches
+RESULT_CACHE_TTL_SECONDS = 60
+# Query params compared by value, so '6000' and '6000.0' share an entry
+NUMERIC_PARAMS = frozenset({'min_price', 'max_price', 'min_capacity', 'lat', 'lng', 'radius'})
+
+# Hostel ids (plus totals and other per-query data) of listing pages, keyed by canonical filters
+result_cache = LRUCache(RESULT_CACHE_ENTRIES, RESULT_CACHE_TTL_SECONDS)
+
+
+def cached_page(scope, params, page, per_page, compute, dated=False):
+    """compute()'s result for one listing page, shared by every request with the same canonical filters.
+
+    Hostel writes invalidate every entry; booking changes only those for dated (availability) searches,
+    and review changes only those ordered by rating.
+    """
+    key = (scope, canonical_params(params, NUMERIC_PARAMS), page, per_page)
+    version = (
+        hostels_version(),
+        ledger_version() if dated else None,
+        ratings_version() if params.get('sort_by') == 'rating' else None
+    )
+    return result_cache.get(key, version, compute)
+
+
+def hydrate(ids):
+    """Hostels for ids in that order, occupancy loaded in one batch, skipping any deleted meanwhile"""
+    if not ids:
+        return []
+    hostels = {hostel.id: hostel for hostel in Hostel.query.filter(Hostel.id.in_(ids)).all()}
+    return Hostel.load_occupancy([hostels[hostel_id] for hostel_id in ids if hostel_id in hostels])
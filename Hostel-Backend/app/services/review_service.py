@@ -1,8 +1,13 @@
 from ..extensions import db
 from ..models.review import Review
 from ..models.booking import Booking
+from ..models.hostel import Hostel
+from .analytics_cache import landlord_changed
+from .local_index import ratings_changed
+from .hostel_catalog import hostel_catalog
+from ..utils.pagination import keyset_paginate
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, case, select, update
 
 class ReviewService:
     @staticmethod
@@ -41,10 +46,12 @@ class ReviewService:
             )
 
             db.session.add(review)
+            ReviewService._apply_rating_delta(hostel_id, rating, 1)
             db.session.commit()
 
             # Update landlord rating
             ReviewService.update_landlord_rating(hostel_id)
+            ReviewService._ratings_changed(hostel_id)
 
             return review.to_dict()
         except Exception as e:
@@ -60,9 +67,12 @@ class ReviewService:
         ).first_or_404()
 
         try:
+            rating_changed = rating is not None and rating != review.rating
             if rating is not None:
                 if not (1 <= rating <= 5):
                     raise ValueError("Rating must be between 1 and 5")
+                if rating_changed:
+                    ReviewService._apply_rating_delta(review.hostel_id, rating - review.rating, 0)
                 review.rating = rating
 
             if comment is not None:
@@ -73,6 +83,8 @@ class ReviewService:
 
             # Update landlord rating
             ReviewService.update_landlord_rating(review.hostel_id)
+            if rating_changed:
+                ReviewService._ratings_changed(review.hostel_id)
 
             return review.to_dict()
         except Exception as e:
@@ -90,11 +102,13 @@ class ReviewService:
         hostel_id = review.hostel_id
 
         try:
+            ReviewService._apply_rating_delta(hostel_id, -review.rating, -1)
             db.session.delete(review)
             db.session.commit()
 
             # Update landlord rating
             ReviewService.update_landlord_rating(hostel_id)
+            ReviewService._ratings_changed(hostel_id)
 
             return True
         except Exception as e:
@@ -102,17 +116,26 @@ class ReviewService:
             raise e
 
     @staticmethod
-    def get_hostel_reviews(hostel_id, page=1, per_page=20):
-        """Get all reviews for a hostel"""
-        reviews = Review.query.filter_by(hostel_id=hostel_id)\
-            .order_by(Review.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+    def get_hostel_reviews(hostel_id, page=1, per_page=20, cursor=None, include_total=False):
+        """Get all reviews for a hostel (pass cursor, '' for the first page, to seek instead of offset)"""
+        query = Review.query.filter_by(hostel_id=hostel_id)\
+            .order_by(Review.created_at.desc())
 
-        # Calculate average rating
-        avg_rating = db.session.query(func.avg(Review.rating))\
-            .filter(Review.hostel_id == hostel_id)\
+        avg_rating = db.session.query(Hostel.rating_avg)\
+            .filter(Hostel.id == hostel_id)\
             .scalar() or 0.0
 
+        if cursor is not None:
+            reviews = keyset_paginate(
+                query, [(Review.created_at, True), (Review.id, True)], cursor, per_page, include_total
+            )
+            return {
+                **reviews.to_dict('reviews', [review.to_dict() for review in reviews.items]),
+                'average_rating': float(avg_rating)
+            }
+
+        reviews = query.paginate(page=page, per_page=per_page, error_out=False)
+
         return {
             'reviews': [review.to_dict() for review in reviews.items],
             'total': reviews.total,
@@ -144,56 +167,105 @@ class ReviewService:
     @staticmethod
     def update_landlord_rating(hostel_id):
         """Update the average rating for the landlord of a hostel"""
-        from ..models.hostel import Hostel
-        from ..models.landlord import Landlord
-
-        hostel = Hostel.query.get(hostel_id)
+        hostel = db.session.get(Hostel, hostel_id)
         if not hostel or not hostel.landlord:
             return
 
-        # Calculate average rating across all hostels for this landlord
-        landlord_hostels = Hostel.query.filter_by(landlord_id=hostel.landlord.id).all()
-        hostel_ids = [h.id for h in landlord_hostels]
+        # Average across all hostels for this landlord, from the per-hostel aggregates
+        rating_sum, review_count = db.session.query(
+            func.coalesce(func.sum(Hostel.rating_sum), 0),
+            func.coalesce(func.sum(Hostel.review_count), 0)
+        ).filter(Hostel.landlord_id == hostel.landlord.id).one()
 
-        avg_rating = db.session.query(func.avg(Review.rating))\
-            .filter(Review.hostel_id.in_(hostel_ids))\
-            .scalar() or 0.0
-
-        review_count = Review.query.filter(Review.hostel_id.in_(hostel_ids)).count()
+        avg_rating = rating_sum / review_count if review_count else 0.0
 
         try:
             hostel.landlord.rating = float(avg_rating)
             hostel.landlord.review_count = review_count
+            landlord_changed(hostel.landlord.id)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _apply_rating_delta(hostel_id, rating_delta, count_delta):
+        """Adjust a hostel's rating aggregates in place, in the caller's transaction"""
+        new_sum = Hostel.rating_sum + rating_delta
+        new_count = Hostel.review_count + count_delta
+        db.session.execute(
+            update(Hostel)
+            .where(Hostel.id == hostel_id)
+            .values(
+                rating_sum=new_sum,
+                review_count=new_count,
+                rating_avg=case((new_count > 0, new_sum * 1.0 / new_count), else_=None),
+                # A new review is not an edit of the listing itself
+                updated_at=Hostel.updated_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _ratings_changed(hostel_id):
+        """Move the hostel within the catalog's rating order after a committed rating change.
+
+        Only the catalog sorts by rating, so the other per-process indexes are not touched.
+        """
+        rating_avg = db.session.query(Hostel.rating_avg).filter(Hostel.id == hostel_id).scalar()
+        hostel_catalog.rating_changed(hostel_id, rating_avg, ratings_changed())
+
+    @staticmethod
+    def reconcile_hostel_ratings():
+        """Rebuild every hostel's rating aggregates from the reviews table"""
+        review_count = select(func.count(Review.id))\
+            .where(Review.hostel_id == Hostel.id)\
+            .scalar_subquery()
+        rating_sum = select(func.coalesce(func.sum(Review.rating), 0))\
+            .where(Review.hostel_id == Hostel.id)\
+            .scalar_subquery()
+
+        try:
+            db.session.execute(
+                update(Hostel)
+                .values(review_count=review_count, rating_sum=rating_sum, updated_at=Hostel.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                update(Hostel)
+                .values(
+                    rating_avg=case((Hostel.review_count > 0, Hostel.rating_sum * 1.0 / Hostel.review_count), else_=None),
+                    updated_at=Hostel.updated_at
+                )
+                .execution_options(synchronize_session=False)
+            )
             db.session.commit()
         except Exception as e:
             db.session.rollback()
             raise e
 
+        return Hostel.query.count()
+
     @staticmethod
     def get_reviews_stats(hostel_id=None, landlord_id=None):
         """Get review statistics"""
-        query = Review.query
+        # Totals, average and distribution from one pass, counting each rating conditionally
+        query = db.session.query(
+            func.count(Review.id),
+            func.avg(Review.rating),
+            *[func.count(case((Review.rating == rating, 1))) for rating in range(1, 6)]
+        )
 
         if hostel_id:
-            query = query.filter_by(hostel_id=hostel_id)
+            query = query.filter(Review.hostel_id == hostel_id)
         elif landlord_id:
-            # Get all reviews for landlord's hostels
-            from ..models.hostel import Hostel
-            hostels = Hostel.query.filter_by(landlord_id=landlord_id).all()
-            hostel_ids = [h.id for h in hostels]
-            query = query.filter(Review.hostel_id.in_(hostel_ids))
-
-        total_reviews = query.count()
-        avg_rating = db.session.query(func.avg(Review.rating)).scalar() or 0.0
+            # Reviews of the landlord's hostels
+            query = query.filter(Review.hostel_id.in_(select(Hostel.id).where(Hostel.landlord_id == landlord_id)))
 
-        # Rating distribution
-        rating_counts = {}
-        for rating in range(1, 6):
-            count = query.filter_by(rating=rating).count()
-            rating_counts[f'{rating}_star'] = count
+        total_reviews, avg_rating, *rating_counts = query.one()
 
         return {
             'total_reviews': total_reviews,
-            'average_rating': float(avg_rating),
-            'rating_distribution': rating_counts
+            'average_rating': float(avg_rating or 0.0),
+            'rating_distribution': {f'{rating}_star': count for rating, count in zip(range(1, 6), rating_counts)}
         }
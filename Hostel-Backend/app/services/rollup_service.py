@@ -0,0 +1,98 @@
+from ..extensions import db
+from ..models.booking import Booking, REVENUE_STATUSES
+from ..models.booking_rollup import BookingDailyRollup
+from ..models.hostel import Hostel
+from .occupancy_service import OccupancyService
+
+COUNTERS = ('bookings', 'revenue', 'cancellations', 'confirmed', 'completed')
+
+
+class BookingRollupService:
+    @staticmethod
+    def _contribution(total_price, status):
+        """What one booking in the given status adds to the counters of the day it was made"""
+        return {
+            'bookings': 1,
+            'revenue': total_price if status in REVENUE_STATUSES else 0.0,
+            'cancellations': int(status == 'cancelled'),
+            'confirmed': int(status == 'confirmed'),
+            'completed': int(status == 'completed')
+        }
+
+    @staticmethod
+    def adjust(hostel_id, landlord_id, day, deltas):
+        """Add deltas to one hostel-day's counters, in the caller's transaction"""
+        if not any(deltas.values()):
+            return
+
+        insert = OccupancyService._insert_for_dialect()
+        if insert is not None:
+            # Atomic increment, safe against concurrent writers
+            stmt = insert(BookingDailyRollup).values(hostel_id=hostel_id, day=day, landlord_id=landlord_id, **deltas)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['hostel_id', 'day'],
+                set_={name: getattr(BookingDailyRollup, name) + stmt.excluded[name] for name in deltas}
+            )
+            db.session.execute(stmt)
+        else:
+            row = BookingDailyRollup.query.filter_by(hostel_id=hostel_id, day=day).with_for_update().first()
+            if row is None:
+                row = BookingDailyRollup(hostel_id=hostel_id, day=day, landlord_id=landlord_id,
+                                         **{name: 0 for name in COUNTERS})
+                db.session.add(row)
+            for name, delta in deltas.items():
+                setattr(row, name, getattr(row, name) + delta)
+            db.session.flush()
+
+    @staticmethod
+    def _day(booking):
+        if booking.created_at is None:
+            # created_at (and the hostel relationship) are filled in on flush
+            db.session.flush()
+        return booking.created_at.date()
+
+    @staticmethod
+    def apply_booking(booking, sign=1):
+        """Count (sign=1) or uncount (sign=-1) a new booking on the day it was made"""
+        day = BookingRollupService._day(booking)
+        deltas = BookingRollupService._contribution(booking.total_price, booking.status)
+        BookingRollupService.adjust(booking.hostel_id, booking.hostel.landlord_id, day,
+                                    {name: sign * value for name, value in deltas.items()})
+
+    @staticmethod
+    def apply_status_change(booking, old_status, new_status):
+        """Move a booking between the revenue, cancellation and status counters of its day"""
+        if old_status == new_status:
+            return
+        day = BookingRollupService._day(booking)
+        old = BookingRollupService._contribution(booking.total_price, old_status)
+        new = BookingRollupService._contribution(booking.total_price, new_status)
+        BookingRollupService.adjust(booking.hostel_id, booking.hostel.landlord_id, day,
+                                    {name: new[name] - old[name] for name in COUNTERS})
+
+    @staticmethod
+    def rebuild_rollup():
+        """Recompute the whole rollup from the bookings table"""
+        totals = {}
+        bookings = db.session.query(
+            Booking.hostel_id, Hostel.landlord_id, Booking.created_at, Booking.total_price, Booking.status
+        ).join(Hostel, Hostel.id == Booking.hostel_id)
+
+        for hostel_id, landlord_id, created_at, total_price, status in bookings.yield_per(1000):
+            key = (hostel_id, created_at.date())
+            row = totals.setdefault(key, dict({name: 0 for name in COUNTERS}, landlord_id=landlord_id))
+            for name, value in BookingRollupService._contribution(total_price, status).items():
+                row[name] += value
+
+        try:
+            BookingDailyRollup.query.delete(synchronize_session=False)
+            if totals:
+                db.session.execute(BookingDailyRollup.__table__.insert(), [
+                    dict(row, hostel_id=hostel_id, day=day) for (hostel_id, day), row in totals.items()
+                ])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+        return len(totals)
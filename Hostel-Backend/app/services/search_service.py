@@ -1,49 +1,164 @@
 from ..extensions import db
 from ..models.hostel import Hostel
-from ..models.amenity import Amenity
-from sqlalchemy import and_, or_, func, text
-from sqlalchemy.sql import label
+from ..models.amenity import Amenity, amenity_ids_in
+from .local_index import hostels_version, ranked_hostel_ids
+from .nearest_index import nearest_hostel_index
+from .spatial_index import hostel_spatial_index
+from .price_stats import price_statistics
+from .suggestion_index import suggestion_index
+from .text_index import text_search
+from .trigram_index import fuzzy_search
+from .occupancy_service import OccupancyService
+from .hostel_service import HostelService
+from .result_cache import cached_page, hydrate
+from .hostel_catalog import hostel_catalog, page_of
+from ..utils.pagination import keyset_paginate
+from ..utils.cache import StaleWhileRevalidateCache, single_flight
+from sqlalchemy import func
 from geopy.distance import geodesic
-import re
+from bisect import bisect_right
+
+# Filter metadata only changes with the hostels table
+metadata_cache = StaleWhileRevalidateCache(hostels_version)
+# Popular locations held in the cache; larger limits are queried directly
+CACHED_POPULAR_LOCATIONS = 100
+FACETS = ('room_type', 'price', 'amenities', 'verified', 'featured')
+# Lower edges of the price facet bands in KES; the last band is open-ended
+PRICE_FACET_EDGES = (0, 5000, 7500, 10000, 15000, 20000, 30000)
 
 class SearchService:
     @staticmethod
-    def search_hostels(query_params, page=1, per_page=20):
-        """Advanced search for hostels with multiple filters"""
+    def search_hostels(query_params, page=1, per_page=20, cursor=None, include_total=False):
+        """Advanced search for hostels with multiple filters (pass cursor, '' for the first page, to seek instead of offset)"""
+        if cursor is not None:
+            query, distances, fuzzy_match, facets = SearchService._search_query(query_params)
+            sort_by = query_params.get('sort_by', 'relevance')
+            hostels = keyset_paginate(query, HostelService.keyset_order(sort_by), cursor, per_page, include_total)
+            response = hostels.to_dict('hostels', SearchService._serialize(Hostel.load_occupancy(hostels.items), distances))
+        else:
+            # Only the page's ids are cached: hydrating them afresh keeps occupancy and ratings current
+            result = cached_page(
+                'search', query_params, page, per_page,
+                lambda: SearchService._search_page(query_params, page, per_page),
+                dated=bool(query_params.get('check_in') and query_params.get('check_out'))
+            )
+            distances, fuzzy_match, facets = result['distances'], result['fuzzy_match'], result['facets']
+            response = {
+                'hostels': SearchService._serialize(hydrate(result['ids']), distances),
+                'total': result['total'],
+                'pages': result['pages'],
+                'current_page': result['page'],
+                'per_page': result['per_page']
+            }
+
+        response.update({
+            'query': query_params.get('q', ''),
+            'fuzzy_match': fuzzy_match,
+            'filters_applied': {k: v for k, v in query_params.items() if k not in ('page', 'per_page', 'facets')}
+        })
+        if facets is not None:
+            response['facets'] = facets
+        return response
+
+    @staticmethod
+    def _search_page(query_params, page, per_page):
+        """Ids, totals and per-query extras of one offset page of search results"""
+        result = SearchService._catalog_page(query_params, page, per_page)
+        if result is not None:
+            return result
+
+        query, distances, fuzzy_match, facets = SearchService._search_query(query_params)
+        hostels = query.with_entities(Hostel.id).paginate(page=page, per_page=per_page, error_out=False)
+        ids = [row.id for row in hostels.items]
+        return {
+            'ids': ids,
+            'total': hostels.total,
+            'pages': hostels.pages,
+            'page': hostels.page,
+            'per_page': hostels.per_page,
+            'distances': {hostel_id: distances[hostel_id] for hostel_id in ids} if distances is not None else None,
+            'fuzzy_match': fuzzy_match,
+            'facets': facets
+        }
+
+    @staticmethod
+    def _catalog_page(query_params, page, per_page):
+        """The page evaluated on the in-process catalog, or None when a filter needs the database
+        (text search, availability dates or facet counts)"""
+        if query_params.get('q') or query_params.get('facets') or (
+                query_params.get('check_in') and query_params.get('check_out')):
+            return None
+
+        def flag(name):
+            value = query_params.get(name)
+            return value.lower() in ('true', '1', 'yes') if value else None
+
+        near = None
+        if query_params.get('lat') and query_params.get('lng'):
+            near = (float(query_params['lat']), float(query_params['lng']), float(query_params.get('radius', 10)))
+        furnished = query_params.get('furnished')
+        ids, distances = hostel_catalog.select(
+            sort_by=query_params.get('sort_by', 'relevance'),
+            min_price=float(query_params['min_price']) if query_params.get('min_price') else None,
+            max_price=float(query_params['max_price']) if query_params.get('max_price') else None,
+            room_types=HostelService._as_list(query_params.get('room_type')),
+            min_capacity=int(query_params['min_capacity']) if query_params.get('min_capacity') else None,
+            amenities=HostelService._as_list(query_params.get('amenities')),
+            verified=flag('verified_only'),
+            featured=flag('featured_only'),
+            furnished=furnished.lower() in ('true', '1', 'yes') if furnished is not None else None,
+            near=near
+        )
+        result = page_of(ids, page, per_page)
+        if distances is not None:
+            offset = (result['page'] - 1) * result['per_page']
+            distances = dict(zip(result['ids'], distances[offset:offset + len(result['ids'])].tolist()))
+        result.update({'distances': distances, 'fuzzy_match': False, 'facets': None})
+        return result
+
+    @staticmethod
+    def _serialize(hostels, distances):
+        """Hostel dicts with average rating, review count and, for radius searches, distance"""
+        result_hostels = []
+        for hostel in hostels:
+            hostel_data = hostel.to_dict()
+
+            hostel_data['average_rating'] = hostel.average_rating
+            hostel_data['review_count'] = hostel.review_count
+            if distances is not None:
+                hostel_data['distance_km'] = round(distances[hostel.id], 3)
+
+            result_hostels.append(hostel_data)
+        return result_hostels
+
+    @staticmethod
+    def _search_query(query_params):
+        """(sorted query, distances for radius searches, whether the text match is fuzzy, facet counts)"""
         query = Hostel.query
 
-        # Text search (name, location, description)
+        # Text search (name, location, university, description) - every word must match
+        relevance = None
+        fuzzy_match = False
         if query_params.get('q'):
-            search_term = f"%{query_params['q']}%"
-            query = query.filter(
-                or_(
-                    Hostel.name.ilike(search_term),
-                    Hostel.location.ilike(search_term),
-                    Hostel.description.ilike(search_term)
-                )
-            )
+            text_filter, relevance = text_search(query_params['q'])
+            if text_filter is not None and db.session.query(Hostel.id).filter(text_filter).limit(1).scalar() is None:
+                # Nothing matches exactly: probably a misspelling, so match similar names and locations instead
+                text_filter, relevance = fuzzy_search(query_params['q'])
+                fuzzy_match = True
+            if text_filter is not None:
+                query = query.filter(text_filter)
 
         # Location-based search
+        distances = None
         if query_params.get('lat') and query_params.get('lng'):
-            user_location = (float(query_params['lat']), float(query_params['lng']))
+            lat, lng = float(query_params['lat']), float(query_params['lng'])
             radius = float(query_params.get('radius', 10))  # Default 10km radius
 
-            # Filter hostels within radius (requires latitude/longitude columns)
-            # This is a simplified version - in production, you'd use PostGIS or similar
-            hostels_in_radius = []
-            all_hostels = Hostel.query.filter(
-                Hostel.latitude.isnot(None),
-                Hostel.longitude.isnot(None)
-            ).all()
-
-            for hostel in all_hostels:
-                hostel_location = (hostel.latitude, hostel.longitude)
-                distance = geodesic(user_location, hostel_location).kilometers
-                if distance <= radius:
-                    hostels_in_radius.append(hostel.id)
-
-            if hostels_in_radius:
-                query = query.filter(Hostel.id.in_(hostels_in_radius))
+            distances = SearchService.hostel_distances_within_radius(lat, lng, radius)
+
+            if distances:
+                radius_filter, nearest_first = ranked_hostel_ids(sorted(distances, key=distances.get))
+                query = query.filter(radius_filter)
             else:
                 # No hostels in radius, return empty result
                 query = query.filter(Hostel.id == -1)
@@ -65,14 +180,8 @@ class SearchService:
 
         # Amenities
         if query_params.get('amenities'):
-            amenities = query_params['amenities'] if isinstance(query_params['amenities'], list) else [query_params['amenities']]
-            # Filter hostels that have the selected amenities
-            # amenities is expected to be a list of amenity keys like ['wifi', 'water', etc.]
-            for amenity_key in amenities:
-                # Check if the amenity exists in the hostel's amenities JSON
-                query = query.filter(
-                    Hostel.amenities[amenity_key].as_boolean() == True
-                )
+            # Amenity ids or names; one bitwise test on amenity_mask covers them all
+            query = query.filter(HostelService.amenities_clause(query_params['amenities']))
 
         # Features
         if query_params.get('furnished') is not None:
@@ -81,26 +190,13 @@ class SearchService:
                 Hostel.features['furnished'].as_boolean() == furnished
             )
 
-        # Availability dates
+        # Availability dates: drop hostels with any fully booked night in the stay
         if query_params.get('check_in') and query_params.get('check_out'):
-            from ..models.booking import Booking
             from datetime import datetime
             check_in = datetime.fromisoformat(query_params['check_in']).date()
             check_out = datetime.fromisoformat(query_params['check_out']).date()
 
-            # Subquery to find hostels with conflicting bookings
-            conflicting_bookings = db.session.query(Booking.hostel_id).filter(
-                and_(
-                    Booking.status.in_(['confirmed', 'upcoming']),
-                    or_(
-                        and_(Booking.check_in <= check_in, Booking.check_out > check_in),
-                        and_(Booking.check_in < check_out, Booking.check_out >= check_out),
-                        and_(Booking.check_in >= check_in, Booking.check_out <= check_out)
-                    )
-                )
-            ).subquery()
-
-            query = query.filter(~Hostel.id.in_(db.session.query(conflicting_bookings)))
+            query = query.filter(~OccupancyService.fully_booked_clause(check_in, check_out))
 
         # Verification status
         if query_params.get('verified_only'):
@@ -112,6 +208,11 @@ class SearchService:
             featured = query_params['featured_only'].lower() in ('true', '1', 'yes')
             query = query.filter(Hostel.is_featured == featured)
 
+        # Facet counts over the whole filtered result set, before sorting and paging
+        facets = None
+        if query_params.get('facets'):
+            facets = SearchService.facet_counts(query, query_params['facets'])
+
         # Sorting
         sort_by = query_params.get('sort_by', 'relevance')
         if sort_by == 'price_asc':
@@ -119,86 +220,160 @@ class SearchService:
         elif sort_by == 'price_desc':
             query = query.order_by(Hostel.price.desc())
         elif sort_by == 'rating':
-            # Join with reviews to sort by average rating
-            query = query.outerjoin(Hostel.reviews).group_by(Hostel.id)\
-                .order_by(func.avg(Review.rating).desc().nulls_last())
+            query = query.order_by(Hostel.rating_avg.desc().nulls_last())
         elif sort_by == 'newest':
             query = query.order_by(Hostel.created_at.desc())
-        else:  # relevance or default
+        elif sort_by == 'distance' and distances:
+            # Distances are already known: the radius ids were handed over nearest first
+            query = query.order_by(nearest_first)
+        elif sort_by == 'relevance' and relevance is not None:
+            # Best text match first (cursor pagination keeps newest-first, as ranks are not seekable)
+            query = query.order_by(relevance, Hostel.created_at.desc())
+        else:  # relevance without a query, or default
             query = query.order_by(Hostel.created_at.desc())
 
-        # Pagination
-        hostels = query.paginate(page=page, per_page=per_page, error_out=False)
+        return query, distances, fuzzy_match, facets
 
-        # Add average rating and review count to each hostel
-        result_hostels = []
-        for hostel in hostels.items:
-            hostel_data = hostel.to_dict()
-
-            # Calculate average rating
-            avg_rating = db.session.query(func.avg(Review.rating))\
-                .filter(Review.hostel_id == hostel.id)\
-                .scalar() or 0.0
+    @staticmethod
+    def facet_counts(query, facets):
+        """Counts per room type, price band, amenity, verified and featured for every hostel the query matches.
+
+        facets is a comma-separated string or a list of facet names. All requested facets come from one
+        query over the matching rows, counted in a single pass.
+        """
+        names = facets if isinstance(facets, list) else [facets]
+        names = [name.strip() for value in names for name in value.split(',') if name.strip()]
+        unknown = set(names) - set(FACETS)
+        if unknown:
+            raise ValueError(f"Unknown facets: {', '.join(sorted(unknown))}. Choose from {', '.join(FACETS)}")
+
+        counts = {name: {} for name in names}
+        rows = query.order_by(None).with_entities(
+            Hostel.room_type, Hostel.price, Hostel.amenity_mask, Hostel.is_verified, Hostel.is_featured
+        )
+        for room_type, price, mask, is_verified, is_featured in rows:
+            if 'room_type' in counts:
+                counts['room_type'][room_type] = counts['room_type'].get(room_type, 0) + 1
+            if 'price' in counts:
+                band = bisect_right(PRICE_FACET_EDGES, price or 0) - 1
+                counts['price'][band] = counts['price'].get(band, 0) + 1
+            if 'amenities' in counts:
+                for amenity_id in amenity_ids_in(mask or 0):
+                    counts['amenities'][amenity_id] = counts['amenities'].get(amenity_id, 0) + 1
+            if 'verified' in counts:
+                counts['verified'][bool(is_verified)] = counts['verified'].get(bool(is_verified), 0) + 1
+            if 'featured' in counts:
+                counts['featured'][bool(is_featured)] = counts['featured'].get(bool(is_featured), 0) + 1
+
+        result = {}
+        for name, values in counts.items():
+            if name == 'price':
+                result[name] = [
+                    {
+                        'min_price': PRICE_FACET_EDGES[band],
+                        'max_price': PRICE_FACET_EDGES[band + 1] if band + 1 < len(PRICE_FACET_EDGES) else None,
+                        'count': values.get(band, 0)
+                    } for band in range(len(PRICE_FACET_EDGES))
+                ]
+            elif name in ('verified', 'featured'):
+                result[name] = {'true': values.get(True, 0), 'false': values.get(False, 0)}
+            else:
+                result[name] = [
+                    {'value': value, 'count': count}
+                    for value, count in sorted(values.items(), key=lambda item: (-item[1], str(item[0])))
+                ]
+        return result
 
-            review_count = Review.query.filter_by(hostel_id=hostel.id).count()
+    @staticmethod
+    def hostel_distances_within_radius(lat, lng, radius):
+        """Map hostel id -> distance in km for every hostel within radius km of (lat, lng)"""
+        # Candidates come from the grid cells overlapping the circle, exact distances from one NumPy batch
+        return hostel_spatial_index.within_radius(lat, lng, radius)
 
-            hostel_data['average_rating'] = float(avg_rating)
-            hostel_data['review_count'] = review_count
+    @staticmethod
+    def nearest_hostels(lat, lng, k=20, filters=None):
+        """The k hostels closest to (lat, lng) that pass the price/room_type/amenity filters"""
+        hits = nearest_hostel_index.nearest(lat, lng, k, filters)
+        hostels = {
+            hostel.id: hostel
+            for hostel in Hostel.query.filter(Hostel.id.in_([hostel_id for hostel_id, _ in hits])).all()
+        } if hits else {}
+        Hostel.load_occupancy(list(hostels.values()))
 
+        result_hostels = []
+        for hostel_id, distance in hits:
+            hostel = hostels.get(hostel_id)
+            if hostel is None:
+                # Deleted by another worker since this worker last refreshed its index
+                continue
+            hostel_data = hostel.to_dict()
+            hostel_data['distance_km'] = round(distance, 3)
             result_hostels.append(hostel_data)
 
         return {
             'hostels': result_hostels,
-            'total': hostels.total,
-            'pages': hostels.pages,
-            'current_page': hostels.page,
-            'per_page': hostels.per_page,
-            'query': query_params.get('q', ''),
-            'filters_applied': {k: v for k, v in query_params.items() if k != 'page' and k != 'per_page'}
+            'count': len(result_hostels),
+            'k': k,
+            'filters_applied': filters or {}
         }
 
+    @staticmethod
+    def hostel_ids_within_radius_full_scan(lat, lng, radius):
+        """Reference radius filter that runs geopy over every hostel - kept as a correctness/benchmark baseline"""
+        user_location = (lat, lng)
+        hostels_in_radius = []
+        all_hostels = Hostel.query.filter(
+            Hostel.latitude.isnot(None),
+            Hostel.longitude.isnot(None)
+        ).all()
+
+        for hostel in all_hostels:
+            hostel_location = (hostel.latitude, hostel.longitude)
+            distance = geodesic(user_location, hostel_location).kilometers
+            if distance <= radius:
+                hostels_in_radius.append(hostel.id)
+
+        return hostels_in_radius
+
     @staticmethod
     def get_search_suggestions(query, limit=10):
         """Get search suggestions based on hostel names and locations"""
         if not query or len(query) < 2:
             return []
 
-        search_term = f"{query}%"
-
-        # Get matching hostel names
-        names = db.session.query(
-            label('text', Hostel.name),
-            label('type', text("'hostel'"))
-        ).filter(Hostel.name.ilike(search_term)).limit(limit//2)
-
-        # Get matching locations
-        locations = db.session.query(
-            label('text', Hostel.location),
-            label('type', text("'location'"))
-        ).filter(Hostel.location.ilike(search_term)).limit(limit//2)
+        # Served from the per-process index: names, then locations, most popular first
+        matches = suggestion_index.suggest(query, limit // 2)
 
-        # Combine and deduplicate
         suggestions = []
         seen = set()
-
-        for result in names.union(locations).all():
-            if result.text not in seen:
-                suggestions.append({
-                    'text': result.text,
-                    'type': result.type
-                })
-                seen.add(result.text)
+        for kind in ('hostel', 'location'):
+            for suggestion in matches[kind]:
+                if suggestion not in seen:
+                    suggestions.append({
+                        'text': suggestion,
+                        'type': kind
+                    })
+                    seen.add(suggestion)
 
         return suggestions[:limit]
 
     @staticmethod
     def get_popular_locations(limit=20):
         """Get popular locations based on hostel count"""
+        # Concurrent identical computations (a cold cache, or large limits) run once and are shared
+        if limit > CACHED_POPULAR_LOCATIONS:
+            return single_flight.do(('popular_locations', limit), lambda: SearchService._compute_popular_locations(limit))
+        return metadata_cache.get('popular_locations', lambda: single_flight.do(
+            ('popular_locations', CACHED_POPULAR_LOCATIONS), SearchService._compute_popular_locations
+        ))[:limit]
+
+    @staticmethod
+    def _compute_popular_locations(limit=CACHED_POPULAR_LOCATIONS):
         locations = db.session.query(
             Hostel.location,
             func.count(Hostel.id).label('hostel_count')
         ).group_by(Hostel.location)\
-         .order_by(func.count(Hostel.id).desc())\
+         .order_by(func.count(Hostel.id).desc(), Hostel.location)\
          .limit(limit)\
          .all()
 
@@ -212,41 +387,29 @@ class SearchService:
     @staticmethod
     def get_price_ranges():
         """Get price range statistics"""
-        # Get basic stats
-        price_stats = db.session.query(
-            func.min(Hostel.price).label('min_price'),
-            func.max(Hostel.price).label('max_price'),
-            func.avg(Hostel.price).label('avg_price')
-        ).first()
-
-        # Get percentiles manually for SQLite compatibility
-        all_prices = db.session.query(Hostel.price).filter(Hostel.price.isnot(None)).all()
-        prices = sorted([p[0] for p in all_prices if p[0] is not None])
-
-        if not prices:
-            return {
-                'min_price': 0,
-                'max_price': 0,
-                'avg_price': 0,
-                'q1_price': 0,
-                'q3_price': 0
-            }
-
-        n = len(prices)
-        q1_index = int(0.25 * (n - 1))
-        q3_index = int(0.75 * (n - 1))
-
+        stats = price_statistics.summary(percentiles=(25, 75), bins=1)
         return {
-            'min_price': float(price_stats.min_price or 0),
-            'max_price': float(price_stats.max_price or 0),
-            'avg_price': float(price_stats.avg_price or 0),
-            'q1_price': float(prices[q1_index]),
-            'q3_price': float(prices[q3_index])
+            'min_price': stats['min_price'],
+            'max_price': stats['max_price'],
+            'avg_price': stats['avg_price'],
+            'q1_price': stats['percentiles']['25'],
+            'q3_price': stats['percentiles']['75']
         }
 
+    @staticmethod
+    def get_price_statistics(room_type=None, location=None, percentiles=(25, 50, 75), bins=20):
+        """Percentiles and a price histogram for all hostels, one room type or one location"""
+        return price_statistics.summary(room_type, location, percentiles, bins)
+
     @staticmethod
     def get_filter_options():
         """Get available filter options for search"""
+        return metadata_cache.get('filter_options', lambda: single_flight.do(
+            'filter_options', SearchService._compute_filter_options
+        ))
+
+    @staticmethod
+    def _compute_filter_options():
         # Room types
         room_types = db.session.query(Hostel.room_type)\
             .distinct()\
@@ -259,6 +422,7 @@ class SearchService:
         return {
             'room_types': [rt[0] for rt in room_types],
             'amenities': [amenity.to_dict() for amenity in amenities],
+            # Computed afresh: reading the other cache entries could bake their stale values in here
             'price_ranges': SearchService.get_price_ranges(),
-            'popular_locations': SearchService.get_popular_locations()
+            'popular_locations': SearchService._compute_popular_locations(20)
         }
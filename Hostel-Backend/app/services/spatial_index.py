@@ -0,0 +1,83 @@
+import math
+import numpy as np
+from .local_index import HostelLocalIndex
+from ..utils.geo_utils import bounding_box, haversine_km
+
+# Roughly 5.5 km per cell at the equator - a typical search radius touches a handful of cells
+GRID_CELL_DEGREES = 0.05
+# Smallest radius of curvature of the WGS-84 ellipsoid, so the candidate box never undershoots geodesic()
+MIN_EARTH_RADIUS_KM = 6335.0
+
+
+class HostelSpatialIndex(HostelLocalIndex):
+    """Per-process fixed-grid index of hostel coordinates for radius searches"""
+    columns = ('latitude', 'longitude')
+
+    def __init__(self, cell_degrees=GRID_CELL_DEGREES):
+        super().__init__()
+        self.cell_degrees = cell_degrees
+        self._cells = {}  # (row, col) -> {hostel_id: (lat, lng)}
+
+    def _cell_for(self, lat, lng):
+        return (int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees)))
+
+    def make_row(self, values):
+        if values['latitude'] is None or values['longitude'] is None:
+            return None
+        return (values['latitude'], values['longitude'])
+
+    def build(self, rows):
+        self._cells = {}
+        for hostel_id, row in rows.items():
+            self._cells.setdefault(self._cell_for(*row), {})[hostel_id] = row
+
+    def patch(self, hostel_id, old_row, new_row):
+        """Move one hostel between cells"""
+        if old_row is not None:
+            cell = self._cell_for(*old_row)
+            bucket = self._cells.get(cell, {})
+            bucket.pop(hostel_id, None)
+            if not bucket:
+                self._cells.pop(cell, None)
+        if new_row is not None:
+            self._cells.setdefault(self._cell_for(*new_row), {})[hostel_id] = new_row
+        return True
+
+    def candidates(self, lat, lng, radius_km):
+        """(ids, lats, lngs) of the hostels in the grid cells overlapping the bounding box of the circle"""
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km, MIN_EARTH_RADIUS_KM)
+        min_row, min_col = self._cell_for(min_lat, min_lng)
+        max_row, max_col = self._cell_for(max_lat, max_lng)
+
+        self.ensure_fresh()
+        with self._lock:
+            # Small searches walk the covering cells, huge ones just scan the occupied cells
+            covering = (max_row - min_row + 1) * (max_col - min_col + 1)
+            if covering <= len(self._cells):
+                buckets = (
+                    self._cells.get((row, col))
+                    for row in range(min_row, max_row + 1)
+                    for col in range(min_col, max_col + 1)
+                )
+            else:
+                buckets = (
+                    bucket for (row, col), bucket in self._cells.items()
+                    if min_row <= row <= max_row and min_col <= col <= max_col
+                )
+            items = [item for bucket in buckets if bucket for item in bucket.items()]
+
+        ids = np.fromiter((hostel_id for hostel_id, _ in items), dtype=np.int64, count=len(items))
+        points = np.array([position for _, position in items], dtype=np.float64).reshape(-1, 2)
+        return ids, points[:, 0], points[:, 1]
+
+    def within_radius(self, lat, lng, radius_km):
+        """Map hostel id -> great-circle distance in km for every hostel within radius_km of (lat, lng)"""
+        ids, lats, lngs = self.candidates(lat, lng, radius_km)
+        if not len(ids):
+            return {}
+        km = haversine_km(lat, lng, lats, lngs)
+        inside = km <= radius_km
+        return dict(zip(ids[inside].tolist(), km[inside].tolist()))
+
+
+hostel_spatial_index = HostelSpatialIndex()
@@ -0,0 +1,196 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from flask import current_app
+from sqlalchemy import func
+from ..extensions import db
+from ..models.booking import Booking
+from .local_index import HostelLocalIndex
+
+# Booking counts only steer the ranking, so they are re-read on this slower cadence, off the request path
+POPULARITY_REFRESH_SECONDS = 300
+# Prefixes up to this length (typed first, and matching the most entries) get precomputed top lists
+TOP_PREFIX_LENGTH = 3
+# Suggestions kept per type in each precomputed list; longer requests fall back to a range scan
+TOP_PER_TYPE = 25
+# Longer prefixes are ranked on first use and remembered, up to this many
+SCANNED_PREFIX_LIMIT = 10_000
+SUGGESTION_TYPES = ('hostel', 'location')
+
+
+class SuggestionIndex(HostelLocalIndex):
+    """Per-process sorted index of distinct hostel names and locations for prefix autocomplete.
+
+    Each suggestion is weighted by how many hostels carry it plus how often those hostels were booked.
+    """
+    columns = ('name', 'location')
+
+    def __init__(self):
+        super().__init__()
+        self._bookings = {}  # hostel_id -> booking count
+        self._popularity_at = 0.0
+        self._popularity_refreshing = False
+        self._entries = {}  # (text, type) -> [hostel count, booking count]
+        self._keys = []  # sorted (lower-cased text, text, type)
+        self._top = {}  # short lower-cased prefix -> {type: [text, ...] best first}
+        self._scanned = {}  # longer prefixes ranked on first use, same shape
+
+    def make_row(self, values):
+        return (values['name'], values['location'])
+
+    def load(self):
+        super().load()
+        self._load_popularity()
+
+    def _load_popularity(self):
+        bookings = dict(db.session.query(Booking.hostel_id, func.count(Booking.id)).filter(
+            Booking.status != 'cancelled'
+        ).group_by(Booking.hostel_id).all())
+        with self._lock:
+            old_bookings, self._bookings = self._bookings, bookings
+            self._popularity_at = time.monotonic()
+            if self._dirty:
+                return  # the pending build reads the new counts
+
+            # Shift the booking weights of hostels whose count moved and re-rank only their prefixes,
+            # instead of rebuilding every list on the request that happens to hit the refresh
+            changed = set()
+            for hostel_id in old_bookings.keys() | bookings.keys():
+                delta = bookings.get(hostel_id, 0) - old_bookings.get(hostel_id, 0)
+                row = self._rows.get(hostel_id)
+                if not delta or row is None:
+                    continue
+                for entry in self._suggestions(row):
+                    self._entries[entry][1] += delta
+                    changed.add(entry[0].lower())
+            self._refresh_prefixes(changed)
+
+    def ensure_fresh(self):
+        if self._loaded and time.monotonic() - self._popularity_at >= POPULARITY_REFRESH_SECONDS:
+            self._refresh_popularity_in_background()
+        super().ensure_fresh()
+
+    def _refresh_popularity_in_background(self):
+        """Re-read the booking counts on a background thread; requests keep the current weights meanwhile"""
+        with self._lock:
+            if self._popularity_refreshing:
+                return
+            self._popularity_refreshing = True
+
+        app = current_app._get_current_object()
+
+        def refresh():
+            try:
+                with app.app_context():
+                    self._load_popularity()
+            except Exception:
+                # The current weights keep being served and the next stale read retries
+                app.logger.exception("Background refresh of suggestion popularity failed")
+            finally:
+                with self._lock:
+                    self._popularity_refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    @staticmethod
+    def _suggestions(row):
+        name, location = row
+        return [(text, kind) for text, kind in ((name, 'hostel'), (location, 'location')) if text]
+
+    def _weight(self, entry):
+        hostel_count, booking_count = self._entries[entry]
+        return hostel_count + booking_count
+
+    def _ranked(self, keys):
+        """{type: [text, ...]} for the given keys, heaviest first"""
+        ranked = {kind: [] for kind in SUGGESTION_TYPES}
+        for lower, text, kind in sorted(keys, key=lambda key: (-self._weight(key[1:]), key[0], key[1])):
+            ranked[kind].append(text)
+        return ranked
+
+    def _range(self, prefix):
+        """Sorted keys whose lower-cased text starts with prefix"""
+        start = bisect_left(self._keys, (prefix,))
+        end = start
+        while end < len(self._keys) and self._keys[end][0].startswith(prefix):
+            end += 1
+        return self._keys[start:end]
+
+    def _refresh_top(self, prefix):
+        ranked = self._ranked(self._range(prefix))
+        if any(ranked.values()):
+            self._top[prefix] = {kind: texts[:TOP_PER_TYPE] for kind, texts in ranked.items()}
+        else:
+            self._top.pop(prefix, None)
+
+    def _refresh_prefixes(self, changed):
+        """Re-rank the top lists and forget the scanned lists of every prefix of the changed lower-cased texts"""
+        short = set()
+        for lower in changed:
+            short.update(lower[:length] for length in range(2, min(TOP_PREFIX_LENGTH, len(lower)) + 1))
+            for length in range(TOP_PREFIX_LENGTH + 1, len(lower) + 1):
+                self._scanned.pop(lower[:length], None)
+        for prefix in short:
+            self._refresh_top(prefix)
+
+    def build(self, rows):
+        """Rebuild the sorted keys and the short-prefix top lists from the in-memory rows"""
+        entries = {}
+        for hostel_id, row in rows.items():
+            for entry in self._suggestions(row):
+                counts = entries.setdefault(entry, [0, 0])
+                counts[0] += 1
+                counts[1] += self._bookings.get(hostel_id, 0)
+        self._entries = entries
+        self._keys = sorted((text.lower(), text, kind) for text, kind in entries)
+
+        candidates = {}
+        for key in self._keys:
+            for length in range(2, min(TOP_PREFIX_LENGTH, len(key[0])) + 1):
+                candidates.setdefault(key[0][:length], []).append(key)
+        self._top = {}
+        self._scanned = {}
+        for prefix, keys in candidates.items():
+            self._top[prefix] = {kind: texts[:TOP_PER_TYPE] for kind, texts in self._ranked(keys).items()}
+
+    def patch(self, hostel_id, old_row, new_row):
+        """Move one hostel's name and location counts, refreshing only the affected prefixes"""
+        bookings = self._bookings.get(hostel_id, 0)
+        changed = set()
+        for row, sign in ((old_row, -1), (new_row, 1)):
+            for entry in self._suggestions(row) if row else []:
+                counts = self._entries.get(entry)
+                if counts is None:
+                    counts = self._entries[entry] = [0, 0]
+                    insort(self._keys, (entry[0].lower(), *entry))
+                counts[0] += sign
+                counts[1] += sign * bookings
+                if counts[0] <= 0:
+                    del self._entries[entry]
+                    self._keys.pop(bisect_left(self._keys, (entry[0].lower(), *entry)))
+                changed.add(entry[0].lower())
+
+        self._refresh_prefixes(changed)
+        return True
+
+    def suggest(self, prefix, per_type):
+        """Up to per_type best suggestions of each type starting with prefix, as {type: [text, ...]}"""
+        self.ensure_fresh()
+        lower = prefix.lower()
+        with self._lock:
+            if per_type <= TOP_PER_TYPE:
+                if len(lower) <= TOP_PREFIX_LENGTH:
+                    top = self._top.get(lower, {})
+                else:
+                    top = self._scanned.get(lower)
+                    if top is None:
+                        if len(self._scanned) >= SCANNED_PREFIX_LIMIT:
+                            self._scanned = {}
+                        top = self._scanned[lower] = {
+                            kind: texts[:TOP_PER_TYPE] for kind, texts in self._ranked(self._range(lower)).items()
+                        }
+                return {kind: top.get(kind, [])[:per_type] for kind in SUGGESTION_TYPES}
+            return {kind: texts[:per_type] for kind, texts in self._ranked(self._range(lower)).items()}
+
+
+suggestion_index = SuggestionIndex()
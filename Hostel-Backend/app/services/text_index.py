@@ -0,0 +1,118 @@
+import math
+import re
+from bisect import bisect_left
+from sqlalchemy import func, text
+from ..extensions import db
+from ..models.hostel import Hostel, hostel_search_document
+from .local_index import HostelLocalIndex, ranked_hostel_ids
+
+# Per-field term weights, mirroring the A/B/C weights of hostel_search_document()
+FIELD_WEIGHTS = (('name', 3.0), ('location', 2.0), ('university', 2.0), ('description', 1.0))
+# BM25 term-frequency saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Score share of a term that only extends a query word ("12" -> "120"), so exact words rank first
+PREFIX_MATCH_WEIGHT = 0.5
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(value):
+    """Lower-cased words and numbers in value"""
+    return _TOKEN.findall(value.lower()) if value else []
+
+
+class HostelTextIndex(HostelLocalIndex):
+    """Per-process inverted index with BM25 scoring, used for text search where Postgres full-text search is unavailable"""
+    columns = ('name', 'location', 'description', 'features')
+
+    def __init__(self):
+        super().__init__()
+        self._postings = {}  # term -> {hostel_id: weighted term frequency}
+        self._terms = []  # sorted, for prefix lookups
+        self._lengths = {}
+        self._average_length = 0.0
+
+    def make_row(self, values):
+        """({term: weighted frequency}, weighted document length)"""
+        features = values['features'] if isinstance(values['features'], dict) else {}
+        fields = dict(values, university=features.get('university'))
+
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(str(fields[field]) if fields[field] is not None else ''):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        return (frequencies, sum(frequencies.values()))
+
+    def build(self, rows):
+        """Rebuild the postings from the in-memory rows"""
+        postings = {}
+        for hostel_id, (frequencies, _) in rows.items():
+            for term, frequency in frequencies.items():
+                postings.setdefault(term, {})[hostel_id] = frequency
+
+        self._postings = postings
+        self._terms = sorted(postings)
+        self._lengths = {hostel_id: length for hostel_id, (_, length) in rows.items()}
+        self._average_length = sum(self._lengths.values()) / len(rows) if rows else 0.0
+
+    def _expand(self, prefix):
+        """Indexed terms starting with prefix"""
+        start = bisect_left(self._terms, prefix)
+        end = start
+        while end < len(self._terms) and self._terms[end].startswith(prefix):
+            end += 1
+        return self._terms[start:end]
+
+    def search(self, terms):
+        """BM25 scores of the hostels containing every term (each matched as a prefix), as {hostel_id: score}"""
+        self.ensure_fresh()
+        with self._lock:
+            postings, lengths, average_length = self._postings, self._lengths, self._average_length
+            expansions = [(word, self._expand(word)) for word in terms]
+
+        total = len(lengths)
+        scores = None
+        for word, expanded in expansions:
+            term_scores = {}
+            for term in expanded:
+                hostels = postings[term]
+                idf = math.log(1 + (total - len(hostels) + 0.5) / (len(hostels) + 0.5))
+                if term != word:
+                    idf *= PREFIX_MATCH_WEIGHT
+                for hostel_id, frequency in hostels.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[hostel_id] / average_length)
+                    term_scores[hostel_id] = term_scores.get(hostel_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+            # Every query term must match
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {hostel_id: score + term_scores[hostel_id] for hostel_id, score in scores.items() if hostel_id in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+
+hostel_text_index = HostelTextIndex()
+
+
+def text_search(q):
+    """(filter, relevance ordering) for hostels matching every word of q, or (None, None) if q has no words.
+
+    Postgres uses the ix_hostels_search_document GIN index and ts_rank_cd; other databases use the
+    in-process BM25 index. Each word also matches as a prefix, so partially typed queries still hit.
+    """
+    terms = tokenize(q)
+    if not terms:
+        return None, None
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        document = hostel_search_document()
+        tsquery = func.to_tsquery(text("'simple'::regconfig"), ' & '.join(f'{term}:*' for term in terms))
+        return document.bool_op('@@')(tsquery), func.ts_rank_cd(document, tsquery).desc()
+
+    scores = hostel_text_index.search(terms)
+    if not scores:
+        return Hostel.id == -1, None
+    return ranked_hostel_ids(sorted(scores, key=scores.get, reverse=True))
@@ -0,0 +1,122 @@
+import numpy as np
+from sqlalchemy import func, literal, or_
+from ..extensions import db
+from ..models.hostel import Hostel, hostel_trigram_fields
+from .local_index import HostelLocalIndex, ranked_hostel_ids
+from .text_index import tokenize
+
+# Share of the query's trigrams a field must contain - pg_trgm's default word_similarity_threshold
+SIMILARITY_THRESHOLD = 0.6
+
+
+def trigrams(value):
+    """pg_trgm style trigrams: each word lower-cased and padded with two spaces in front, one behind"""
+    grams = set()
+    for word in tokenize(value):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class HostelTrigramIndex(HostelLocalIndex):
+    """Per-process trigram index over hostel names, locations and universities for typo-tolerant search"""
+    columns = ('name', 'location', 'features')
+
+    def __init__(self):
+        super().__init__()
+        self._codes = {}  # trigram -> int code, kept across rebuilds
+        self._value_codes = {}  # distinct field value -> array of its trigram codes, kept across rebuilds
+        self._value_count = 0
+        self._posting_codes = np.empty(0, dtype=np.int64)  # sorted trigram codes...
+        self._posting_values = np.empty(0, dtype=np.int64)  # ...and the value each occurrence belongs to
+        self._ids = np.empty(0, dtype=np.int64)
+        self._hostel_values = np.empty((0, 3), dtype=np.int64)  # per hostel: value index per field, -1 if empty
+
+    def make_row(self, values):
+        """(name, location, university) as searchable strings"""
+        features = values['features'] if isinstance(values['features'], dict) else {}
+        university = features.get('university')
+        return (values['name'] or '', values['location'] or '', str(university) if university else '')
+
+    def _trigram_codes(self, value):
+        codes = self._value_codes.get(value)
+        if codes is None:
+            codes = np.array(sorted(self._codes.setdefault(gram, len(self._codes)) for gram in trigrams(value)),
+                             dtype=np.int64)
+            self._value_codes[value] = codes
+        return codes
+
+    def build(self, rows):
+        """Rebuild the trigram postings from the in-memory rows"""
+        positions = {}
+        hostel_values = np.full((len(rows), 3), -1, dtype=np.int64)
+        for row_number, row in enumerate(rows.values()):
+            for field, value in enumerate(row):
+                if value:
+                    hostel_values[row_number, field] = positions.setdefault(value, len(positions))
+
+        live = set(positions)
+        self._value_codes = {value: codes for value, codes in self._value_codes.items() if value in live}
+        value_codes = [self._trigram_codes(value) for value in positions]
+
+        codes = np.concatenate(value_codes) if value_codes else np.empty(0, dtype=np.int64)
+        owners = np.repeat(np.arange(len(value_codes), dtype=np.int64), [len(c) for c in value_codes])
+        order = np.argsort(codes, kind='stable')
+
+        self._value_count = len(value_codes)
+        self._posting_codes = codes[order]
+        self._posting_values = owners[order]
+        self._ids = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+        self._hostel_values = hostel_values
+
+    def search(self, q):
+        """Similarity of each hostel's best matching field to q, for hostels above the threshold, as {hostel_id: score}"""
+        grams = trigrams(q)
+        if not grams:
+            return {}
+
+        self.ensure_fresh()
+        with self._lock:
+            known = [self._codes[gram] for gram in grams if gram in self._codes]
+            posting_codes, posting_values = self._posting_codes, self._posting_values
+            ids, hostel_values, value_count = self._ids, self._hostel_values, self._value_count
+
+        if not known or not len(ids):
+            return {}
+
+        # Count the query trigrams each distinct value contains
+        known = np.array(known, dtype=np.int64)
+        starts = np.searchsorted(posting_codes, known, side='left')
+        ends = np.searchsorted(posting_codes, known, side='right')
+        matched = np.concatenate([posting_values[start:end] for start, end in zip(starts, ends)])
+        value_scores = np.append(np.bincount(matched, minlength=value_count) / len(grams), 0.0)
+
+        # hostel_values uses -1 for empty fields, which picks the appended zero score
+        scores = value_scores[hostel_values].max(axis=1)
+        hits = np.flatnonzero(scores >= SIMILARITY_THRESHOLD)
+        return dict(zip(ids[hits].tolist(), scores[hits].tolist()))
+
+
+hostel_trigram_index = HostelTrigramIndex()
+
+
+def fuzzy_search(q):
+    """(filter, similarity ordering) for hostels whose name, location or university resembles q.
+
+    Postgres uses pg_trgm word similarity (the <% operator, served by the trigram GIN indexes);
+    other databases use the in-process trigram index.
+    """
+    if not tokenize(q):
+        return None, None
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        fields = hostel_trigram_fields()
+        return (
+            or_(*[literal(q, db.Text).op('<%')(field) for field in fields]),
+            func.greatest(*[func.word_similarity(q, field) for field in fields]).desc()
+        )
+
+    scores = hostel_trigram_index.search(q)
+    if not scores:
+        return Hostel.id == -1, None
+    return ranked_hostel_ids(sorted(scores, key=scores.get, reverse=True))
@@ -0,0 +1,208 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class _Entry:
+    __slots__ = ('value', 'version', 'stored_at')
+
+    def __init__(self, value, version):
+        self.value = value
+        self.version = version
+        self.stored_at = time.monotonic()
+
+
+class StaleWhileRevalidateCache:
+    """Per-process cache of computed results tagged with the data version they were computed from.
+
+    A result whose version moved on (or that is older than max_age seconds) is still served while
+    a single background thread recomputes it, so only the very first request for a key waits.
+    """
+
+    def __init__(self, version, max_age=600):
+        self._version = version  # callable returning the current data version
+        self._max_age = max_age
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        version = self._version()
+        entry = self._entries.get(key)
+        if entry is None:
+            value = compute()
+            self._entries[key] = _Entry(value, version)
+            return value
+
+        if entry.version != version or time.monotonic() - entry.stored_at >= self._max_age:
+            self._refresh_in_background(key, compute, version)
+        return entry.value
+
+    def _refresh_in_background(self, key, compute, version):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        app = current_app._get_current_object()
+
+        def refresh():
+            try:
+                with app.app_context():
+                    self._entries[key] = _Entry(compute(), version)
+            except Exception:
+                # The stale entry keeps being served and the next stale read retries
+                app.logger.exception("Background refresh of %r failed", key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def clear(self):
+        self._entries.clear()
+
+
+class LRUCache:
+    """Per-process cache of computed results, bounded in entries and age, with hit/miss counters.
+
+    Each lookup passes the current data version; an entry computed from another version, or older
+    than ttl seconds, counts as a miss and is recomputed inline.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version and time.monotonic() - entry.stored_at < self._ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = _Entry(value, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self._max_entries,
+                'ttl_seconds': self._ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except ValueError:
+        return value  # left for the query itself to reject
+    return int(number) if number.is_integer() else number
+
+
+def canonical_params(params, numeric=()):
+    """Hashable form of parsed query params, equal for requests that filter the same way.
+
+    Blank values are dropped, every value becomes a sorted tuple (so 'single' and ['single'] match,
+    as do lists in any order) and params named in numeric compare as numbers ('6000' == '6000.0').
+    """
+    items = []
+    for name, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        values = {str(item).strip() for item in values if item is not None}
+        values.discard('')
+        if not values:
+            continue
+        if name in numeric:
+            values = {_number(item) for item in values}
+        items.append((name, tuple(sorted(values, key=str))))
+    return tuple(sorted(items))
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical computations within this worker.
+
+    While one call for a key runs, further callers with the same key wait for it and share its
+    result (or its exception) instead of computing it again. Results are shared, so must be
+    treated as read-only. Keys are strings or tuples whose first item names the computation.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counts = {}  # name -> [executions, coalesced]
+
+    def do(self, key, compute):
+        name = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._counts.setdefault(name, [0, 0])[0 if leader else 1] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': sum(counts[0] for counts in self._counts.values()),
+                'coalesced': sum(counts[1] for counts in self._counts.values()),
+                'by_name': {
+                    name: {'executions': executions, 'coalesced': coalesced}
+                    for name, (executions, coalesced) in self._counts.items()
+                }
+            }
+
+
+# Shared by the expensive read endpoints (filter metadata, popular locations, landlord analytics)
+single_flight = SingleFlight()
@@ -0,0 +1,31 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def bounding_box(lat, lng, radius_km, earth_radius_km=EARTH_RADIUS_KM):
+    """Smallest lat/lng box containing every point within radius_km of (lat, lng)"""
+    angle = radius_km / earth_radius_km
+    lat_span = math.degrees(angle)
+    min_lat = max(lat - lat_span, -90.0)
+    max_lat = min(lat + lat_span, 90.0)
+
+    # Near the poles or across the antimeridian the box covers every longitude
+    if angle >= math.pi / 2 or abs(lat) + lat_span >= 90:
+        return min_lat, max_lat, -180.0, 180.0
+    lng_span = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+    if lng - lng_span < -180 or lng + lng_span > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lng - lng_span, lng + lng_span
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """Great-circle distances in km from (lat, lng) to every point in lats/lngs, as a NumPy array"""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlng = np.radians(np.asarray(lngs, dtype=np.float64) - lng)
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+
+class KeysetPage:
+    """One page of a keyset (cursor) paginated query"""
+
+    def __init__(self, items, next_cursor, per_page, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+        self.total = total
+
+    def to_dict(self, items_key, items):
+        """Response body for the page, using already-serialised items"""
+        body = {
+            items_key: items,
+            'next_cursor': self.next_cursor,
+            'per_page': self.per_page
+        }
+        if self.total is not None:
+            body['total'] = self.total
+        return body
+
+
+def wants_total(value):
+    """Parse the include_total query parameter"""
+    return str(value).lower() in ('true', '1', 'yes')
+
+
+def encode_cursor(values):
+    payload = json.dumps([value.isoformat() if isinstance(value, (date, datetime)) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, order):
+    """Decode a cursor into typed values for the given sort columns, or raise ValueError"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(order):
+        raise ValueError("Invalid cursor")
+
+    typed = []
+    for (column, _), value in zip(order, values):
+        python_type = column.type.python_type
+        if value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value is not None and python_type is date:
+            value = date.fromisoformat(value)
+        typed.append(value)
+    return typed
+
+
+def _after(order, values):
+    """Rows strictly after `values` in the (column, descending) ordering"""
+    clauses = []
+    for position, (column, descending) in enumerate(order):
+        beyond = column < values[position] if descending else column > values[position]
+        ties = [order[i][0] == values[i] for i in range(position)]
+        clauses.append(and_(*ties, beyond))
+    return or_(*clauses)
+
+
+def keyset_paginate(query, order, cursor, per_page, include_total=False):
+    """Seek-based pagination over `order`, a list of (column, descending) ending with a unique column.
+
+    An empty cursor starts at the first page. No COUNT(*) is issued unless include_total is set.
+    """
+    total = query.order_by(None).count() if include_total else None
+
+    if cursor:
+        query = query.filter(_after(order, decode_cursor(cursor, order)))
+    query = query.order_by(None).order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column, _ in order])
+
+    return KeysetPage(items, next_cursor, per_page, total)
@@ -0,0 +1,98 @@
+"""Latency of listing filters on the in-process columnar catalog versus the SQL path.
+
+Run from Hostel-Backend:  python benchmarks/bench_catalog.py [hostel_count]
+Uses an in-memory SQLite database; both paths return the ids and totals of page one.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity, amenity_mask
+from app.models.hostel import Hostel
+from app.services.hostel_catalog import hostel_catalog
+from app.services.hostel_service import HostelService
+
+CENTER = (-1.2921, 36.8219)  # Nairobi CBD
+SPREAD_DEGREES = 0.5
+ESTATES = ["Kahawa Wendani", "Kahawa Sukari", "Juja", "Rongai", "Westlands", "Kilimani", "Githurai", "Ruiru"]
+UNIVERSITIES = ["JKUAT", "Kenyatta University", "University of Nairobi", "Strathmore", "USIU"]
+ROOM_TYPES = ["single", "double", "bedsitter", "studio", "dormitory"]
+QUERIES = 200
+CASES = [
+    ("no filters", {}),
+    ("area + price + single", {"location": "juja", "min_price": "6000", "max_price": "9000", "room_type": ["single"]}),
+    ("price band, price_asc", {"min_price": "5000", "max_price": "12000", "sort_by": "price_asc"}),
+    ("amenity + verified", {"amenities": ["2"], "verified_only": "true"}),
+]
+
+
+def seed(count):
+    rng = random.Random(42)
+    db.session.add_all([Amenity(id=1, name="wifi"), Amenity(id=2, name="gym")])
+    rows = []
+    for i in range(count):
+        amenities = [1, 2] if rng.random() < 0.1 else [1]
+        rows.append({
+            "name": f"Hostel {i}",
+            "location": f"{rng.choice(ESTATES)}, Nairobi",
+            "latitude": CENTER[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            "longitude": CENTER[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            "price": rng.randrange(3000, 15000, 500),
+            "capacity": rng.randint(1, 8),
+            "room_type": rng.choice(ROOM_TYPES),
+            "amenities": amenities,
+            "amenity_mask": amenity_mask(amenities),
+            "features": {"university": rng.choice(UNIVERSITIES), "furnished": rng.random() < 0.5},
+            "is_verified": rng.random() < 0.5,
+            "landlord_id": 1,
+        })
+    db.session.execute(Hostel.__table__.insert(), rows)
+    db.session.commit()
+
+
+def sql_page(filters):
+    return HostelService._listing_query(filters).with_entities(Hostel.id).paginate(page=1, per_page=20, error_out=False)
+
+
+def timed(function, filters):
+    timings = []
+    for _ in range(QUERIES):
+        start = time.perf_counter()
+        function(filters)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, timings[int(len(timings) * 0.99)] * 1000
+
+
+def main(count):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(count)
+
+        start = time.perf_counter()
+        hostel_catalog.ensure_fresh()
+        print(f"{count} hostels, initial load + build: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        start = time.perf_counter()
+        hostel_catalog.build(hostel_catalog._rows)
+        print(f"rebuild from memory: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        report = hostel_catalog.memory_report()
+        print(f"memory: columns {report['column_bytes'] / 1024:.0f}KiB, rows {report['row_bytes'] / 1024:.0f}KiB")
+
+        for label, filters in CASES:
+            sql_p50, sql_p99 = timed(sql_page, filters)
+            catalog_p50, catalog_p99 = timed(lambda f: HostelService._listing_page(f, 1, 20), filters)
+            print(f"{label:<24} sql p50 {sql_p50:.3f}ms p99 {sql_p99:.3f}ms"
+                  f" | catalog p50 {catalog_p50:.3f}ms p99 {catalog_p99:.3f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,70 @@
+"""Latency of typo-tolerant (trigram) matching against the in-process index.
+
+Run from Hostel-Backend:  python benchmarks/bench_fuzzy_search.py [hostel_count]
+Uses an in-memory SQLite database seeded with hostels in common Nairobi-area estates.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.models.hostel import Hostel
+from app.services.trigram_index import hostel_trigram_index
+
+ESTATES = ["Kahawa Wendani", "Kahawa Sukari", "Juja", "Rongai", "Westlands", "Kilimani", "Githurai", "Ruiru",
+           "Madaraka", "South B", "Kasarani", "Thika Road", "Kikuyu", "Karen", "Lavington", "Parklands"]
+UNIVERSITIES = ["JKUAT", "Kenyatta University", "University of Nairobi", "Strathmore", "USIU", "Multimedia University"]
+WORDS = ["Palace", "Court", "Heights", "Residence", "Gardens", "Villa", "Lodge", "Apartments", "Suites", "Haven"]
+QUERIES = 300
+CASES = ["Kahawa Wendeni", "Rongay", "Jujaa", "Westland", "Kenyata Univercity", "Gardns"]
+
+
+def seed(count):
+    rng = random.Random(42)
+    db.session.execute(Hostel.__table__.insert(), [
+        {
+            "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            "location": f"{rng.choice(ESTATES)}, Nairobi",
+            "price": 6000,
+            "capacity": 4,
+            "room_type": "single",
+            "features": {"university": rng.choice(UNIVERSITIES)},
+            "landlord_id": 1,
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def main(count):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(count)
+
+        start = time.perf_counter()
+        hostel_trigram_index.ensure_fresh()
+        print(f"{count} hostels, initial load + build: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        start = time.perf_counter()
+        hostel_trigram_index.build(hostel_trigram_index._rows)
+        print(f"rebuild from memory: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        for query in CASES:
+            timings = []
+            for _ in range(QUERIES):
+                start = time.perf_counter()
+                hits = hostel_trigram_index.search(query)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f"{query!r:<22} {len(hits):>6} hits  p50 {timings[len(timings) // 2] * 1000:.3f}ms"
+                  f"  p99 {timings[int(len(timings) * 0.99)] * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
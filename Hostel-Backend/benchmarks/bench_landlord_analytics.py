@@ -0,0 +1,73 @@
+"""Latency and statement count of the landlord dashboard aggregates.
+
+Run from Hostel-Backend:  python benchmarks/bench_landlord_analytics.py [booking_count]
+Uses an in-memory SQLite database with one landlord owning 300 hostels; the daily rollup is built after seeding.
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.models.landlord import Landlord
+from app.services.analytics_service import AnalyticsService
+from app.services.rollup_service import BookingRollupService
+
+HOSTELS = 300
+RUNS = 50
+STATUSES = ["confirmed", "completed", "cancelled", "pending"]
+
+
+def seed(count):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    db.session.add(Landlord(id=1, user_id=1, business_name="Bench Estates"))
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": f"Hostel {i}", "location": "Juja", "price": 6000, "capacity": rng.randint(2, 20),
+         "room_type": "single", "landlord_id": 1}
+        for i in range(HOSTELS)
+    ])
+    rows = []
+    for _ in range(count):
+        created = now - timedelta(days=rng.randint(0, 3 * 365))
+        check_in = created.date() + timedelta(days=rng.randint(1, 60))
+        rows.append({"user_id": 1, "hostel_id": rng.randint(1, HOSTELS), "check_in": check_in,
+                     "check_out": check_in + timedelta(days=rng.randint(1, 120)), "guests": 1,
+                     "total_price": rng.randrange(3000, 15000, 500), "status": rng.choice(STATUSES),
+                     "created_at": created})
+    db.session.execute(Booking.__table__.insert(), rows)
+    db.session.commit()
+    BookingRollupService.rebuild_rollup()
+
+
+def main(count):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(count)
+        landlord = db.session.get(Landlord, 1)
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(1))
+        for months in (4, 12, 24):
+            timings = []
+            statements.clear()
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                AnalyticsService.landlord_dashboard(landlord, months)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f"{count} bookings, {months:>2}-month trend: {len(statements) // RUNS} statements,"
+                  f" p50 {timings[len(timings) // 2] * 1000:.1f}ms  p99 {timings[int(len(timings) * 0.99)] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
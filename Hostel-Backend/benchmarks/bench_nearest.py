@@ -0,0 +1,83 @@
+"""Latency of nearest-K queries against the in-process KD-tree index.
+
+Run from Hostel-Backend:  python benchmarks/bench_nearest.py [hostel_count]
+Uses an in-memory SQLite database seeded with hostels scattered around Nairobi.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity, amenity_mask
+from app.models.hostel import Hostel
+from app.services.nearest_index import nearest_hostel_index
+
+CENTER = (-1.2921, 36.8219)  # Nairobi CBD
+SPREAD_DEGREES = 0.5
+ROOM_TYPES = ["single", "double", "bedsitter", "studio", "dormitory"]
+QUERIES = 1000
+CASES = [
+    ("k=20, no filters", {}),
+    ("k=20, room_type", {"room_type": ["studio"]}),
+    ("k=20, price band", {"min_price": 6000, "max_price": 8000}),
+    ("k=20, rare amenity", {"amenities": ["2"]}),
+]
+
+
+def seed(count):
+    rng = random.Random(42)
+    db.session.add_all([Amenity(id=1, name="wifi"), Amenity(id=2, name="gym")])
+    rows = []
+    for i in range(count):
+        amenities = [1, 2] if rng.random() < 0.01 else [1]
+        rows.append({
+            "name": f"Hostel {i}",
+            "location": "Nairobi",
+            "latitude": CENTER[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            "longitude": CENTER[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            "price": rng.randrange(3000, 15000, 500),
+            "capacity": 4,
+            "room_type": rng.choice(ROOM_TYPES),
+            "amenities": amenities,
+            "amenity_mask": amenity_mask(amenities),
+            "landlord_id": 1,
+        })
+    db.session.execute(Hostel.__table__.insert(), rows)
+    db.session.commit()
+
+
+def main(count):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(count)
+
+        start = time.perf_counter()
+        nearest_hostel_index.ensure_fresh()
+        print(f"{count} hostels, initial load + build: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        start = time.perf_counter()
+        nearest_hostel_index.build(nearest_hostel_index._rows)
+        print(f"tree rebuild from memory: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        rng = random.Random(7)
+        for label, filters in CASES:
+            timings = []
+            for _ in range(QUERIES):
+                lat = CENTER[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+                lng = CENTER[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+                start = time.perf_counter()
+                nearest_hostel_index.nearest(lat, lng, 20, filters)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f"{label:<22} p50 {timings[len(timings) // 2] * 1000:.3f}ms"
+                  f"  p99 {timings[int(len(timings) * 0.99)] * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
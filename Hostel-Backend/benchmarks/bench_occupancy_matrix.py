@@ -0,0 +1,84 @@
+"""Latency of the landlord occupancy report (hostel x night matrix) over growing windows.
+
+Run from Hostel-Backend:  python benchmarks/bench_occupancy_matrix.py [booking_count]
+Uses an in-memory SQLite database with one landlord owning 500 hostels and three years of bookings.
+Reports the time spent loading bookings and building the matrix separately.
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app import create_app
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.models.landlord import Landlord
+from app.services.analytics_service import AnalyticsService
+from app.services.occupancy_matrix import OccupancyMatrix
+
+HOSTELS = 500
+RUNS = 10
+STATUSES = ["confirmed", "completed", "cancelled", "upcoming"]
+
+
+def seed(count):
+    rng = random.Random(42)
+    today = date.today()
+    db.session.add(Landlord(id=1, user_id=1, business_name="Bench Estates"))
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": f"Hostel {i}", "location": "Juja", "price": 6000, "capacity": rng.randint(2, 20),
+         "room_type": "single", "landlord_id": 1}
+        for i in range(HOSTELS)
+    ])
+    rows = []
+    for _ in range(count):
+        check_in = today - timedelta(days=rng.randint(-90, 3 * 365))
+        rows.append({"user_id": 1, "hostel_id": rng.randint(1, HOSTELS), "check_in": check_in,
+                     "check_out": check_in + timedelta(days=rng.randint(1, 120)), "guests": rng.randint(1, 3),
+                     "total_price": 6000, "status": rng.choice(STATUSES)})
+    db.session.execute(Booking.__table__.insert(), rows)
+    db.session.commit()
+
+
+def timed(function):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def main(count):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(count)
+        landlord = db.session.get(Landlord, 1)
+        hostels = db.session.query(Hostel.id, Hostel.capacity).order_by(Hostel.id).all()
+        hostel_ids = [hostel.id for hostel in hostels]
+        capacities = [hostel.capacity for hostel in hostels]
+
+        for days in (30, 365, 3 * 365):
+            end = date.today() + timedelta(days=1)
+            start = end - timedelta(days=days)
+            # Matrix arithmetic alone, on synthetic arrays as large as the seeded bookings
+            rng = np.random.default_rng(0)
+            check_in = rng.integers(-30, days, count)
+            arrays = (rng.integers(0, HOSTELS, count), check_in, check_in + rng.integers(1, 120, count),
+                      rng.integers(1, 4, count))
+            build = timed(lambda: OccupancyMatrix(hostel_ids, capacities, start, end, *arrays).vacancy_gaps())
+            load = timed(lambda: OccupancyMatrix.load(landlord.id, hostel_ids, capacities, start, end))
+            report = timed(lambda: AnalyticsService.landlord_occupancy(landlord, start, end))
+            print(f"{count} bookings, {HOSTELS} hostels x {days:>4} nights: load+build p50 {load:.1f}ms,"
+                  f" matrix+gaps only p50 {build:.1f}ms, full report p50 {report:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,76 @@
+"""Latency of autocomplete suggestions served from the in-process suggestion index.
+
+Run from Hostel-Backend:  python benchmarks/bench_suggestions.py [hostel_count]
+Uses an in-memory SQLite database seeded with hostels in common Nairobi-area estates.
+"""
+import os
+import random
+import string
+import sys
+import time
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.models.hostel import Hostel
+from app.services.search_service import SearchService
+from app.services.suggestion_index import suggestion_index
+
+ESTATES = ["Kahawa Wendani", "Kahawa Sukari", "Juja", "Rongai", "Westlands", "Kilimani", "Githurai", "Ruiru",
+           "Madaraka", "South B", "Kasarani", "Thika Road", "Kikuyu", "Karen", "Lavington", "Parklands"]
+WORDS = ["Palace", "Court", "Heights", "Residence", "Gardens", "Villa", "Lodge", "Apartments", "Suites", "Haven"]
+QUERIES = 2000
+
+
+def seed(count):
+    rng = random.Random(42)
+    db.session.execute(Hostel.__table__.insert(), [
+        {
+            "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            "location": f"{rng.choice(ESTATES)}, Nairobi",
+            "price": 6000,
+            "capacity": 4,
+            "room_type": "single",
+            "landlord_id": 1,
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def report(label, timings):
+    timings.sort()
+    print(f"{label:<28} p50 {timings[len(timings) // 2] * 1000:.3f}ms"
+          f"  p99 {timings[int(len(timings) * 0.99)] * 1000:.3f}ms")
+
+
+def main(count):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(count)
+
+        start = time.perf_counter()
+        suggestion_index.ensure_fresh()
+        print(f"{count} hostels, initial load + build: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        rng = random.Random(7)
+        popular = [word[:2] for word in WORDS + ESTATES]
+        for label, prefixes in (
+            ("2 chars, popular prefixes", popular),
+            ("2 chars, random prefixes", [a + b for a in string.ascii_lowercase for b in string.ascii_lowercase]),
+            ("5 chars, popular prefixes", [word[:5] for word in WORDS + ESTATES]),
+        ):
+            timings = []
+            for _ in range(QUERIES):
+                prefix = rng.choice(prefixes)
+                start = time.perf_counter()
+                SearchService.get_search_suggestions(prefix, 10)
+                timings.append(time.perf_counter() - start)
+            report(label, timings)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
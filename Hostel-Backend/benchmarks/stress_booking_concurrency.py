@@ -0,0 +1,107 @@
+"""Fire concurrent bookings at one hostel and check capacity is never exceeded.
+
+Run from Hostel-Backend:  python benchmarks/stress_booking_concurrency.py [requests] [threads]
+Uses a throwaway SQLite file unless DATABASE_URL points at a (scratch!) Postgres database.
+Exits non-zero if the hostel ends up overbooked.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "stress.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.models.user import User
+from app.models.landlord import Landlord
+from app.services.booking_service import BookingService
+from app.services.occupancy_service import OccupancyService
+
+CAPACITY = 25
+
+
+def setup():
+    db.drop_all()
+    db.create_all()
+    landlord_user = User(email="landlord@example.com", role="landlord")
+    landlord_user.set_password("stress")
+    student = User(email="student@example.com", role="student")
+    student.set_password("stress")
+    db.session.add_all([landlord_user, student])
+    db.session.flush()
+    landlord = Landlord(user_id=landlord_user.id)
+    db.session.add(landlord)
+    db.session.flush()
+    hostel = Hostel(name="Stress Hostel", location="Juja", price=6000, capacity=CAPACITY,
+                    room_type="single", landlord_id=landlord.id)
+    db.session.add(hostel)
+    db.session.commit()
+    return student.id, hostel.id
+
+
+def main(total_requests, thread_count):
+    app = create_app()
+    with app.app_context():
+        student_id, hostel_id = setup()
+
+    check_in = date.today() + timedelta(days=7)
+    outcomes = {"booked": 0, "rejected": 0, "errors": 0}
+    outcomes_lock = threading.Lock()
+    per_thread = total_requests // thread_count
+
+    def worker(offset):
+        with app.app_context():
+            for i in range(per_thread):
+                # Staggered stays so bookings overlap partially, not all on the same nights
+                start = check_in + timedelta(days=(offset + i) % 10)
+                try:
+                    BookingService.create_booking(student_id, hostel_id, start.isoformat(),
+                                                  (start + timedelta(days=30)).isoformat(), 1)
+                    outcome = "booked"
+                except ValueError:
+                    outcome = "rejected"
+                except Exception as e:
+                    print(f"error: {e}")
+                    outcome = "errors"
+                with outcomes_lock:
+                    outcomes[outcome] += 1
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(thread_count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        bookings = Booking.query.filter_by(hostel_id=hostel_id, status="confirmed").all()
+        peak = max(
+            (sum(b.guests for b in bookings if b.check_in <= night < b.check_out)
+             for night in OccupancyService.booking_nights(check_in, check_in + timedelta(days=40))),
+            default=0
+        )
+        ledger_peak = OccupancyService.peak_guests(hostel_id, check_in, check_in + timedelta(days=40))
+
+    attempts = per_thread * thread_count
+    print(f"{attempts} attempts on {thread_count} threads in {elapsed:.2f}s "
+          f"({attempts / elapsed:.1f} bookings/sec attempted, {outcomes['booked'] / elapsed:.1f}/sec committed)")
+    print(f"booked {outcomes['booked']}, rejected {outcomes['rejected']}, errors {outcomes['errors']}")
+    print(f"peak occupancy {peak}/{CAPACITY} (ledger says {ledger_peak})")
+
+    if peak > CAPACITY or peak != ledger_peak:
+        print("FAIL: hostel overbooked or ledger out of step")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 200, args[1] if len(args) > 1 else 16)
@@ -10,6 +10,5 @@ pip install -r requirements.txt
 echo "Build completed successfully!"
 
 
-# If you have database migrations, uncomment these:
-#echo "Running database migrations..."
-#flask db upgrade
\ No newline at end of file
+echo "Running database migrations..."
+FLASK_APP=run.py flask db upgrade
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""baseline schema
+
+Revision ID: 1d90b124636e
+Revises: 
+Create Date: 2026-10-16 23:20:52.534122
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d90b124636e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created before migrations were introduced already hold these tables; only create what is missing
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'amenities' not in existing:
+        op.create_table('amenities',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('icon', sa.String(length=50), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.String(length=50), nullable=True),
+        sa.Column('name', sa.String(length=200), nullable=True),
+        sa.Column('phone_number', sa.String(length=20), nullable=True),
+        sa.Column('profile_image', sa.String(length=500), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('email_verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+        )
+    if 'landlords' not in existing:
+        op.create_table('landlords',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('business_name', sa.String(length=200), nullable=True),
+        sa.Column('contact_phone', sa.String(length=20), nullable=True),
+        sa.Column('contact_email', sa.String(length=255), nullable=True),
+        sa.Column('address', sa.Text(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+        sa.Column('review_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+        )
+    if 'hostels' not in existing:
+        op.create_table('hostels',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('location', sa.String(length=150), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('room_type', sa.String(length=50), nullable=False),
+        sa.Column('landlord_id', sa.Integer(), nullable=False),
+        sa.Column('images', sa.JSON(), nullable=True),
+        sa.Column('amenities', sa.JSON(), nullable=True),
+        sa.Column('features', sa.JSON(), nullable=True),
+        sa.Column('availability', sa.JSON(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('is_featured', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['landlord_id'], ['landlords.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'bookings' not in existing:
+        op.create_table('bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('hostel_id', sa.Integer(), nullable=False),
+        sa.Column('check_in', sa.Date(), nullable=False),
+        sa.Column('check_out', sa.Date(), nullable=False),
+        sa.Column('guests', sa.Integer(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('booking_date', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hostel_id'], ['hostels.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'reviews' not in existing:
+        op.create_table('reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('hostel_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hostel_id'], ['hostels.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('reviews')
+    op.drop_table('bookings')
+    op.drop_table('hostels')
+    op.drop_table('landlords')
+    op.drop_table('users')
+    op.drop_table('amenities')
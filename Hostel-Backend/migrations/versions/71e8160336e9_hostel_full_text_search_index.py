@@ -0,0 +1,34 @@
+"""hostel full text search index
+
+Revision ID: 71e8160336e9
+Revises: ad35fc1688b3
+Create Date: 2026-10-16 23:22:33.147046
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '71e8160336e9'
+down_revision = 'ad35fc1688b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres only; the expression must stay identical to hostel_search_document() for the planner to use it
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "CREATE INDEX ix_hostels_search_document ON hostels USING gin (("
+        "((setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(location, '')), 'B')) || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(features ->> 'university', '')), 'B')) || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'C')))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_hostels_search_document")
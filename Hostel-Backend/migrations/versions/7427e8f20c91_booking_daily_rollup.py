@@ -0,0 +1,83 @@
+"""booking daily rollup
+
+Revision ID: 7427e8f20c91
+Revises: f40e1fd7517b
+Create Date: 2026-10-16 23:23:56.863876
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7427e8f20c91'
+down_revision = 'f40e1fd7517b'
+branch_labels = None
+depends_on = None
+
+
+# Statuses whose total price counts as revenue (REVENUE_STATUSES when this revision was written)
+REVENUE_STATUSES = ('confirmed', 'completed')
+
+bookings = sa.table(
+    'bookings',
+    sa.column('hostel_id', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+    sa.column('total_price', sa.Float),
+    sa.column('status', sa.String)
+)
+
+hostels = sa.table(
+    'hostels',
+    sa.column('id', sa.Integer),
+    sa.column('landlord_id', sa.Integer)
+)
+
+
+def upgrade():
+    booking_daily_rollup = op.create_table('booking_daily_rollup',
+    sa.Column('hostel_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('landlord_id', sa.Integer(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('cancellations', sa.Integer(), nullable=False),
+    sa.Column('confirmed', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['hostel_id'], ['hostels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['landlord_id'], ['landlords.id'], ),
+    sa.PrimaryKeyConstraint('hostel_id', 'day')
+    )
+    op.create_index('ix_booking_daily_rollup_landlord_day', 'booking_daily_rollup', ['landlord_id', 'day'], unique=False)
+    op.create_index('ix_bookings_hostel_status_check_out', 'bookings', ['hostel_id', 'status', 'check_out'], unique=False)
+
+    # Fill the rollup from the bookings already stored (same counters as `flask rebuild-booking-rollup`)
+    totals = {}
+    rows = op.get_bind().execute(
+        sa.select(bookings.c.hostel_id, hostels.c.landlord_id, bookings.c.created_at,
+                  bookings.c.total_price, bookings.c.status)
+        .join(hostels, hostels.c.id == bookings.c.hostel_id)
+        .where(bookings.c.created_at.isnot(None))
+    )
+    for hostel_id, landlord_id, created_at, total_price, status in rows:
+        row = totals.setdefault((hostel_id, created_at.date()), {
+            'landlord_id': landlord_id, 'bookings': 0, 'revenue': 0.0,
+            'cancellations': 0, 'confirmed': 0, 'completed': 0
+        })
+        row['bookings'] += 1
+        if status in REVENUE_STATUSES:
+            row['revenue'] += total_price or 0.0
+        row['cancellations'] += int(status == 'cancelled')
+        row['confirmed'] += int(status == 'confirmed')
+        row['completed'] += int(status == 'completed')
+
+    if totals:
+        op.bulk_insert(booking_daily_rollup, [
+            dict(row, hostel_id=hostel_id, day=day) for (hostel_id, day), row in totals.items()
+        ])
+
+
+def downgrade():
+    op.drop_index('ix_bookings_hostel_status_check_out', table_name='bookings')
+    op.drop_index('ix_booking_daily_rollup_landlord_day', table_name='booking_daily_rollup')
+    op.drop_table('booking_daily_rollup')
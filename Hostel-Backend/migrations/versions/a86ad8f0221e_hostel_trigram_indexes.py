@@ -0,0 +1,33 @@
+"""hostel trigram indexes
+
+Revision ID: a86ad8f0221e
+Revises: 71e8160336e9
+Create Date: 2026-10-16 23:22:35.479227
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a86ad8f0221e'
+down_revision = '71e8160336e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres only; these serve the similarity matching of hostel_trigram_fields()
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_hostels_name_trgm ON hostels USING gin (name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_hostels_location_trgm ON hostels USING gin (location gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_hostels_university_trgm ON hostels USING gin ((features ->> 'university') gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_hostels_university_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_hostels_location_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_hostels_name_trgm")
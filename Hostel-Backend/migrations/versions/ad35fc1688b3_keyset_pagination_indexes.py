@@ -0,0 +1,29 @@
+"""keyset pagination indexes
+
+Revision ID: ad35fc1688b3
+Revises: f60f1194dece
+Create Date: 2026-10-16 23:22:31.090930
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'ad35fc1688b3'
+down_revision = 'f60f1194dece'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_hostels_created_at_id', 'hostels', ['created_at', 'id'], unique=False)
+    op.create_index('ix_hostels_price_id', 'hostels', ['price', 'id'], unique=False)
+    op.create_index('ix_bookings_user_created_at_id', 'bookings', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_hostel_created_at_id', 'reviews', ['hostel_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_reviews_hostel_created_at_id', table_name='reviews')
+    op.drop_index('ix_bookings_user_created_at_id', table_name='bookings')
+    op.drop_index('ix_hostels_price_id', table_name='hostels')
+    op.drop_index('ix_hostels_created_at_id', table_name='hostels')
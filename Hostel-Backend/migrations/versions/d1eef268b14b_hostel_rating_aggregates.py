@@ -0,0 +1,43 @@
+"""hostel rating aggregates
+
+Revision ID: d1eef268b14b
+Revises: 1d90b124636e
+Create Date: 2026-10-16 23:20:54.259621
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1eef268b14b'
+down_revision = '1d90b124636e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('hostels', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('review_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_avg', sa.Float(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_hostels_rating_avg'), ['rating_avg'], unique=False)
+
+    # Backfill from the reviews already stored (same figures as `flask reconcile-ratings`)
+    op.execute(
+        "UPDATE hostels SET "
+        "rating_sum = (SELECT COALESCE(SUM(reviews.rating), 0) FROM reviews WHERE reviews.hostel_id = hostels.id), "
+        "review_count = (SELECT COUNT(reviews.id) FROM reviews WHERE reviews.hostel_id = hostels.id)"
+    )
+    op.execute(
+        "UPDATE hostels SET rating_avg = CASE WHEN review_count > 0 "
+        "THEN rating_sum * 1.0 / review_count ELSE NULL END"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('hostels', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_hostels_rating_avg'))
+        batch_op.drop_column('rating_avg')
+        batch_op.drop_column('review_count')
+        batch_op.drop_column('rating_sum')
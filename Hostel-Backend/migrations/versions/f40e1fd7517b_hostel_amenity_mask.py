@@ -0,0 +1,68 @@
+"""hostel amenity mask
+
+Revision ID: f40e1fd7517b
+Revises: a86ad8f0221e
+Create Date: 2026-10-16 23:23:53.989765
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f40e1fd7517b'
+down_revision = 'a86ad8f0221e'
+branch_labels = None
+depends_on = None
+
+
+# Highest amenity id the 64-bit mask can hold (MAX_AMENITY_ID when this revision was written)
+MAX_AMENITY_ID = 63
+
+amenities = sa.table(
+    'amenities',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String)
+)
+
+hostels = sa.table(
+    'hostels',
+    sa.column('id', sa.Integer),
+    sa.column('amenities', sa.JSON),
+    sa.column('amenity_mask', sa.BigInteger)
+)
+
+
+def stored_mask(stored, name_ids):
+    """Mask of a hostel's amenities JSON (ids, names or a {key: bool} dict), as amenity_mask() computes it;
+    unknown names and ids the mask cannot hold are skipped rather than failing the upgrade"""
+    if isinstance(stored, dict):
+        stored = [key for key, value in stored.items() if value]
+
+    mask = 0
+    for value in stored or []:
+        if isinstance(value, int) or str(value).strip().isdigit():
+            amenity_id = int(value)
+        else:
+            amenity_id = name_ids.get(str(value).strip().lower())
+        if amenity_id is not None and 1 <= amenity_id <= MAX_AMENITY_ID:
+            mask |= 1 << (amenity_id - 1)
+    return mask
+
+
+def upgrade():
+    with op.batch_alter_table('hostels', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('amenity_mask', sa.BigInteger(), server_default='0', nullable=False))
+
+    # Backfill from the amenities JSON (same masks as `flask backfill-amenity-masks`)
+    bind = op.get_bind()
+    name_ids = {name.lower(): amenity_id for amenity_id, name in bind.execute(sa.select(amenities.c.id, amenities.c.name))}
+    for hostel_id, stored in bind.execute(sa.select(hostels.c.id, hostels.c.amenities)).all():
+        mask = stored_mask(stored, name_ids)
+        if mask:
+            bind.execute(hostels.update().where(hostels.c.id == hostel_id).values(amenity_mask=mask))
+
+
+def downgrade():
+    with op.batch_alter_table('hostels', schema=None) as batch_op:
+        batch_op.drop_column('amenity_mask')
@@ -0,0 +1,60 @@
+"""hostel occupancy ledger
+
+Revision ID: f60f1194dece
+Revises: d1eef268b14b
+Create Date: 2026-10-16 23:22:02.106037
+
+"""
+from datetime import timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f60f1194dece'
+down_revision = 'd1eef268b14b'
+branch_labels = None
+depends_on = None
+
+# Booking statuses that hold beds (ACTIVE_BOOKING_STATUSES when this revision was written)
+ACTIVE_BOOKING_STATUSES = ('confirmed', 'upcoming')
+
+bookings = sa.table(
+    'bookings',
+    sa.column('hostel_id', sa.Integer),
+    sa.column('check_in', sa.Date),
+    sa.column('check_out', sa.Date),
+    sa.column('guests', sa.Integer),
+    sa.column('status', sa.String)
+)
+
+
+def upgrade():
+    hostel_occupancy = op.create_table('hostel_occupancy',
+    sa.Column('hostel_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('guests_booked', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['hostel_id'], ['hostels.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('hostel_id', 'day')
+    )
+
+    # Fill the ledger from the bookings already stored (same nights as `flask rebuild-occupancy`)
+    totals = {}
+    rows = op.get_bind().execute(
+        sa.select(bookings.c.hostel_id, bookings.c.check_in, bookings.c.check_out, bookings.c.guests)
+        .where(bookings.c.status.in_(ACTIVE_BOOKING_STATUSES))
+    )
+    for hostel_id, check_in, check_out, guests in rows:
+        for offset in range((check_out - check_in).days):
+            night = check_in + timedelta(days=offset)
+            totals[(hostel_id, night)] = totals.get((hostel_id, night), 0) + (guests or 0)
+
+    if totals:
+        op.bulk_insert(hostel_occupancy, [
+            {'hostel_id': hostel_id, 'day': night, 'guests_booked': guests}
+            for (hostel_id, night), guests in totals.items()
+        ])
+
+
+def downgrade():
+    op.drop_table('hostel_occupancy')
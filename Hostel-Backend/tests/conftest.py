@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Never fall back to the configured production database
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.models.landlord import Landlord
+from app.models.hostel import Hostel
+from app.services.analytics_cache import analytics_cache
+from app.services.local_index import reset_local_indexes
+from app.services.result_cache import result_cache
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        db.create_all()
+        # Per-process indexes and caches outlive the app, so start every test from an empty database view
+        reset_local_indexes()
+        result_cache.clear()
+        analytics_cache.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """Like app, on a file database: an in-memory SQLite database is private to each thread's connection,
+    so tests that run work on other threads need this one"""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        db.create_all()
+        reset_local_indexes()
+        result_cache.clear()
+        analytics_cache.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def landlord(app):
+    landlord = Landlord(user_id=1, business_name="Test Estates")
+    db.session.add(landlord)
+    db.session.commit()
+    return landlord
+
+
+@pytest.fixture
+def make_hostel(landlord):
+    """Factory adding one committed hostel; keyword arguments override the defaults"""
+    def make(**values):
+        hostel = Hostel(**{
+            "name": "Test Hostel", "location": "Juja, Kiambu", "price": 6000, "capacity": 4,
+            "room_type": "single", "landlord_id": landlord.id, **values
+        })
+        db.session.add(hostel)
+        db.session.commit()
+        return hostel
+    return make
@@ -0,0 +1,138 @@
+from datetime import date, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.booking_rollup import BookingDailyRollup
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService, _shift_month
+from app.services.booking_service import BookingService
+from app.services.occupancy_matrix import OCCUPYING_STATUSES
+from app.services.payment_service import PaymentService
+
+
+def count_statements(function):
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        result = function()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return len(statements), result
+
+
+def test_dashboard_runs_two_queries(landlord, make_hostel):
+    busy = make_hostel(name='Busy', capacity=4)
+    quiet = make_hostel(name='Quiet', capacity=2)
+    make_hostel(name='Empty')
+    today = date.today()
+    BookingService.create_booking(2, busy.id, today.isoformat(), (today + timedelta(days=10)).isoformat(), 2)
+    BookingService.create_booking(3, quiet.id, today.isoformat(), (today + timedelta(days=3)).isoformat(), 1)
+
+    # Older months of history straight into the rollup
+    year, month = _shift_month(today.year, today.month, -2)
+    db.session.add_all([
+        BookingDailyRollup(hostel_id=busy.id, day=date(year, month, 5), landlord_id=landlord.id,
+                           bookings=3, revenue=9000.0, confirmed=1, completed=1),
+        BookingDailyRollup(hostel_id=quiet.id, day=date(year, month, 9), landlord_id=landlord.id,
+                           bookings=1, revenue=4000.0, completed=1),
+    ])
+    db.session.commit()
+    landlord.id  # Loaded before counting, as the route's landlord lookup does
+
+    statements, dashboard = count_statements(lambda: AnalyticsService.landlord_dashboard(landlord, 3))
+
+    assert statements == 2
+    assert dashboard['totalHostels'] == 3
+    assert dashboard['totalBookings'] == 6
+    assert dashboard['activeBookings'] == 2
+    assert dashboard['totalRevenue'] == 9000 + 4000 + busy.price * 2 + quiet.price
+    assert [point['bookings'] for point in dashboard['monthlyTrend']] == [4, 0, 2]
+    assert [point['revenue'] for point in dashboard['monthlyTrend']] == [13000, 0, busy.price * 2 + quiet.price]
+    assert dashboard['monthlyRevenue'] == busy.price * 2 + quiet.price
+    assert dashboard['topHostel'] == {'name': 'Busy', 'revenue': 9000 + busy.price * 2, 'bookings': 3}
+    assert dashboard['occupancyRate'] == AnalyticsService.landlord_occupancy(landlord)['occupancyRate']
+
+
+def test_occupancy_matches_a_per_night_count(landlord, make_hostel):
+    hostels = [make_hostel(name='Small', capacity=2), make_hostel(name='Large', capacity=5), make_hostel(name='Empty')]
+    start = date(2026, 2, 1)
+    end = start + timedelta(days=20)
+
+    def night(offset):
+        return start + timedelta(days=offset)
+
+    # Stays crossing both window edges, back-to-back stays, an overbooked night and statuses that hold no beds
+    stays = [
+        (0, -5, 3, 1, 'completed'), (0, 3, 6, 2, 'completed'), (0, 5, 9, 1, 'confirmed'), (0, 15, 30, 1, 'upcoming'),
+        (1, -2, 25, 1, 'confirmed'), (1, 4, 8, 3, 'completed'), (1, 6, 7, 4, 'confirmed'), (1, 10, 12, 2, 'cancelled'),
+        (1, 12, 14, 2, 'refunded'), (1, 18, 19, 5, 'no_show'),
+    ]
+    db.session.add_all([
+        Booking(user_id=2, hostel_id=hostels[row].id, check_in=night(first), check_out=night(last), guests=guests,
+                total_price=1000, status=status)
+        for row, first, last, guests, status in stays
+    ])
+    db.session.commit()
+
+    occupancy = AnalyticsService.landlord_occupancy(landlord, start, end)
+
+    # The database's own count of guests staying each night, capped at capacity as the matrix is
+    taken = {}
+    for offset in range(20):
+        for hostel in hostels:
+            guests = db.session.query(func.coalesce(func.sum(Booking.guests), 0)).filter(
+                Booking.hostel_id == hostel.id,
+                Booking.status.in_(OCCUPYING_STATUSES),
+                Booking.check_in <= night(offset),
+                Booking.check_out > night(offset)
+            ).scalar()
+            taken[hostel.id, offset] = min(guests, hostel.capacity)
+
+    assert [day['date'] for day in occupancy['daily']] == [night(offset).isoformat() for offset in range(20)]
+    assert [day['guests'] for day in occupancy['daily']] == [
+        sum(taken[hostel.id, offset] for hostel in hostels) for offset in range(20)
+    ]
+    assert [hostel['bedNights'] for hostel in occupancy['hostels']] == [
+        sum(taken[hostel.id, offset] for offset in range(20)) for hostel in hostels
+    ]
+    capacity = sum(hostel.capacity for hostel in hostels)
+    assert occupancy['occupancyRate'] == round(sum(taken.values()) * 100 / (capacity * 20), 1)
+    # Night 6 of the large hostel has 8 guests booked into 5 beds
+    assert taken[hostels[1].id, 6] == 5
+
+
+def test_dashboard_etag_revalidates_until_bookings_change(client, landlord, make_hostel):
+    user = User(id=landlord.user_id, email='landlord@example.com', password_hash='-', role='landlord')
+    db.session.add(user)
+    db.session.commit()
+    hostel = make_hostel()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
+    check_in = (date.today() + timedelta(days=5)).isoformat()
+    check_out = (date.today() + timedelta(days=35)).isoformat()
+
+    def revalidate(etag):
+        return client.get('/analytics/landlord', headers={**headers, 'If-None-Match': f'"{etag}"'})
+
+    first = client.get('/analytics/landlord', headers=headers)
+    assert first.status_code == 200
+    etag = first.get_etag()[0]
+    assert revalidate(etag).status_code == 304
+
+    booking = BookingService.create_booking(2, hostel.id, check_in, check_out, 1)
+    booked = revalidate(etag)
+    assert booked.status_code == 200
+    assert booked.json['totalBookings'] == 1
+    booked_etag = booked.get_etag()[0]
+    assert booked_etag != etag
+    assert revalidate(booked_etag).status_code == 304
+
+    assert PaymentService.process_refund(booking['id'], 'Plans changed')['success']
+    refunded = revalidate(booked_etag)
+    assert refunded.status_code == 200
+    assert refunded.json['totalRevenue'] == 0
+    assert refunded.get_etag()[0] not in (etag, booked_etag)
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+import pytest
+from app.services.booking_service import BookingService
+
+START = date.today() + timedelta(days=10)
+
+
+def day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+
+@pytest.mark.parametrize('item, error', [
+    ({'check_in': day(0), 'check_out': day(0)}, 'Check-out date must be after check-in date'),
+    ({'check_in': day(3), 'check_out': day(1)}, 'Check-out date must be after check-in date'),
+    ({'check_in': day(0), 'check_out': day(2), 'guests': 0}, 'Guests must be at least 1'),
+    ({'check_in': day(0), 'check_out': day(2), 'guests': -2}, 'Guests must be at least 1'),
+    ({'check_in': 'soon', 'check_out': day(2)}, 'Invalid hostel_id, dates or guests'),
+])
+def test_bad_items_are_rejected_individually(client, make_hostel, item, error):
+    hostel = make_hostel()
+    good = {'hostel_id': hostel.id, 'check_in': day(0), 'check_out': day(2)}
+    response = client.post('/bookings/availability', json={'items': [{'hostel_id': hostel.id, **item}, good]})
+    assert response.status_code == 200
+    bad_result, good_result = response.json['results']
+    assert bad_result['available'] is False
+    assert bad_result['error'] == error
+    assert good_result['available'] is True
+    assert 'error' not in good_result
+
+
+def test_bulk_matches_single_checks(make_hostel):
+    small = make_hostel(name='Small', capacity=3)
+    large = make_hostel(name='Large', capacity=4)
+    for first, last, guests in ((0, 4, 2), (2, 6, 1)):
+        BookingService.create_booking(2, small.id, day(first), day(last), guests)
+        BookingService.create_booking(2, large.id, day(first), day(last), guests)
+
+    items = [
+        {'hostel_id': hostel.id, 'check_in': day(first), 'check_out': day(last), 'guests': guests}
+        for hostel in (small, large)
+        for first, last in ((0, 1), (3, 5), (4, 8), (6, 9), (0, 10))
+        for guests in (1, 2, 3)
+    ]
+    results = BookingService.check_availability_bulk(items)
+
+    assert [result['available'] for result in results] == [
+        BookingService.check_availability(item['hostel_id'], date.fromisoformat(item['check_in']),
+                                          date.fromisoformat(item['check_out']), item['guests'])
+        for item in items
+    ]
+    assert any(result['available'] for result in results)
+    assert not all(result['available'] for result in results)
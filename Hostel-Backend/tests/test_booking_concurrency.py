@@ -0,0 +1,61 @@
+import threading
+from datetime import date, timedelta
+import pytest
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.models.landlord import Landlord
+from app.services.booking_service import BookingService
+from app.services.occupancy_service import OccupancyService
+
+CAPACITY = 5
+THREADS = 8
+PER_THREAD = 4
+
+
+@pytest.fixture
+def hostel_id(file_app):
+    landlord = Landlord(user_id=1)
+    db.session.add(landlord)
+    db.session.flush()
+    hostel = Hostel(name='Busy Hostel', location='Juja', price=6000, capacity=CAPACITY,
+                    room_type='single', landlord_id=landlord.id)
+    db.session.add(hostel)
+    db.session.commit()
+    return hostel.id
+
+
+def test_concurrent_bookings_never_overbook(file_app, hostel_id):
+    check_in = date.today() + timedelta(days=7)
+    start = threading.Barrier(THREADS)
+    errors = []
+
+    def worker(offset):
+        with file_app.app_context():
+            start.wait()
+            for attempt in range(PER_THREAD):
+                # Stays starting on different days, all sharing nights 2-4, so at most CAPACITY can be confirmed
+                first = check_in + timedelta(days=(offset + attempt) % 3)
+                try:
+                    BookingService.create_booking(2, hostel_id, first.isoformat(),
+                                                  (first + timedelta(days=5)).isoformat(), 1)
+                except ValueError:
+                    pass  # full for those nights
+                except Exception as e:
+                    errors.append(e)
+            db.session.remove()
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    end = check_in + timedelta(days=10)
+    bookings = Booking.query.filter_by(hostel_id=hostel_id, status='confirmed').all()
+    peak = max(sum(booking.guests for booking in bookings if booking.check_in <= night < booking.check_out)
+               for night in OccupancyService.booking_nights(check_in, end))
+    assert len(bookings) == CAPACITY
+    assert peak == CAPACITY
+    assert OccupancyService.peak_guests(hostel_id, check_in, end) == peak
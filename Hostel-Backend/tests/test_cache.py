@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from app.extensions import db
+from app.models.hostel import Hostel
+from app.services import local_index
+from app.services.local_index import hostel_deleted, hostel_saved
+from app.services.result_cache import cached_page
+from app.services.search_service import CACHED_POPULAR_LOCATIONS, SearchService, metadata_cache
+from app.utils.cache import StaleWhileRevalidateCache, single_flight
+
+
+def wait_for_refresh(cache):
+    deadline = time.monotonic() + 5
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_failed_background_refresh_is_logged_and_stale_value_served(app, caplog):
+    version = [1]
+    cache = StaleWhileRevalidateCache(lambda: version[0])
+    assert cache.get('key', lambda: 'first') == 'first'
+
+    def broken():
+        raise RuntimeError('database went away')
+
+    version[0] = 2
+    with caplog.at_level(logging.ERROR):
+        assert cache.get('key', broken) == 'first'
+        wait_for_refresh(cache)
+
+    assert "Background refresh of 'key' failed" in caplog.text
+    assert 'database went away' in caplog.text
+    assert cache.get('key', lambda: 'second') == 'first'
+    wait_for_refresh(cache)
+    assert cache.get('key', lambda: 'third') == 'second'
+
+
+def test_cached_page_is_invalidated_by_local_hostel_writes(make_hostel, monkeypatch):
+    # Only this worker's writes may move the version during the test
+    monkeypatch.setattr(local_index, 'REFRESH_INTERVAL_SECONDS', 3600)
+    hostel = make_hostel()
+    runs = []
+
+    def page():
+        def compute():
+            runs.append(1)
+            return {'ids': [hostel.id]}
+        cached_page('test', {'sort_by': 'newest'}, 1, 20, compute)
+        return len(runs)
+
+    assert page() == 1
+    assert page() == 1
+
+    hostel.price = 6500
+    db.session.commit()
+    hostel_saved(hostel)
+    assert page() == 2
+    assert page() == 2
+
+    hostel_deleted(hostel.id)
+    assert page() == 3
+    assert page() == 3
+
+
+def test_concurrent_popular_location_misses_run_one_query(file_app, monkeypatch):
+    for location in ('Juja', 'Juja', 'Ruiru'):
+        db.session.add(Hostel(name='Hostel', location=location, price=6000, capacity=4, room_type='single',
+                              landlord_id=1))
+    db.session.commit()
+    metadata_cache.clear()
+
+    def coalesced():
+        return single_flight.stats()['by_name'].get('popular_locations', {}).get('coalesced', 0)
+
+    already_coalesced = coalesced()
+    original = SearchService._compute_popular_locations
+    calls = []
+
+    def slow_compute(limit=CACHED_POPULAR_LOCATIONS):
+        calls.append(limit)
+        # Hold the query open until the other request is waiting on it
+        deadline = time.monotonic() + 5
+        while coalesced() == already_coalesced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return original(limit)
+
+    monkeypatch.setattr(SearchService, '_compute_popular_locations', staticmethod(slow_compute))
+    results = []
+
+    def request():
+        with file_app.app_context():
+            results.append(SearchService.get_popular_locations())
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [CACHED_POPULAR_LOCATIONS]
+    assert coalesced() == already_coalesced + 1
+    assert results[0] == results[1] == [
+        {'location': 'Juja', 'hostel_count': 2}, {'location': 'Ruiru', 'hostel_count': 1}
+    ]
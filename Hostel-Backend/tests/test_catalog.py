@@ -0,0 +1,97 @@
+from datetime import date
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.services import local_index
+from app.services.hostel_catalog import HostelCatalog, hostel_catalog
+from app.services.review_service import ReviewService
+from app.services.search_service import SearchService
+
+
+def stay(user_id, hostel):
+    db.session.add(Booking(user_id=user_id, hostel_id=hostel.id, check_in=date(2026, 1, 1),
+                           check_out=date(2026, 1, 5), total_price=hostel.price, status='completed'))
+    db.session.commit()
+
+
+def rating_order():
+    return [hostel['name'] for hostel in SearchService.search_hostels({'sort_by': 'rating'})['hostels']]
+
+
+def test_reviews_reorder_the_rating_sort(make_hostel, monkeypatch):
+    # No table re-check during the test: the review writes alone must refresh the catalog
+    monkeypatch.setattr(local_index, 'REFRESH_INTERVAL_SECONDS', 3600)
+    first = make_hostel(name='First')
+    second = make_hostel(name='Second')
+    for user_id in (1, 2):
+        stay(user_id, first)
+        stay(user_id, second)
+    first_review = ReviewService.create_review(1, first.id, 3)
+    ReviewService.create_review(1, second.id, 2)
+    assert rating_order() == ['First', 'Second']
+
+    ReviewService.create_review(2, second.id, 5)
+    assert rating_order() == ['Second', 'First']
+
+    ReviewService.update_review(first_review['id'], 1, rating=5)
+    assert rating_order() == ['First', 'Second']
+
+    ReviewService.delete_review(first_review['id'], 1)
+    assert rating_order() == ['Second', 'First']
+
+
+def warm_every_index():
+    for index in local_index._indexes:
+        index.ensure_fresh()
+
+
+def test_review_touches_only_the_catalog_rating_order(make_hostel, monkeypatch):
+    hostels = [make_hostel(name=f'Hostel {number}', price=5000 + number) for number in range(6)]
+    for hostel in hostels:
+        stay(1, hostel)
+    warm_every_index()
+    signature = local_index.table_signature()
+    newest = hostel_catalog._orders['newest']
+
+    def no_reload(self):
+        pytest.fail(f'{type(self).__name__} reloaded after a review')
+
+    def no_rebuild(self, rows):
+        pytest.fail(f'{type(self).__name__} rebuilt after a review')
+
+    for index in local_index._indexes:
+        monkeypatch.setattr(type(index), 'load', no_reload)
+        monkeypatch.setattr(type(index), 'build', no_rebuild)
+    monkeypatch.setattr(local_index, 'REFRESH_INTERVAL_SECONDS', 0)
+
+    reviews = [ReviewService.create_review(1, hostel.id, rating) for rating, hostel in zip((2, 5, 3, 5, 4), hostels)]
+    ReviewService.update_review(reviews[4]['id'], 1, rating=1)
+    ReviewService.delete_review(reviews[2]['id'], 1)
+    warm_every_index()
+
+    assert local_index.table_signature() == signature
+    assert hostel_catalog._orders['newest'] is newest
+    assert rating_order() == ['Hostel 1', 'Hostel 3', 'Hostel 0', 'Hostel 4', 'Hostel 2', 'Hostel 5']
+    # The patched order is the one a rebuild would sort
+    assert np.array_equal(hostel_catalog._orders['rating'], np.argsort(-hostel_catalog._ratings, kind='stable'))
+
+
+def test_catalog_picks_up_ratings_written_by_other_workers(make_hostel, monkeypatch):
+    low = make_hostel(name='Low')
+    high = make_hostel(name='High')
+    for hostel, rating in ((low, 2), (high, 4)):
+        stay(1, hostel)
+        ReviewService.create_review(1, hostel.id, rating)
+    assert rating_order() == ['High', 'Low']
+
+    # Another worker's review: only the aggregates change, and nothing in this process is told
+    db.session.execute(sa.update(Hostel).where(Hostel.id == low.id).values(
+        rating_sum=7, review_count=1, rating_avg=7.0, updated_at=Hostel.updated_at
+    ))
+    db.session.commit()
+    monkeypatch.setattr(local_index, 'REFRESH_INTERVAL_SECONDS', 0)
+    monkeypatch.setattr(HostelCatalog, 'build', lambda self, rows: pytest.fail('catalog rebuilt for a rating change'))
+    assert rating_order() == ['Low', 'High']
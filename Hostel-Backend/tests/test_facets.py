@@ -0,0 +1,56 @@
+import pytest
+import sqlalchemy as sa
+from app.extensions import db
+from app.models.hostel import Hostel
+from app.services.search_service import PRICE_FACET_EDGES
+
+ROOM_TYPES = ('single', 'double', 'bedsitter')
+FILTER = "price >= 6000 AND room_type != 'bedsitter'"
+
+
+@pytest.fixture
+def listings(landlord):
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": f"Hostel {i}", "location": "Juja, Kiambu" if i % 3 else "Ruiru", "price": 4000 + 1700 * (i % 13),
+         "capacity": 4, "room_type": ROOM_TYPES[i % 3], "landlord_id": landlord.id,
+         "amenity_mask": (1 << (i % 4)) | (4 if i % 5 == 0 else 0),
+         "is_verified": i % 2 == 0, "is_featured": i % 7 == 0}
+        for i in range(60)
+    ])
+    db.session.commit()
+
+
+def sql_counts(column_sql):
+    """{value: count} over the hostels passing FILTER, counted by the database itself"""
+    return dict(db.session.execute(sa.text(
+        f"SELECT {column_sql} AS value, COUNT(*) FROM hostels WHERE {FILTER} GROUP BY value"
+    )).all())
+
+
+def test_facet_counts_match_sql(client, listings):
+    response = client.get('/search/hostels?min_price=6000&room_type=single&room_type=double'
+                          '&facets=room_type,price,amenities,verified,featured')
+    assert response.status_code == 200
+    facets = response.json['facets']
+
+    assert {item['value']: item['count'] for item in facets['room_type']} == sql_counts('room_type')
+
+    bands = ' '.join(f"WHEN price >= {edge} THEN {band}" for band, edge in reversed(list(enumerate(PRICE_FACET_EDGES))))
+    by_band = sql_counts(f"CASE {bands} END")
+    assert [band['count'] for band in facets['price']] == [by_band.get(band, 0) for band in range(len(PRICE_FACET_EDGES))]
+
+    amenities = {item['value']: item['count'] for item in facets['amenities']}
+    expected = {bit + 1: sql_counts(f"(amenity_mask >> {bit}) & 1").get(1, 0) for bit in range(63)}
+    assert amenities == {amenity_id: count for amenity_id, count in expected.items() if count}
+
+    verified = sql_counts('is_verified')
+    assert facets['verified'] == {'true': verified.get(1, 0), 'false': verified.get(0, 0)}
+    featured = sql_counts('is_featured')
+    assert facets['featured'] == {'true': featured.get(1, 0), 'false': featured.get(0, 0)}
+    assert response.json['total'] == sum(verified.values())
+
+
+def test_unknown_facet_is_a_client_error(client, listings):
+    response = client.get('/search/hostels?facets=room_type,bogus')
+    assert response.status_code == 400
+    assert 'bogus' in response.json['message']
@@ -0,0 +1,20 @@
+from datetime import date, timedelta
+from app.models.booking_rollup import BookingDailyRollup
+from app.models.occupancy import HostelOccupancy
+from app.services.booking_service import BookingService
+from app.services.hostel_service import HostelService
+
+
+def test_delete_hostel_removes_its_ledger_and_rollup_rows(landlord, make_hostel):
+    hostel = make_hostel()
+    kept = make_hostel(name='Kept')
+    check_in = date.today() + timedelta(days=3)
+    for target in (hostel, kept):
+        BookingService.create_booking(2, target.id, check_in.isoformat(), (check_in + timedelta(days=4)).isoformat(), 1)
+
+    HostelService.delete_hostel(hostel.id, landlord.user_id)
+
+    assert HostelOccupancy.query.filter_by(hostel_id=hostel.id).count() == 0
+    assert BookingDailyRollup.query.filter_by(hostel_id=hostel.id).count() == 0
+    assert HostelOccupancy.query.filter_by(hostel_id=kept.id).count() == 4
+    assert BookingDailyRollup.query.filter_by(hostel_id=kept.id).count() == 1
@@ -0,0 +1,76 @@
+from datetime import datetime
+import pytest
+from app.extensions import db
+from app.models.hostel import Hostel
+from app.models.review import Review
+
+HOSTELS = 23
+REVIEWS = 13
+# Few distinct sort keys, so most pages end inside a run of ties
+STAMPS = [datetime(2026, 1, day, 12, 0) for day in (1, 2, 3)]
+
+
+@pytest.fixture
+def hostel_ids(landlord):
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": f"Hostel {i}", "location": "Juja, Kiambu", "price": 5000 + 500 * (i % 4), "capacity": 4,
+         "room_type": "single", "landlord_id": landlord.id, "created_at": STAMPS[i % len(STAMPS)]}
+        for i in range(HOSTELS)
+    ])
+    db.session.commit()
+    return sorted(row.id for row in db.session.query(Hostel.id))
+
+
+def walk(client, url, items_key):
+    """Every item id returned while following next_cursor from the first page"""
+    ids, cursor, pages = [], '', 0
+    while cursor is not None:
+        response = client.get(f"{url}&cursor={cursor}")
+        assert response.status_code == 200, response.json
+        body = response.json
+        ids.extend(item['id'] for item in body[items_key])
+        cursor = body['next_cursor']
+        pages += 1
+        assert pages <= 50, 'cursor never ran out'
+    return ids
+
+
+@pytest.mark.parametrize('url', [
+    '/hostels/?per_page=5',
+    '/hostels/?per_page=5&sort_by=price_asc',
+    '/hostels/?per_page=4&sort_by=price_desc',
+    '/search/hostels?per_page=5',
+    '/search/hostels?per_page=4&sort_by=price_asc',
+    '/search/hostels?per_page=3&sort_by=price_desc&q=hostel',
+])
+def test_hostel_cursors_return_each_row_once(client, hostel_ids, url):
+    ids = walk(client, url, 'hostels')
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == hostel_ids
+
+    # Pages follow the advertised order: the sort key never goes backwards across page boundaries
+    hostels = {hostel.id: hostel for hostel in Hostel.query.all()}
+    if 'price_asc' in url:
+        keys = [(hostels[i].price, i) for i in ids]
+        assert keys == sorted(keys)
+    elif 'price_desc' in url:
+        keys = [(hostels[i].price, i) for i in ids]
+        assert keys == sorted(keys, reverse=True)
+    elif 'q=' not in url:
+        keys = [(hostels[i].created_at, i) for i in ids]
+        assert keys == sorted(keys, reverse=True)
+
+
+def test_review_cursor_returns_each_row_once(client, hostel_ids):
+    hostel_id = hostel_ids[0]
+    db.session.execute(Review.__table__.insert(), [
+        {"user_id": user_id, "hostel_id": hostel_id, "rating": 1 + user_id % 5,
+         "created_at": STAMPS[user_id % 2]}
+        for user_id in range(1, REVIEWS + 1)
+    ])
+    db.session.commit()
+    expected = sorted(review.id for review in Review.query.filter_by(hostel_id=hostel_id))
+
+    ids = walk(client, f'/reviews/hostel/{hostel_id}?per_page=4', 'reviews')
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == expected
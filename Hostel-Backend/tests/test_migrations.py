@@ -0,0 +1,82 @@
+import os
+import pytest
+import sqlalchemy as sa
+from flask_migrate import upgrade
+from config import Config
+from app import create_app
+from app.extensions import db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+BASELINE = '1d90b124636e'
+
+
+@pytest.fixture
+def legacy_app(tmp_path, monkeypatch):
+    """App on a file database holding only the baseline tables and no alembic_version, like a database
+    created before migrations were introduced"""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'legacy.db'}")
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=MIGRATIONS, revision=BASELINE)
+        db.session.execute(sa.text("DROP TABLE alembic_version"))
+        db.session.execute(sa.text(
+            "INSERT INTO users (id, email, password_hash) VALUES (1, 'landlord@example.com', 'x'), "
+            "(2, 'student@example.com', 'x')"
+        ))
+        db.session.execute(sa.text("INSERT INTO landlords (id, user_id) VALUES (1, 1)"))
+        db.session.execute(sa.text("INSERT INTO amenities (id, name) VALUES (2, 'WiFi')"))
+        db.session.execute(sa.text(
+            "INSERT INTO hostels (id, name, location, price, capacity, room_type, landlord_id, amenities) VALUES "
+            "(1, 'Reviewed', 'Juja', 6000, 4, 'single', 1, '[1, 3]'), "
+            "(2, 'Unreviewed', 'Juja', 7000, 4, 'single', 1, '[\"wifi\", \"Sauna\"]'), "
+            "(3, 'Bare', 'Juja', 5000, 2, 'single', 1, NULL)"
+        ))
+        db.session.execute(sa.text(
+            "INSERT INTO reviews (user_id, hostel_id, rating) VALUES (1, 1, 5), (2, 1, 2)"
+        ))
+        db.session.execute(sa.text(
+            "INSERT INTO bookings (user_id, hostel_id, check_in, check_out, guests, total_price, status, created_at) "
+            "VALUES (2, 1, '2026-01-10', '2026-01-13', 2, 6000, 'confirmed', '2026-01-02 09:30:00'), "
+            "(2, 1, '2026-01-12', '2026-01-14', 1, 6000, 'upcoming', '2026-01-02 18:00:00'), "
+            "(2, 1, '2026-01-10', '2026-01-20', 3, 6000, 'cancelled', '2026-01-03 10:00:00'), "
+            "(2, 2, '2026-02-01', '2026-02-02', 1, 7000, 'completed', '2026-01-05 12:00:00')"
+        ))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def rows(query):
+    return [tuple(row) for row in db.session.execute(sa.text(query))]
+
+
+def test_upgrade_backfills_rating_aggregates(legacy_app):
+    upgrade(directory=MIGRATIONS)
+    assert rows("SELECT id, rating_sum, review_count, rating_avg FROM hostels ORDER BY id") == [
+        (1, 7, 2, 3.5), (2, 0, 0, None), (3, 0, 0, None)
+    ]
+
+
+def test_upgrade_fills_occupancy_ledger(legacy_app):
+    upgrade(directory=MIGRATIONS)
+    assert rows("SELECT hostel_id, day, guests_booked FROM hostel_occupancy ORDER BY hostel_id, day") == [
+        (1, '2026-01-10', 2), (1, '2026-01-11', 2), (1, '2026-01-12', 3), (1, '2026-01-13', 1)
+    ]
+
+
+def test_upgrade_backfills_amenity_masks(legacy_app):
+    upgrade(directory=MIGRATIONS)
+    # Ids 1 and 3 set bits 0 and 2; names resolve through the amenities table and unknown ones are skipped
+    assert rows("SELECT id, amenity_mask FROM hostels ORDER BY id") == [(1, 5), (2, 2), (3, 0)]
+
+
+def test_upgrade_fills_booking_rollup(legacy_app):
+    upgrade(directory=MIGRATIONS)
+    assert rows(
+        "SELECT hostel_id, day, landlord_id, bookings, revenue, cancellations, confirmed, completed "
+        "FROM booking_daily_rollup ORDER BY hostel_id, day"
+    ) == [
+        (1, '2026-01-02', 1, 2, 6000.0, 0, 1, 0),
+        (1, '2026-01-03', 1, 1, 0.0, 1, 0, 0),
+        (2, '2026-01-05', 1, 1, 7000.0, 0, 0, 1)
+    ]
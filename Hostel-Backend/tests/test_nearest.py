@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.mark.parametrize('query', [
+    'lat=abc&lng=36.8',
+    'lat=-1.29&lng=east',
+    'lat=-1.29&lng=36.8&k=ten',
+    'lat=-1.29&lng=36.8&amenities=64',
+])
+def test_bad_parameters_are_client_errors(client, make_hostel, query):
+    make_hostel(latitude=-1.29, longitude=36.82)
+    response = client.get(f'/search/nearest?{query}')
+    assert response.status_code == 400
+    assert response.json['message']
+
+
+def test_nearest_orders_by_distance(client, make_hostel):
+    far = make_hostel(name='Far', latitude=-1.20, longitude=36.82)
+    near = make_hostel(name='Near', latitude=-1.29, longitude=36.82)
+    response = client.get('/search/nearest?lat=-1.29&lng=36.82&k=2')
+    assert response.status_code == 200
+    assert [hostel['id'] for hostel in response.json['hostels']] == [near.id, far.id]
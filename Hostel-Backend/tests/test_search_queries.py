@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.models.review import Review
+from app.services import local_index
+from app.services.result_cache import result_cache
+from app.services.review_service import ReviewService
+from app.services.search_service import SearchService
+
+HOSTELS = 80
+
+
+@pytest.fixture
+def listings(landlord):
+    today = date.today()
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": f"Hostel {i}", "location": "Juja, Kiambu", "price": 5000 + 100 * i, "capacity": 4,
+         "room_type": "single", "landlord_id": landlord.id, "latitude": -1.10 + i / 1000, "longitude": 37.01}
+        for i in range(HOSTELS)
+    ])
+    hostel_ids = [row.id for row in db.session.query(Hostel.id)]
+    db.session.execute(Review.__table__.insert(), [
+        {"user_id": user_id, "hostel_id": hostel_id, "rating": 1 + (hostel_id + user_id) % 5}
+        for hostel_id in hostel_ids for user_id in (1, 2)
+    ])
+    db.session.execute(Booking.__table__.insert(), [
+        {"user_id": 1, "hostel_id": hostel_id, "check_in": today, "check_out": today + timedelta(days=30),
+         "guests": 1, "total_price": 5000, "status": "confirmed"}
+        for hostel_id in hostel_ids
+    ])
+    db.session.commit()
+    ReviewService.reconcile_hostel_ratings()
+    return hostel_ids
+
+
+def recorded(function):
+    """(result, [(statement, parameters), ...]) of everything function sent to the database"""
+    executions = []
+
+    def record(*args):
+        executions.append((args[2], args[3]))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        result = function()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return result, executions
+
+
+def count_statements(function):
+    result, executions = recorded(function)
+    return len(executions), result
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'location': 'Juja'},
+    {'q': 'hostel', 'sort_by': 'rating'},
+    {'lat': '-1.10', 'lng': '37.01', 'radius': '20', 'facets': 'room_type'},
+])
+def test_query_count_does_not_grow_with_page_size(listings, monkeypatch, params):
+    # Warm the per-process indexes, then keep them from re-checking the table signature mid-test
+    SearchService.search_hostels(params, per_page=1)
+    monkeypatch.setattr(local_index, 'REFRESH_INTERVAL_SECONDS', 3600)
+
+    counts = {}
+    for per_page in (5, 50):
+        result_cache.clear()
+        db.session.expunge_all()
+        counts[per_page], result = count_statements(lambda: SearchService.search_hostels(params, per_page=per_page))
+        assert len(result['hostels']) == per_page
+
+    assert counts[5] == counts[50]
+
+
+def test_page_carries_rating_aggregates(listings):
+    result = SearchService.search_hostels({}, per_page=HOSTELS)
+    for hostel in result['hostels']:
+        ratings = [review.rating for review in Review.query.filter_by(hostel_id=hostel['id'])]
+        assert hostel['review_count'] == len(ratings)
+        assert hostel['average_rating'] == pytest.approx(sum(ratings) / len(ratings))
+        assert hostel['available_rooms'] == 3
+
+
+@pytest.mark.parametrize('params, cursor', [
+    ({'q': 'hostel'}, None),
+    ({'q': 'hostl'}, None),
+    ({'q': 'hostel', 'facets': 'room_type'}, ''),
+    ({'lat': '-1.10', 'lng': '37.01', 'radius': '20', 'sort_by': 'distance', 'facets': 'price'}, None),
+    ({'lat': '-1.10', 'lng': '37.01', 'radius': '20', 'q': 'hostel'}, ''),
+])
+def test_bind_parameters_do_not_grow_with_matches(listings, params, cursor):
+    # Every hostel matches, yet the index hits must reach SQL without one bind variable per id
+    result, executions = recorded(lambda: SearchService.search_hostels(params, per_page=5, cursor=cursor))
+    assert len(result['hostels']) == 5
+    assert max(len(parameters) for _, parameters in executions) <= 10
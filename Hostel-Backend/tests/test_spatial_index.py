@@ -0,0 +1,89 @@
+import random
+from geopy.distance import geodesic
+from app.extensions import db
+from app.models.hostel import Hostel
+from app.services.hostel_service import HostelService
+from app.services.search_service import SearchService
+from app.services.spatial_index import hostel_spatial_index
+
+CENTER = (-1.2921, 36.8219)  # Nairobi CBD
+# haversine (sphere) and geodesic (ellipsoid) disagree by up to ~0.5%, so hostels this close to the edge may differ
+EDGE_TOLERANCE = 0.01
+
+
+def seed(landlord, count=600, spread=0.4):
+    rng = random.Random(7)
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": f"Hostel {i}", "location": "Nairobi", "price": 6000, "capacity": 4, "room_type": "single",
+         "landlord_id": landlord.id,
+         "latitude": CENTER[0] + rng.uniform(-spread, spread), "longitude": CENTER[1] + rng.uniform(-spread, spread)}
+        for i in range(count)
+    ])
+    db.session.execute(Hostel.__table__.insert(), [
+        {"name": "No coordinates", "location": "Nairobi", "price": 6000, "capacity": 4, "room_type": "single",
+         "landlord_id": landlord.id}
+    ])
+    db.session.commit()
+
+
+def assert_matches_full_scan(lat, lng, radius):
+    expected = set(SearchService.hostel_ids_within_radius_full_scan(lat, lng, radius))
+    found = hostel_spatial_index.within_radius(lat, lng, radius)
+    candidates = set(hostel_spatial_index.candidates(lat, lng, radius)[0].tolist())
+
+    # The cells never miss a hostel the geodesic oracle accepts
+    assert expected <= candidates
+    for hostel_id in expected ^ set(found):
+        hostel = db.session.get(Hostel, hostel_id)
+        distance = geodesic((lat, lng), (hostel.latitude, hostel.longitude)).kilometers
+        assert abs(distance - radius) <= radius * EDGE_TOLERANCE
+
+
+def test_radius_matches_geodesic_full_scan(landlord):
+    seed(landlord)
+    rng = random.Random(11)
+    for radius in (0.5, 2, 5, 10, 40, 200):
+        for _ in range(5):
+            lat = CENTER[0] + rng.uniform(-0.3, 0.3)
+            lng = CENTER[1] + rng.uniform(-0.3, 0.3)
+            assert_matches_full_scan(lat, lng, radius)
+
+
+def test_index_follows_hostel_writes(landlord):
+    seed(landlord, count=50)
+    hostel_spatial_index.ensure_fresh()
+    user_id = landlord.user_id
+
+    created = HostelService.create_hostel({
+        "name": "New", "location": "Nairobi", "price": 6000, "capacity": 4, "room_type": "single",
+        "latitude": CENTER[0], "longitude": CENTER[1]
+    }, user_id)
+    assert created["id"] in hostel_spatial_index.within_radius(*CENTER, 0.1)
+
+    # Moved ~55 km north: leaves its old cell and joins the new one
+    HostelService.update_hostel(created["id"], {"latitude": CENTER[0] + 0.5}, user_id)
+    assert created["id"] not in hostel_spatial_index.within_radius(*CENTER, 0.1)
+    assert created["id"] in hostel_spatial_index.within_radius(CENTER[0] + 0.5, CENTER[1], 0.1)
+    assert_matches_full_scan(CENTER[0] + 0.5, CENTER[1], 5)
+
+    HostelService.delete_hostel(created["id"], user_id)
+    assert created["id"] not in hostel_spatial_index.within_radius(CENTER[0] + 0.5, CENTER[1], 0.1)
+
+
+def test_radius_search_returns_sorted_distances(landlord):
+    seed(landlord, count=300, spread=0.1)
+    lat, lng = CENTER
+    params = {'lat': str(lat), 'lng': str(lng), 'radius': '3', 'sort_by': 'distance'}
+
+    catalog = SearchService.search_hostels(params, per_page=100)
+    # Facet counts force the SQL pipeline, whose candidates come from the grid index
+    sql = SearchService.search_hostels(dict(params, facets='room_type'), per_page=100)
+
+    expected = hostel_spatial_index.within_radius(lat, lng, 3)
+    for result in (catalog, sql):
+        distances = [hostel['distance_km'] for hostel in result['hostels']]
+        assert result['total'] == len(expected)
+        assert distances == sorted(distances)
+        assert {hostel['id']: hostel['distance_km'] for hostel in result['hostels']} == {
+            hostel_id: round(distance, 3) for hostel_id, distance in expected.items()
+        }
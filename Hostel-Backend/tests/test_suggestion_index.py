@@ -0,0 +1,73 @@
+import threading
+import time
+from datetime import date
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.services import suggestion_index as suggestion_module
+from app.services.suggestion_index import SuggestionIndex, suggestion_index
+
+
+def add_hostel(name, location):
+    hostel = Hostel(name=name, location=location, price=6000, capacity=4, room_type='single', landlord_id=1)
+    db.session.add(hostel)
+    db.session.commit()
+    return hostel
+
+
+def book(hostel, count):
+    for _ in range(count):
+        db.session.add(Booking(user_id=1, hostel_id=hostel.id, check_in=date(2026, 3, 1),
+                               check_out=date(2026, 3, 2), total_price=hostel.price))
+    db.session.commit()
+
+
+def wait_for_popularity():
+    deadline = time.monotonic() + 5
+    while suggestion_index._popularity_refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def no_rebuild(self, rows):
+    pytest.fail('the popularity reload rebuilt the whole index')
+
+
+def test_popularity_reload_runs_off_the_request_and_reranks_in_place(file_app, monkeypatch):
+    quiet = add_hostel('Jupiter Lodge', 'Juja Town')
+    busy = add_hostel('Juniper Court', 'Juja Farm')
+    book(quiet, 1)
+    assert suggestion_index.suggest('ju', 5)['hostel'][0] == 'Jupiter Lodge'
+
+    book(busy, 3)
+    monkeypatch.setattr(suggestion_module, 'POPULARITY_REFRESH_SECONDS', 0)
+    monkeypatch.setattr(SuggestionIndex, 'build', no_rebuild)
+
+    request_thread = threading.get_ident()
+    request_statements = []
+
+    def record(*args):
+        if threading.get_ident() == request_thread:
+            request_statements.append(args[2])
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        # The stale weights are served while the counts are re-read on another thread
+        assert suggestion_index.suggest('ju', 5)['hostel'][0] == 'Jupiter Lodge'
+        wait_for_popularity()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert request_statements == []
+
+    monkeypatch.setattr(suggestion_module, 'POPULARITY_REFRESH_SECONDS', 3600)
+    assert suggestion_index.suggest('ju', 5)['hostel'][0] == 'Juniper Court'
+    assert suggestion_index.suggest('junip', 5)['hostel'] == ['Juniper Court']
+    assert suggestion_index.suggest('juja', 5)['location'] == ['Juja Farm', 'Juja Town']
+
+    # The weights patched in place rank exactly as a full rebuild from the new counts
+    patched = (dict(suggestion_index._entries), dict(suggestion_index._top))
+    monkeypatch.undo()
+    with suggestion_index._lock:
+        SuggestionIndex.build(suggestion_index, suggestion_index._rows)
+    assert patched == (suggestion_index._entries, suggestion_index._top)